@@ -433,10 +433,11 @@ def validate(
 
         console.print(table)
 
+    counts = report.status_counts()
     console.print(
-        f"\n  Passed: [green]{report.passed}[/green]  "
-        f"Failed: [red]{report.failed}[/red]  "
-        f"Warnings: [yellow]{report.warnings}[/yellow]  "
+        f"\n  Passed: [green]{counts['pass']}[/green]  "
+        f"Failed: [red]{counts['fail']}[/red]  "
+        f"Warnings: [yellow]{counts['warn']}[/yellow]  "
         f"Fixes applied: [cyan]{report.fixes_applied}[/cyan]"
     )
 
@@ -18,6 +18,8 @@ import json
 import logging
 import shlex
 import subprocess
+import threading
+import time
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -26,6 +28,22 @@ logger = logging.getLogger(__name__)
 # Maximum output we'll capture from kubectl to avoid memory blowup.
 _MAX_OUTPUT_BYTES = 512 * 1024  # 512 KB
 
+# Label selectors tried, in order, when locating the monitoring stack.
+_PROMETHEUS_SELECTORS = (
+    "app=prometheus",
+    "app.kubernetes.io/name=prometheus",
+    "app=kube-prometheus-stack-prometheus",
+    "app.kubernetes.io/component=prometheus",
+)
+_GRAFANA_SELECTORS = (
+    "app=grafana",
+    "app.kubernetes.io/name=grafana",
+    "app=kube-prometheus-stack-grafana",
+)
+
+# How long one cluster-wide service listing answers discovery lookups.
+_SERVICE_LIST_TTL = 30.0
+
 
 @dataclass
 class CommandResult:
@@ -65,6 +83,12 @@ class ClusterClient:
     context: str = ""
     allow_writes: bool = False
     _base_cmd: list[str] = field(init=False, default_factory=list)
+    _services: tuple[float, list[dict[str, Any]] | None] | None = field(
+        init=False, default=None, repr=False, compare=False,
+    )
+    _services_lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock, repr=False, compare=False,
+    )
 
     def __post_init__(self) -> None:
         self._base_cmd = ["kubectl"]
@@ -197,6 +221,7 @@ class ClusterClient:
     def apply_manifest(self, manifest_yaml: str, namespace: str = "default") -> CommandResult:
         """Apply a YAML manifest to the cluster."""
         self._require_writes()
+        self._services = None
         cmd = self._base_cmd + ["apply", "-f", "-", "-n", namespace]
         cmd_str = shlex.join(cmd)
         logger.info("kubectl apply (stdin): namespace=%s", namespace)
@@ -225,80 +250,105 @@ class ClusterClient:
     ) -> CommandResult:
         """Delete a specific resource."""
         self._require_writes()
+        self._services = None
         return self._run(["delete", kind, name, "-n", namespace])
 
     # ── Convenience helpers ───────────────────────────────────────────────
 
+    def _list_services(self) -> list[dict[str, Any]] | None:
+        """Return every service in the cluster from one ``kubectl get``.
+
+        The listing is reused for a short while so the Prometheus and Grafana
+        lookups share a single kubectl call.  ``None`` means it could not be
+        used (kubectl failed, or the output was cut off at the size cap).
+        """
+        with self._services_lock:
+            cached = self._services
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            services: list[dict[str, Any]] | None = None
+            result = self.get_resources("service")
+            if result.ok:
+                try:
+                    services = json.loads(result.stdout).get("items", [])
+                except json.JSONDecodeError:
+                    services = None
+            self._services = (time.monotonic() + _SERVICE_LIST_TTL, services)
+            return services
+
+    def _find_service(self, selectors: tuple[str, ...]) -> tuple[str, dict[str, Any]] | None:
+        """Return ``(selector, service)`` for the first selector matching a service.
+
+        Equality selectors are matched against one cluster-wide listing; if
+        that listing is unavailable, each selector is queried separately.
+        """
+        services = self._list_services()
+        if services is not None:
+            for label in selectors:
+                key, _, value = label.partition("=")
+                for svc in services:
+                    meta = svc.get("metadata") or {}
+                    labels = meta.get("labels") or {}
+                    if labels.get(key) == value and "namespace" in meta and "name" in meta:
+                        return label, svc
+            return None
+
+        for label in selectors:
+            result = self.get_resources("service", label_selector=label)
+            if not result.ok:
+                continue
+            try:
+                items = json.loads(result.stdout).get("items", [])
+            except json.JSONDecodeError:
+                continue
+            if items and "namespace" in items[0].get("metadata", {}):
+                return label, items[0]
+        return None
+
     def find_prometheus(self) -> dict[str, Any]:
         """Try to locate Prometheus in the cluster.
 
-        Searches for pods matching common Prometheus labels/names and
+        Searches for services matching common Prometheus labels and
         returns connection info.
         """
-        # Try common selectors
-        for label in [
-            "app=prometheus",
-            "app.kubernetes.io/name=prometheus",
-            "app=kube-prometheus-stack-prometheus",
-            "app.kubernetes.io/component=prometheus",
-        ]:
-            result = self.get_resources("service", label_selector=label)
-            if result.ok:
-                try:
-                    data = json.loads(result.stdout)
-                    items = data.get("items", [])
-                    if items:
-                        svc = items[0]
-                        ns = svc["metadata"]["namespace"]
-                        name = svc["metadata"]["name"]
-                        port = 9090
-                        for p in svc.get("spec", {}).get("ports", []):
-                            if p.get("name") in ("http-web", "web", "http", "prometheus"):
-                                port = p.get("port", 9090)
-                                break
-                            port = p.get("port", 9090)
-                        return {
-                            "found": True,
-                            "namespace": ns,
-                            "service": name,
-                            "port": port,
-                            "url": f"http://{name}.{ns}.svc.cluster.local:{port}",
-                            "label": label,
-                        }
-                except (json.JSONDecodeError, KeyError, IndexError):
-                    continue
-
-        return {"found": False, "reason": "No Prometheus service found in the cluster"}
+        found = self._find_service(_PROMETHEUS_SELECTORS)
+        if found is None:
+            return {"found": False, "reason": "No Prometheus service found in the cluster"}
+        label, svc = found
+        ns = svc["metadata"]["namespace"]
+        name = svc["metadata"]["name"]
+        port = 9090
+        for p in svc.get("spec", {}).get("ports", []):
+            if p.get("name") in ("http-web", "web", "http", "prometheus"):
+                port = p.get("port", 9090)
+                break
+            port = p.get("port", 9090)
+        return {
+            "found": True,
+            "namespace": ns,
+            "service": name,
+            "port": port,
+            "url": f"http://{name}.{ns}.svc.cluster.local:{port}",
+            "label": label,
+        }
 
     def find_grafana(self) -> dict[str, Any]:
         """Try to locate Grafana in the cluster."""
-        for label in [
-            "app=grafana",
-            "app.kubernetes.io/name=grafana",
-            "app=kube-prometheus-stack-grafana",
-        ]:
-            result = self.get_resources("service", label_selector=label)
-            if result.ok:
-                try:
-                    data = json.loads(result.stdout)
-                    items = data.get("items", [])
-                    if items:
-                        svc = items[0]
-                        ns = svc["metadata"]["namespace"]
-                        name = svc["metadata"]["name"]
-                        port = 3000
-                        for p in svc.get("spec", {}).get("ports", []):
-                            port = p.get("port", 3000)
-                            break
-                        return {
-                            "found": True,
-                            "namespace": ns,
-                            "service": name,
-                            "port": port,
-                            "url": f"http://{name}.{ns}.svc.cluster.local:{port}",
-                            "label": label,
-                        }
-                except (json.JSONDecodeError, KeyError, IndexError):
-                    continue
-
-        return {"found": False, "reason": "No Grafana service found in the cluster"}
+        found = self._find_service(_GRAFANA_SELECTORS)
+        if found is None:
+            return {"found": False, "reason": "No Grafana service found in the cluster"}
+        label, svc = found
+        ns = svc["metadata"]["namespace"]
+        name = svc["metadata"]["name"]
+        port = 3000
+        for p in svc.get("spec", {}).get("ports", []):
+            port = p.get("port", 3000)
+            break
+        return {
+            "found": True,
+            "namespace": ns,
+            "service": name,
+            "port": port,
+            "url": f"http://{name}.{ns}.svc.cluster.local:{port}",
+            "label": label,
+        }
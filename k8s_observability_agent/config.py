@@ -25,6 +25,10 @@ class Settings(BaseModel):
     repo_path: str = "."
     github_url: str = ""
     branch: str = "main"
+    iac_cache_path: str = Field(
+        default="",
+        description="JSON file caching per-file IaC parse results. Empty = no cache.",
+    )
 
     # Output
     output_dir: str = DEFAULT_OUTPUT_DIR
@@ -686,8 +686,7 @@ def run_validate_agent(
     # ── Save run to history ─────────────────────────────────────────
     if history is not None and report is not None:
         try:
-            run_id = history.save_run(cluster_context, report)
-            history.prune(cluster_context, keep=20)
+            run_id = history.save_and_prune(cluster_context, report, keep=20)
             console.print(f"  [dim]Saved validation run #{run_id} to history.[/dim]")
         except Exception as exc:
             logger.warning("Failed to save validation history: %s", exc)
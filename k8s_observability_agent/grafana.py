@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from typing import Any
 
 import httpx
@@ -18,10 +19,24 @@ logger = logging.getLogger(__name__)
 
 _TIMEOUT = httpx.Timeout(15.0, connect=5.0)
 
+# Keep-alive pool for a Grafana instance.  Passed to httpx.Client directly:
+# a custom transport would drop the proxies httpx reads from the environment.
+_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120.0)
+
 # grafana.com API for fetching dashboard JSON by ID.
 _GRAFANA_COM_API = "https://grafana.com/api/dashboards/{dashboard_id}/revisions/latest/download"
 
 
+@lru_cache(maxsize=1)
+def _grafana_com_client() -> httpx.Client:
+    """Return the process-wide client for grafana.com downloads.
+
+    Importing several community dashboards then reuses one TLS connection
+    instead of handshaking with grafana.com for each.
+    """
+    return httpx.Client(timeout=15.0, follow_redirects=True, limits=_LIMITS)
+
+
 class GrafanaClient:
     """Lightweight Grafana HTTP API client.
 
@@ -62,6 +77,7 @@ class GrafanaClient:
             auth=auth,
             timeout=_TIMEOUT,
             verify=verify,
+            limits=_LIMITS,
         )
 
     def close(self) -> None:
@@ -209,7 +225,7 @@ class GrafanaClient:
         # Step 1: Download from grafana.com
         url = _GRAFANA_COM_API.format(dashboard_id=grafana_com_id)
         try:
-            dl_resp = httpx.get(url, timeout=15.0, follow_redirects=True)
+            dl_resp = _grafana_com_client().get(url)
             dl_resp.raise_for_status()
             dashboard_json = dl_resp.json()
         except Exception as exc:
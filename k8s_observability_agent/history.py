@@ -6,13 +6,21 @@ and focus on what has changed since the last run.
 
 from __future__ import annotations
 
-import json
+import contextlib
+import hashlib
 import logging
 import sqlite3
-from datetime import datetime, timezone
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
+import orjson
+from pydantic import TypeAdapter
+
 from k8s_observability_agent.models import (
     DashboardImportResult,
     RemediationStep,
@@ -22,34 +30,196 @@ from k8s_observability_agent.models import (
 
 logger = logging.getLogger(__name__)
 
-_SCHEMA_VERSION = 1
+# Stored in the database header via ``PRAGMA user_version``.
+_SCHEMA_VERSION = 6
 
-_DDL = """\
-CREATE TABLE IF NOT EXISTS schema_version (
-    version INTEGER NOT NULL
-);
+# SQLite 3.45 introduced JSONB, a pre-parsed binary JSON encoding.  When the
+# linked library supports it the payload columns are stored as JSONB blobs;
+# older libraries keep storing plain JSON text in the same columns.
+_HAS_JSONB = sqlite3.sqlite_version_info >= (3, 45, 0)
+
+_JSON_COLUMNS = (
+    "checks_json",
+    "dashboards_json",
+    "recommendations_json",
+    "remediation_json",
+    "dashboards_to_import_json",
+)
+# ValidationReport field stored in each of _JSON_COLUMNS, in the same order.
+_JSON_FIELDS = (
+    "checks",
+    "dashboards_imported",
+    "recommendations",
+    "remediation_steps",
+    "dashboards_to_import",
+)
 
+_DDL = """\
 CREATE TABLE IF NOT EXISTS validation_runs (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
     cluster_context TEXT    NOT NULL,
-    run_at          TEXT    NOT NULL,           -- ISO-8601 UTC
+    run_at_us       INTEGER NOT NULL,           -- UTC epoch microseconds
     cluster_summary TEXT    NOT NULL DEFAULT '',
-    checks_json     TEXT    NOT NULL DEFAULT '[]',
-    dashboards_json TEXT    NOT NULL DEFAULT '[]',
-    recommendations_json TEXT NOT NULL DEFAULT '[]',
-    remediation_json     TEXT NOT NULL DEFAULT '[]',
-    dashboards_to_import_json TEXT NOT NULL DEFAULT '[]',
-    plan_hash       TEXT    NOT NULL DEFAULT '' -- sha256 of the plan JSON (optional)
+    checks_json     BLOB    NOT NULL DEFAULT '[]',  -- JSONB when supported, else JSON text
+    dashboards_json BLOB    NOT NULL DEFAULT '[]',
+    recommendations_json BLOB NOT NULL DEFAULT '[]',
+    remediation_json     BLOB NOT NULL DEFAULT '[]',
+    dashboards_to_import_json BLOB NOT NULL DEFAULT '[]',
+    plan_hash       TEXT    NOT NULL DEFAULT '', -- sha256 of the plan JSON (optional)
+    content_hash    TEXT    NOT NULL DEFAULT ''  -- blake2b of the stored report, for dedup
 );
 
-CREATE INDEX IF NOT EXISTS idx_runs_cluster ON validation_runs(cluster_context);
-CREATE INDEX IF NOT EXISTS idx_runs_time    ON validation_runs(run_at DESC);
+-- Serves every per-context "latest first" read, prune and run_count.  The
+-- rowid (id) is implicitly appended to every index, so id lookups are covered.
+CREATE INDEX IF NOT EXISTS idx_runs_ctx_time ON validation_runs(cluster_context, run_at_us DESC);
 """
 
+# Upgrade scripts keyed by the schema version they produce.  A fresh database
+# is created directly at ``_SCHEMA_VERSION`` from ``_DDL`` and skips these.
+_MIGRATIONS: dict[int, str] = {
+    # v2: re-encode the JSON payload columns as JSONB (no-op without JSONB);
+    # filled in below by _payload_sql.
+    2: "",
+    # v3: replace the single-column indexes with one composite index.
+    3: """\
+DROP INDEX IF EXISTS idx_runs_cluster;
+DROP INDEX IF EXISTS idx_runs_time;
+CREATE INDEX IF NOT EXISTS idx_runs_ctx_time ON validation_runs(cluster_context, run_at DESC);
+""",
+    # v4: store run time as integer epoch microseconds instead of ISO-8601 text.
+    4: """\
+ALTER TABLE validation_runs ADD COLUMN run_at_us INTEGER NOT NULL DEFAULT 0;
+UPDATE validation_runs
+    SET run_at_us = CAST(ROUND((julianday(run_at) - 2440587.5) * 86400000000.0) AS INTEGER);
+DROP INDEX IF EXISTS idx_runs_ctx_time;
+ALTER TABLE validation_runs DROP COLUMN run_at;
+CREATE INDEX idx_runs_ctx_time ON validation_runs(cluster_context, run_at_us DESC);
+""",
+    # v5: fingerprint stored reports so identical back-to-back saves collapse.
+    5: "ALTER TABLE validation_runs ADD COLUMN content_hash TEXT NOT NULL DEFAULT '';",
+    # v6: the version now lives in PRAGMA user_version.
+    6: "DROP TABLE IF EXISTS schema_version;",
+}
+
+
+def _payload_sql(jsonb: bool) -> tuple[str, str, str, str]:
+    """SQL for the JSON payload columns, stored as JSONB or as plain JSON text.
+
+    Returns ``(bind_param, run_columns, summary_columns, v2_migration)``.  Reads
+    go through json() so callers always receive JSON text regardless of storage.
+    """
+    select = {c: f"json({c}) AS {c}" if jsonb else c for c in _JSON_COLUMNS}
+    run_columns = ", ".join(
+        [
+            "id",
+            "cluster_context",
+            "run_at_us",
+            "cluster_summary",
+            *select.values(),
+            "plan_hash",
+        ]
+    )
+    # previous_run_summary tallies checks in SQL, so it never ships checks_json
+    # (or the other payloads it does not print) across to Python.
+    summary_columns = ", ".join(
+        [
+            "id",
+            "run_at_us",
+            "cluster_summary",
+            select["recommendations_json"],
+            select["remediation_json"],
+            select["dashboards_to_import_json"],
+        ]
+    )
+    reencode = (
+        "UPDATE validation_runs SET " + ", ".join(f"{c} = jsonb({c})" for c in _JSON_COLUMNS) + ";"
+        if jsonb
+        else ""
+    )
+    return "jsonb(?)" if jsonb else "?", run_columns, summary_columns, reencode
+
+
+_JSON_PARAM, _RUN_COLUMNS, _SUMMARY_COLUMNS, _MIGRATIONS[2] = _payload_sql(_HAS_JSONB)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Validators for the stored payload lists; they parse the JSON text directly.
+_CHECKS = TypeAdapter(list[ValidationCheck])
+_DASHBOARDS = TypeAdapter(list[DashboardImportResult])
+_REMEDIATION = TypeAdapter(list[RemediationStep])
+
+
+def _format_run_at(run_at_us: int) -> str:
+    """Render a stored ``run_at_us`` value as an ISO-8601 UTC timestamp."""
+    return (_EPOCH + timedelta(microseconds=run_at_us)).isoformat()
+
+
+def _run_row(row: sqlite3.Row) -> dict[str, Any]:
+    """Convert a run row to a dict, adding the ISO-8601 ``run_at`` callers read."""
+    run = dict(row)
+    run["run_at"] = _format_run_at(run["run_at_us"])
+    return run
+
+
+class LazyValidationReport:
+    """A stored validation report whose payload lists are decoded on first access.
+
+    Exposes the same attributes as :class:`ValidationReport`.  Callers that only
+    look at ``cluster_summary`` never pay for JSON decoding or model building.
+    """
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        self.cluster_summary: str = raw["cluster_summary"]
+        self._raw = raw
+
+    @cached_property
+    def checks(self) -> list[ValidationCheck]:
+        return _CHECKS.validate_json(self._raw["checks_json"])
+
+    @cached_property
+    def dashboards_imported(self) -> list[DashboardImportResult]:
+        return _DASHBOARDS.validate_json(self._raw["dashboards_json"])
+
+    @cached_property
+    def recommendations(self) -> list[str]:
+        return orjson.loads(self._raw["recommendations_json"])
+
+    @cached_property
+    def remediation_steps(self) -> list[RemediationStep]:
+        return _REMEDIATION.validate_json(self._raw["remediation_json"])
+
+    @cached_property
+    def dashboards_to_import(self) -> list[DashboardImportResult]:
+        return _DASHBOARDS.validate_json(self._raw["dashboards_to_import_json"])
+
+    # The tallies only read ``self.checks``, so share ValidationReport's definitions.
+    passed = ValidationReport.passed
+    failed = ValidationReport.failed
+    warnings = ValidationReport.warnings
+    fixes_applied = ValidationReport.fixes_applied
+    status_counts = ValidationReport.status_counts
+
+    def to_report(self) -> ValidationReport:
+        """Decode everything into a regular *ValidationReport*."""
+        return ValidationReport(
+            cluster_summary=self.cluster_summary,
+            checks=self.checks,
+            dashboards_imported=self.dashboards_imported,
+            recommendations=self.recommendations,
+            remediation_steps=self.remediation_steps,
+            dashboards_to_import=self.dashboards_to_import,
+        )
+
 
 class ValidationHistory:
     """Persistent validation history backed by a SQLite database.
 
+    Safe to share between threads: every thread uses the same connection, and
+    every statement on it (read or write) runs under one lock.  A ``batch()``
+    block holds that lock until it commits or rolls back, so other threads
+    never see its uncommitted rows.
+
     Parameters
     ----------
     db_path : str | Path
@@ -59,20 +229,63 @@ class ValidationHistory:
     def __init__(self, db_path: str | Path) -> None:
         self._db_path = Path(db_path)
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path))
+        # Large enough to keep every statement this class issues prepared
+        self._conn = sqlite3.connect(
+            str(self._db_path), cached_statements=256, check_same_thread=False
+        )
         self._conn.row_factory = sqlite3.Row
+        # Guards every use of the connection.  Re-entrant so save_run/prune (and
+        # reads) can run inside a batch() held by the same thread
+        self._lock = threading.RLock()
+        # cluster_context -> (latest run id, rendered previous_run_summary)
+        self._summary_cache: dict[str, tuple[int, str]] = {}
+        # Nesting depth of batch() blocks; writes defer their commit while > 0
+        self._batch_depth = 0
         self._ensure_schema()
 
     # ── Schema management ──────────────────────────────────────────────
 
     def _ensure_schema(self) -> None:
-        cur = self._conn.cursor()
-        cur.executescript(_DDL)
-        # Check / set version
-        row = cur.execute("SELECT version FROM schema_version LIMIT 1").fetchone()
-        if row is None:
-            cur.execute("INSERT INTO schema_version (version) VALUES (?)", (_SCHEMA_VERSION,))
-        self._conn.commit()
+        conn = self._conn
+        # A header read; on an up-to-date database this is the only work done
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == _SCHEMA_VERSION:
+            return
+        if version == 0:
+            version = self._legacy_schema_version()
+        if version == 0:
+            self._apply_schema_step(_DDL, _SCHEMA_VERSION)
+            return
+        # Upgrade a database written by an older release
+        for target in range(version + 1, _SCHEMA_VERSION + 1):
+            logger.info("Migrating history database to schema v%d", target)
+            self._apply_schema_step(_MIGRATIONS[target], target)
+
+    def _apply_schema_step(self, script: str, version: int) -> None:
+        """Run *script* and record *version* in one transaction.
+
+        A failing step leaves the database at the previous version, so the
+        next open retries it instead of re-running steps already applied.
+        """
+        try:
+            self._conn.executescript(
+                f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;"
+            )
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            raise
+
+    def _legacy_schema_version(self) -> int:
+        """Version recorded by releases that kept it in a ``schema_version`` table (0 if none)."""
+        conn = self._conn
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+        ).fetchone()
+        if has_table is None:
+            return 0
+        row = conn.execute("SELECT version FROM schema_version LIMIT 1").fetchone()
+        return row[0] if row is not None else 1
 
     # ── Write ──────────────────────────────────────────────────────────
 
@@ -82,76 +295,188 @@ class ValidationHistory:
         report: ValidationReport,
         plan_hash: str = "",
     ) -> int:
-        """Persist a finished validation run. Returns the new run id."""
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO validation_runs
-                (cluster_context, run_at, cluster_summary,
-                 checks_json, dashboards_json, recommendations_json,
-                 remediation_json, dashboards_to_import_json, plan_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                cluster_context,
-                datetime.now(timezone.utc).isoformat(),
-                report.cluster_summary,
-                json.dumps([c.model_dump() for c in report.checks]),
-                json.dumps([d.model_dump() for d in report.dashboards_imported]),
-                json.dumps(report.recommendations),
-                json.dumps([s.model_dump() for s in report.remediation_steps]),
-                json.dumps([d.model_dump() for d in report.dashboards_to_import]),
-                plan_hash,
-            ),
-        )
-        self._conn.commit()
+        """Persist a finished validation run. Returns the run id.
+
+        If the most recent run for the context stored an identical report (and
+        plan hash), that row's timestamp is refreshed and its id returned
+        instead of inserting a duplicate.
+        """
+        # Serialize and fingerprint outside the lock; only the write is serialized.
+        # One model_dump pass covers the whole report; orjson encodes each column.
+        # Payloads are bound as text: sqlite3 binds bytes as BLOB, which
+        # jsonb()/json() would try to interpret as binary JSONB.
+        dumped = report.model_dump(mode="json", include=set(_JSON_FIELDS))
+        payloads = tuple(orjson.dumps(dumped[f]).decode() for f in _JSON_FIELDS)
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (report.cluster_summary, *payloads, plan_hash):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            latest = self._conn.execute(
+                """
+                SELECT id, content_hash FROM validation_runs
+                WHERE cluster_context = ?
+                ORDER BY run_at_us DESC
+                LIMIT 1
+                """,
+                (cluster_context,),
+            ).fetchone()
+            if latest is not None and latest[1] == content_hash:
+                self._conn.execute(
+                    "UPDATE validation_runs SET run_at_us = ? WHERE id = ?",
+                    (time.time_ns() // 1000, latest[0]),
+                )
+                self._commit()
+                self._summary_cache.pop(cluster_context, None)
+                logger.info(
+                    "Validation run %d for context %r unchanged; refreshed its timestamp",
+                    latest[0],
+                    cluster_context,
+                )
+                return latest[0]
+
+            cur = self._conn.execute(
+                f"""
+                INSERT INTO validation_runs
+                    (cluster_context, run_at_us, cluster_summary,
+                     checks_json, dashboards_json, recommendations_json,
+                     remediation_json, dashboards_to_import_json, plan_hash,
+                     content_hash)
+                VALUES (?, ?, ?, {_JSON_PARAM}, {_JSON_PARAM}, {_JSON_PARAM},
+                        {_JSON_PARAM}, {_JSON_PARAM}, ?, ?)
+                """,
+                (
+                    cluster_context,
+                    time.time_ns() // 1000,
+                    report.cluster_summary,
+                    *payloads,
+                    plan_hash,
+                    content_hash,
+                ),
+            )
+            self._commit()
+            self._summary_cache.pop(cluster_context, None)
         run_id = cur.lastrowid
         logger.info("Saved validation run %d for context %r", run_id, cluster_context)
         return run_id  # type: ignore[return-value]
 
+    def save_and_prune(
+        self,
+        cluster_context: str,
+        report: ValidationReport,
+        keep: int = 10,
+        plan_hash: str = "",
+    ) -> int:
+        """Persist a run and trim the context to the *keep* most recent runs.
+
+        Both writes share one transaction (a single commit).  Returns the run id.
+        """
+        with self.batch():
+            run_id = self.save_run(cluster_context, report, plan_hash)
+            self.prune(cluster_context, keep=keep)
+        return run_id
+
+    def save_many(self, runs: Iterable[tuple[str, ValidationReport, str]]) -> list[int]:
+        """Persist several ``(cluster_context, report, plan_hash)`` runs in one transaction.
+
+        Returns the new run ids in input order.
+        """
+        with self.batch():
+            return [self.save_run(ctx, report, plan_hash) for ctx, report, plan_hash in runs]
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group writes into a single transaction, committed once on exit.
+
+        ``save_run`` and ``prune`` calls inside the block skip their own commit.
+        The whole batch is rolled back if the block raises.  Batches may nest;
+        only the outermost one commits.  Other threads' writes wait until the
+        batch finishes.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                if self._batch_depth == 1:
+                    self._conn.rollback()
+                    # Rolled-back ids can be reused, so cached run ids are no longer trustworthy
+                    self._summary_cache.clear()
+                raise
+            finally:
+                self._batch_depth -= 1
+            if not self._batch_depth:
+                self._conn.commit()
+
     # ── Read ───────────────────────────────────────────────────────────
 
     def last_run(self, cluster_context: str) -> dict[str, Any] | None:
         """Return the most recent run for a cluster context, or *None*."""
-        row = self._conn.execute(
-            """
-            SELECT * FROM validation_runs
-            WHERE cluster_context = ?
-            ORDER BY run_at DESC
-            LIMIT 1
-            """,
-            (cluster_context,),
-        ).fetchone()
+        with self._lock:
+            row = self._conn.execute(
+                f"""
+                SELECT {_RUN_COLUMNS} FROM validation_runs
+                WHERE cluster_context = ?
+                ORDER BY run_at_us DESC
+                LIMIT 1
+                """,
+                (cluster_context,),
+            ).fetchone()
         if row is None:
             return None
-        return self._row_to_dict(row)
+        return _run_row(row)
+
+    def last_report(self, cluster_context: str) -> LazyValidationReport | None:
+        """Return the most recent report for a context, or *None*.
 
-    def last_report(self, cluster_context: str) -> ValidationReport | None:
-        """Return the most recent *ValidationReport* for a context, or *None*."""
+        The payload lists are decoded on first access; call
+        :meth:`LazyValidationReport.to_report` for a full *ValidationReport*.
+        """
         raw = self.last_run(cluster_context)
         if raw is None:
             return None
-        return self._dict_to_report(raw)
+        return LazyValidationReport(raw)
+
+    def iter_runs(self, cluster_context: str, limit: int = 10) -> Iterator[dict[str, Any]]:
+        """Yield up to *limit* most recent runs for a cluster context, newest first.
+
+        Rows are fetched from SQLite one at a time, so a caller that stops early
+        never materializes the remaining rows.  The lock is taken per row rather
+        than across yields, so a slow consumer does not stall other threads.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                f"""
+                SELECT {_RUN_COLUMNS} FROM validation_runs
+                WHERE cluster_context = ?
+                ORDER BY run_at_us DESC
+                LIMIT ?
+                """,
+                (cluster_context, limit),
+            )
+        try:
+            while True:
+                with self._lock:
+                    row = cur.fetchone()
+                if row is None:
+                    return
+                yield _run_row(row)
+        finally:
+            cur.close()
 
     def all_runs(self, cluster_context: str, limit: int = 10) -> list[dict[str, Any]]:
         """Return the *limit* most recent runs for a cluster context."""
-        rows = self._conn.execute(
-            """
-            SELECT * FROM validation_runs
-            WHERE cluster_context = ?
-            ORDER BY run_at DESC
-            LIMIT ?
-            """,
-            (cluster_context, limit),
-        ).fetchall()
-        return [self._row_to_dict(r) for r in rows]
+        return list(self.iter_runs(cluster_context, limit))
 
     def run_count(self, cluster_context: str) -> int:
         """How many validation runs exist for this context."""
-        row = self._conn.execute(
-            "SELECT COUNT(*) FROM validation_runs WHERE cluster_context = ?",
-            (cluster_context,),
-        ).fetchone()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM validation_runs WHERE cluster_context = ?",
+                (cluster_context,),
+            ).fetchone()
         return row[0] if row else 0
 
     # ── Summaries for the agent ────────────────────────────────────────
@@ -159,81 +484,134 @@ class ValidationHistory:
     def previous_run_summary(self, cluster_context: str) -> str:
         """Build a concise text summary of the last run for injection into the agent prompt.
 
-        Returns an empty string if there is no prior run.
+        Returns an empty string if there is no prior run.  The rendered text is
+        memoized per context until a newer run is saved.
         """
-        raw = self.last_run(cluster_context)
-        if raw is None:
-            return ""
-
-        parts: list[str] = []
-        parts.append(f"=== Previous validation run ({raw['run_at']}) ===")
-        parts.append(f"Cluster summary: {raw['cluster_summary']}")
-        parts.append("")
-
-        checks: list[dict] = json.loads(raw["checks_json"])
-        if checks:
-            passed = sum(1 for c in checks if c.get("status") == "pass")
-            failed = sum(1 for c in checks if c.get("status") == "fail")
-            warned = sum(1 for c in checks if c.get("status") == "warn")
-            parts.append(f"Results: {passed} passed, {failed} failed, {warned} warnings")
-
-            failing = [c for c in checks if c.get("status") in ("fail", "warn")]
-            if failing:
-                parts.append("")
-                parts.append("Issues found last time:")
-                for c in failing:
-                    status = c.get("status", "?").upper()
-                    parts.append(f"  [{status}] {c.get('name', '?')}: {c.get('message', '')}")
-                    if c.get("fix_manifest"):
-                        parts.append(f"        Suggested manifest was provided")
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT id FROM validation_runs
+                WHERE cluster_context = ?
+                ORDER BY run_at_us DESC
+                LIMIT 1
+                """,
+                (cluster_context,),
+            ).fetchone()
+            if row is None:
+                return ""
+            cached = self._summary_cache.get(cluster_context)
+            if cached is not None and cached[0] == row[0]:
+                return cached[1]
+
+            raw = self._conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM validation_runs WHERE id = ?", (row[0],)
+            ).fetchone()
+            if raw is None:
+                return ""
+
+            parts: list[str] = []
+            parts.append(f"=== Previous validation run ({_format_run_at(raw['run_at_us'])}) ===")
+            parts.append(f"Cluster summary: {raw['cluster_summary']}")
             parts.append("")
 
-        recs: list[str] = json.loads(raw["recommendations_json"])
-        if recs:
-            parts.append("Previous recommendations:")
-            for r in recs:
-                parts.append(f"  - {r}")
-            parts.append("")
+            total, passed, failed, warned = self._check_tally(raw["id"])
+            if total:
+                parts.append(f"Results: {passed} passed, {failed} failed, {warned} warnings")
+
+                failing = self._failing_checks(raw["id"])
+                if failing:
+                    parts.append("")
+                    parts.append("Issues found last time:")
+                    append = parts.append
+                    for status, name, message, has_manifest in failing:
+                        append(f"  [{status.upper()}] {name}: {message}")
+                        if has_manifest:
+                            append("        Suggested manifest was provided")
+                parts.append("")
 
-        remediation: list[dict] = json.loads(raw["remediation_json"])
-        if remediation:
-            parts.append(f"Previous remediation steps ({len(remediation)}):")
-            for s in remediation:
-                parts.append(f"  - [{s.get('priority', '?').upper()}] {s.get('title', '?')}")
-            parts.append("")
+            recs: list[str] = orjson.loads(raw["recommendations_json"])
+            if recs:
+                parts.append("Previous recommendations:")
+                parts.extend(f"  - {r}" for r in recs)
+                parts.append("")
 
-        dashboards_to_import: list[dict] = json.loads(raw["dashboards_to_import_json"])
-        if dashboards_to_import:
-            parts.append("Dashboards previously recommended:")
-            for d in dashboards_to_import:
-                parts.append(f"  - ID {d.get('dashboard_id', '?')}: {d.get('title', '?')}")
-            parts.append("")
+            remediation: list[dict] = orjson.loads(raw["remediation_json"])
+            if remediation:
+                parts.append(f"Previous remediation steps ({len(remediation)}):")
+                parts.extend(
+                    f"  - [{s.get('priority', '?').upper()}] {s.get('title', '?')}"
+                    for s in remediation
+                )
+                parts.append("")
 
-        parts.append(
-            "Re-check the previously failing items first. If they are now fixed, mark them "
-            "as PASS. If they still fail, keep them as FAIL and update the remediation. "
-            "Also check for any NEW issues that were not in the previous run."
-        )
-        return "\n".join(parts)
+            dashboards_to_import: list[dict] = orjson.loads(raw["dashboards_to_import_json"])
+            if dashboards_to_import:
+                parts.append("Dashboards previously recommended:")
+                parts.extend(
+                    f"  - ID {d.get('dashboard_id', '?')}: {d.get('title', '?')}"
+                    for d in dashboards_to_import
+                )
+                parts.append("")
+
+            parts.append(
+                "Re-check the previously failing items first. If they are now fixed, mark them "
+                "as PASS. If they still fail, keep them as FAIL and update the remediation. "
+                "Also check for any NEW issues that were not in the previous run."
+            )
+            summary = "\n".join(parts)
+            self._summary_cache[cluster_context] = (raw["id"], summary)
+            return summary
+
+    def _check_tally(self, run_id: int) -> tuple[int, int, int, int]:
+        """Count (total, passed, failed, warned) checks of a run inside SQLite."""
+        row = self._conn.execute(
+            """
+            SELECT COUNT(*),
+                   COALESCE(SUM(json_extract(c.value, '$.status') = 'pass'), 0),
+                   COALESCE(SUM(json_extract(c.value, '$.status') = 'fail'), 0),
+                   COALESCE(SUM(json_extract(c.value, '$.status') = 'warn'), 0)
+            FROM validation_runs AS r, json_each(r.checks_json) AS c
+            WHERE r.id = ?
+            """,
+            (run_id,),
+        ).fetchone()
+        return row[0], row[1], row[2], row[3]
+
+    def _failing_checks(self, run_id: int) -> list[tuple[str, str, str, bool]]:
+        """Return (status, name, message, has_manifest) for failed/warned checks of a run."""
+        rows = self._conn.execute(
+            """
+            SELECT COALESCE(json_extract(c.value, '$.status'), '?'),
+                   COALESCE(json_extract(c.value, '$.name'), '?'),
+                   COALESCE(json_extract(c.value, '$.message'), ''),
+                   COALESCE(json_extract(c.value, '$.fix_manifest'), '') != ''
+            FROM validation_runs AS r, json_each(r.checks_json) AS c
+            WHERE r.id = ? AND json_extract(c.value, '$.status') IN ('fail', 'warn')
+            ORDER BY c.key
+            """,
+            (run_id,),
+        ).fetchall()
+        return [(r[0], r[1], r[2], bool(r[3])) for r in rows]
 
     # ── Housekeeping ───────────────────────────────────────────────────
 
     def prune(self, cluster_context: str, keep: int = 10) -> int:
         """Delete old runs, keeping the *keep* most recent. Returns rows deleted."""
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            DELETE FROM validation_runs
-            WHERE cluster_context = ? AND id NOT IN (
-                SELECT id FROM validation_runs
-                WHERE cluster_context = ?
-                ORDER BY run_at DESC
-                LIMIT ?
+        with self._lock:
+            cur = self._conn.execute(
+                """
+                DELETE FROM validation_runs
+                WHERE id IN (
+                    SELECT id FROM validation_runs
+                    WHERE cluster_context = ?
+                    ORDER BY run_at_us DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (cluster_context, keep),
             )
-            """,
-            (cluster_context, cluster_context, keep),
-        )
-        self._conn.commit()
+            self._commit()
+            self._summary_cache.pop(cluster_context, None)
         deleted = cur.rowcount
         if deleted:
             logger.info("Pruned %d old runs for context %r", deleted, cluster_context)
@@ -244,23 +622,7 @@ class ValidationHistory:
 
     # ── Internals ──────────────────────────────────────────────────────
 
-    @staticmethod
-    def _row_to_dict(row: sqlite3.Row) -> dict[str, Any]:
-        return dict(row)
-
-    @staticmethod
-    def _dict_to_report(raw: dict[str, Any]) -> ValidationReport:
-        checks = [ValidationCheck(**c) for c in json.loads(raw["checks_json"])]
-        dashboards = [DashboardImportResult(**d) for d in json.loads(raw["dashboards_json"])]
-        remediation = [RemediationStep(**s) for s in json.loads(raw["remediation_json"])]
-        dashboards_to_import = [
-            DashboardImportResult(**d) for d in json.loads(raw["dashboards_to_import_json"])
-        ]
-        return ValidationReport(
-            cluster_summary=raw["cluster_summary"],
-            checks=checks,
-            dashboards_imported=dashboards,
-            recommendations=json.loads(raw["recommendations_json"]),
-            remediation_steps=remediation,
-            dashboards_to_import=dashboards_to_import,
-        )
+    def _commit(self) -> None:
+        """Commit unless a ``batch()`` block will commit on exit."""
+        if not self._batch_depth:
+            self._conn.commit()
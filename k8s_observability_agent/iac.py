@@ -12,142 +12,393 @@ to render full manifests and feed the results into the normal K8s scanner.
 
 from __future__ import annotations
 
+import ast
+import functools
 import json
 import logging
+import os
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, TypeVar
 
-import yaml
+import orjson
 
+from k8s_observability_agent.iac_archetypes import (
+    HELM_CHART_ARCHETYPES,
+    INFRA_ARCHETYPES,
+    PULUMI_ARCHETYPES,
+)
 from k8s_observability_agent.models import (
     IaCDiscovery,
     IaCResource,
     IaCSource,
     K8sResource,
 )
+from k8s_observability_agent.scanner import _parse_resource
+from k8s_observability_agent.yaml_loader import load_yaml, load_yaml_all
 
 logger = logging.getLogger(__name__)
 
+
+def _yload_file(path: Path) -> Any:
+    """Parse a YAML file from its raw bytes — LibYAML decodes UTF-8 itself."""
+    with open(path, "rb") as f:
+        return load_yaml(f)
+
+
+def _yload_json_first(data: str | bytes) -> Any:
+    """Like :func:`load_yaml`, but hand JSON-formatted documents to orjson.
+
+    Generated Chart.yaml / Pulumi.yaml files are often plain JSON (a YAML
+    subset); orjson parses those far faster than any YAML loader.
+    """
+    head = data.lstrip()[:1]
+    if head in ("{", b"{"):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return load_yaml(data)
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Threads mainly overlap file reads and stat calls: YAML object construction
+# and the Terraform regex parsing hold the GIL, so they do not run in parallel.
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Concurrent `helm template` / `kubectl kustomize` processes.
+_MAX_RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# The four discoveries run side by side and each fans out per file, so the
+# per-file work shares one pool (and rendering another) to keep the total
+# thread and process count bounded instead of starting a pool per call.
+@functools.lru_cache(maxsize=1)
+def _file_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="iac-file")
+
+
+@functools.lru_cache(maxsize=1)
+def _render_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=_MAX_RENDER_WORKERS, thread_name_prefix="iac-render")
+
+
+# Directories never descended into during discovery (hidden dirs are pruned too).
+_SKIP_DIRS = frozenset({"node_modules", "vendor", "venv", "__pycache__"})
+
+
+def _is_skipped_dir(name: str) -> bool:
+    """Return True if discovery should not descend into directory *name*."""
+    return name.startswith(".") or name in _SKIP_DIRS
+
+
+def _iter_files(
+    root: Path,
+    names: Collection[str] = (),
+    suffixes: tuple[str, ...] = (),
+) -> Iterator[Path]:
+    """Yield files under *root* whose name is in *names* or ends with *suffixes*.
+
+    Directories matching :func:`_is_skipped_dir` are pruned before descending,
+    so vendored trees are never walked.  Output is sorted for stable ordering.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not _is_skipped_dir(d))
+        for filename in sorted(filenames):
+            if filename.startswith("."):
+                continue
+            if filename in names or filename.endswith(suffixes):
+                yield Path(dirpath, filename)
+
+
+# Discovery entry files by name → the scanner that consumes them; any other
+# file yielded by the classifying walk is a Terraform ``.tf`` file.
+_DISCOVERY_NAMES: Mapping[str, str] = MappingProxyType({
+    "Chart.yaml": "helm",
+    "kustomization.yaml": "kustomize",
+    "kustomization.yml": "kustomize",
+    "Pulumi.yaml": "pulumi",
+})
+
+
+def _classify_repo(root: Path) -> dict[str, list[Path]]:
+    """Walk *root* once and bucket every scanner's entry files.
+
+    Keys are ``terraform``, ``helm``, ``kustomize`` and ``pulumi``; each list
+    is in the same order a dedicated :func:`_iter_files` walk would yield.
+    """
+    buckets: dict[str, list[Path]] = {
+        "terraform": [], "helm": [], "kustomize": [], "pulumi": [],
+    }
+    for path in _iter_files(root, names=_DISCOVERY_NAMES, suffixes=(".tf",)):
+        buckets[_DISCOVERY_NAMES.get(path.name, "terraform")].append(path)
+    return buckets
+
+
+def _rel(path: Path, root: Path) -> str:
+    """Return *path* relative to *root* as a POSIX string (``"."`` for *root*)."""
+    return path.relative_to(root).as_posix()
+
+
+def _parallel_map(
+    fn: Callable[[_T], _R], items: Sequence[_T], pool: ThreadPoolExecutor | None = None,
+) -> list[_R]:
+    """Map *fn* over *items* on a shared pool (the file pool by default), preserving order.
+
+    *fn* must not itself call :func:`_parallel_map` on the same pool, or a full
+    pool would wait on its own queued work.
+    """
+    if len(items) < 2:
+        return [fn(item) for item in items]
+    return list((pool or _file_pool()).map(fn, items))
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  INFRASTRUCTURE → ARCHETYPE MAPPING
 # ══════════════════════════════════════════════════════════════════════════════
 
-# Maps IaC resource types to (archetype, monitoring_notes) tuples.
-_INFRA_ARCHETYPES: dict[str, tuple[str, list[str]]] = {
-    # ── AWS ───────────────────────────────────────────────────────────────
-    "aws_db_instance": ("database", ["Needs CloudWatch or postgres_exporter/mysqld_exporter", "Monitor replication lag, connections, IOPS"]),
-    "aws_rds_cluster": ("database", ["Needs CloudWatch or postgres_exporter/mysqld_exporter", "Monitor replication lag, connections, IOPS"]),
-    "aws_rds_cluster_instance": ("database", ["Instance-level monitoring", "Monitor CPU, memory, disk"]),
-    "aws_elasticache_cluster": ("cache", ["Needs CloudWatch or redis_exporter/memcached_exporter", "Monitor hit rate, evictions, memory"]),
-    "aws_elasticache_replication_group": ("cache", ["Needs redis_exporter", "Monitor replication, failover, memory"]),
-    "aws_mq_broker": ("message-queue", ["Needs CloudWatch or rabbitmq_exporter", "Monitor queue depth, consumers, message rates"]),
-    "aws_msk_cluster": ("message-queue", ["Needs kafka_exporter or JMX", "Monitor consumer lag, partition count, ISR"]),
-    "aws_elasticsearch_domain": ("search-engine", ["Needs CloudWatch or elasticsearch_exporter", "Monitor cluster health, indexing rate, search latency"]),
-    "aws_opensearch_domain": ("search-engine", ["Needs CloudWatch or elasticsearch_exporter", "Monitor cluster health, indexing rate, search latency"]),
-    "aws_sqs_queue": ("message-queue", ["Needs CloudWatch", "Monitor queue depth, age of oldest message"]),
-    "aws_sns_topic": ("message-queue", ["Needs CloudWatch", "Monitor delivery failures, message count"]),
-    "aws_ecs_service": ("custom-app", ["Needs CloudWatch Container Insights", "Monitor task count, CPU, memory"]),
-    "aws_lambda_function": ("custom-app", ["Needs CloudWatch", "Monitor invocations, errors, duration, throttles"]),
-    "aws_s3_bucket": ("custom-app", ["Optional CloudWatch", "Monitor request count, errors, latency if heavily used"]),
-
-    # ── GCP ───────────────────────────────────────────────────────────────
-    "google_sql_database_instance": ("database", ["Needs Cloud Monitoring or postgres_exporter/mysqld_exporter", "Monitor connections, replication lag, disk"]),
-    "google_redis_instance": ("cache", ["Needs Cloud Monitoring or redis_exporter", "Monitor hit rate, evictions, memory"]),
-    "google_pubsub_topic": ("message-queue", ["Needs Cloud Monitoring", "Monitor message backlog, delivery latency"]),
-    "google_pubsub_subscription": ("message-queue", ["Needs Cloud Monitoring", "Monitor unacked messages, delivery latency"]),
-    "google_container_cluster": ("custom-app", ["GKE cluster — needs kube-state-metrics, node-exporter", "Monitor node health, pod scheduling, API server"]),
-
-    # ── Azure ─────────────────────────────────────────────────────────────
-    "azurerm_postgresql_server": ("database", ["Needs Azure Monitor or postgres_exporter", "Monitor connections, replication, storage"]),
-    "azurerm_postgresql_flexible_server": ("database", ["Needs Azure Monitor or postgres_exporter", "Monitor connections, replication, storage"]),
-    "azurerm_mysql_server": ("database", ["Needs Azure Monitor or mysqld_exporter", "Monitor connections, replication, storage"]),
-    "azurerm_mysql_flexible_server": ("database", ["Needs Azure Monitor or mysqld_exporter", "Monitor connections, replication, storage"]),
-    "azurerm_redis_cache": ("cache", ["Needs Azure Monitor or redis_exporter", "Monitor hit rate, evictions, memory, connections"]),
-    "azurerm_cosmosdb_account": ("database", ["Needs Azure Monitor", "Monitor RU consumption, latency, availability"]),
-    "azurerm_servicebus_namespace": ("message-queue", ["Needs Azure Monitor", "Monitor queue depth, message count, dead letters"]),
-    "azurerm_eventhub_namespace": ("message-queue", ["Needs Azure Monitor", "Monitor throughput units, incoming/outgoing messages"]),
-    "azurerm_kubernetes_cluster": ("custom-app", ["AKS cluster — needs kube-state-metrics, node-exporter", "Monitor node health, pod scheduling"]),
-
-    # ── Kubernetes provider ───────────────────────────────────────────────
-    "kubernetes_deployment": ("custom-app", ["Standard K8s workload", "Monitor replicas, restarts, CPU/memory"]),
-    "kubernetes_deployment_v1": ("custom-app", ["Standard K8s workload", "Monitor replicas, restarts, CPU/memory"]),
-    "kubernetes_stateful_set": ("custom-app", ["Stateful workload", "Monitor volume usage, pod identity, restarts"]),
-    "kubernetes_stateful_set_v1": ("custom-app", ["Stateful workload", "Monitor volume usage, pod identity, restarts"]),
-    "kubernetes_daemon_set": ("custom-app", ["DaemonSet", "Monitor desired vs current, node coverage"]),
-    "kubernetes_daemon_set_v1": ("custom-app", ["DaemonSet", "Monitor desired vs current, node coverage"]),
-    "kubernetes_service": ("custom-app", ["K8s Service", "Monitor endpoints, latency if behind mesh"]),
-    "kubernetes_service_v1": ("custom-app", ["K8s Service", "Monitor endpoints, latency if behind mesh"]),
-    "kubernetes_ingress": ("reverse-proxy", ["Ingress controller", "Monitor request rate, error rate, latency"]),
-    "kubernetes_ingress_v1": ("reverse-proxy", ["Ingress controller", "Monitor request rate, error rate, latency"]),
-    "kubernetes_namespace": ("custom-app", []),
-    "kubernetes_namespace_v1": ("custom-app", []),
-    "kubernetes_config_map": ("custom-app", []),
-    "kubernetes_config_map_v1": ("custom-app", []),
-    "kubernetes_secret": ("custom-app", []),
-    "kubernetes_secret_v1": ("custom-app", []),
-}
+# Maps IaC resource types to (archetype, monitoring_notes) tuples.  The
+# literal tables live in iac_archetypes; these are read-only views of them,
+# and a plain dict lookup is already the fastest option for a table this size.
+_INFRA_ARCHETYPES: Mapping[str, tuple[str, tuple[str, ...]]] = MappingProxyType(
+    INFRA_ARCHETYPES
+)
 
 # Helm chart name → archetype
-_HELM_CHART_ARCHETYPES: dict[str, tuple[str, list[str]]] = {
-    "postgresql": ("database", ["Deploy postgres_exporter sidecar", "Import dashboard 9628"]),
-    "mysql": ("database", ["Deploy mysqld_exporter sidecar", "Import dashboard 7362"]),
-    "mariadb": ("database", ["Deploy mysqld_exporter sidecar", "Import dashboard 7362"]),
-    "mongodb": ("database", ["Deploy mongodb_exporter sidecar", "Import dashboard 2583"]),
-    "redis": ("cache", ["Deploy redis_exporter sidecar", "Import dashboard 11835"]),
-    "memcached": ("cache", ["Deploy memcached_exporter sidecar"]),
-    "rabbitmq": ("message-queue", ["Built-in Prometheus metrics", "Import dashboard 10991"]),
-    "kafka": ("message-queue", ["Deploy kafka_exporter", "Import dashboard 7589"]),
-    "nats": ("message-queue", ["Built-in /metrics endpoint", "Import dashboard 2279"]),
-    "elasticsearch": ("search-engine", ["Deploy elasticsearch_exporter", "Import dashboard 4358"]),
-    "opensearch": ("search-engine", ["Deploy elasticsearch_exporter"]),
-    "nginx": ("web-server", ["Import dashboard 9614"]),
-    "nginx-ingress": ("reverse-proxy", ["Import NGINX Ingress dashboard 9614"]),
-    "ingress-nginx": ("reverse-proxy", ["Import NGINX Ingress dashboard 9614"]),
-    "traefik": ("reverse-proxy", ["Built-in /metrics endpoint"]),
-    "prometheus": ("monitoring", ["Self-monitoring"]),
-    "grafana": ("monitoring", ["Grafana self-monitoring"]),
-    "loki": ("logging", ["Loki metrics"]),
-    "argocd": ("custom-app", ["Built-in metrics", "Import dashboard 14584"]),
-    "cert-manager": ("custom-app", ["Built-in metrics", "Import dashboard 11001"]),
-    "harbor": ("custom-app", ["Deploy postgres_exporter, redis_exporter", "Import dashboard 14075"]),
-    "minio": ("custom-app", ["Built-in /minio/v2/metrics", "Import dashboard 13502"]),
-    "istio": ("reverse-proxy", ["Built-in Envoy metrics", "Import dashboard 7639"]),
-    "consul": ("custom-app", ["Built-in /metrics endpoint"]),
-    "vault": ("custom-app", ["Built-in /v1/sys/metrics"]),
-    "tekton-pipelines": ("custom-app", ["Built-in metrics", "Import dashboard 15698"]),
-}
+_HELM_CHART_ARCHETYPES: Mapping[str, tuple[str, tuple[str, ...]]] = MappingProxyType(
+    HELM_CHART_ARCHETYPES
+)
+
+# Lower-cased once; scanned in table order so earlier patterns win.
+_HELM_CHART_PATTERNS: tuple[tuple[str, str, tuple[str, ...]], ...] = tuple(
+    (pattern.lower(), arch, notes)
+    for pattern, (arch, notes) in _HELM_CHART_ARCHETYPES.items()
+)
+
+
+_ArchetypePatterns = tuple[tuple[str, str, tuple[str, ...]], ...]
+
+
+def _build_automaton(patterns: _ArchetypePatterns) -> Any:
+    """Build an Aho-Corasick automaton over *patterns*, if available."""
+    try:
+        import ahocorasick  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    automaton = ahocorasick.Automaton()
+    for index, (pattern, arch, notes) in enumerate(patterns):
+        automaton.add_word(pattern, (index, arch, notes))
+    automaton.make_automaton()
+    return automaton
+
+
+def _scan_patterns(patterns: _ArchetypePatterns, *names: str) -> tuple[str, tuple[str, ...]]:
+    """Linear fallback used when pyahocorasick is not installed."""
+    for pattern, arch, notes in patterns:
+        if any(pattern in name for name in names):
+            return arch, notes
+    return "", ()
+
+
+def _match_patterns(
+    automaton: Any, patterns: _ArchetypePatterns, *names: str,
+) -> tuple[str, tuple[str, ...]]:
+    """Return ``(archetype, notes)`` for the earliest table pattern in any of *names*."""
+    if automaton is None:
+        return _scan_patterns(patterns, *names)
+    # Several patterns can match ("nginx" and "ingress-nginx"); keep table order.
+    best = min((hit for name in names for _, hit in automaton.iter(name)), default=None)
+    if best is None:
+        return "", ()
+    return best[1], best[2]
+
+
+# One pass over the chart name regardless of pattern count (pyahocorasick extra).
+_HELM_AUTOMATON = _build_automaton(_HELM_CHART_PATTERNS)
+
+
+@functools.lru_cache(maxsize=1024)
+def _match_helm_archetype(chart_name: str) -> tuple[str, tuple[str, ...]]:
+    """Return ``(archetype, notes)`` for the first pattern found in *chart_name*."""
+    return _match_patterns(_HELM_AUTOMATON, _HELM_CHART_PATTERNS, chart_name.lower())
+
 
 # Pulumi resource type → archetype
-_PULUMI_ARCHETYPES: dict[str, tuple[str, list[str]]] = {
-    "aws:rds:Instance": ("database", ["Needs postgres_exporter/mysqld_exporter"]),
-    "aws:rds:Cluster": ("database", ["Needs postgres_exporter/mysqld_exporter"]),
-    "aws:elasticache:Cluster": ("cache", ["Needs redis_exporter"]),
-    "aws:elasticache:ReplicationGroup": ("cache", ["Needs redis_exporter"]),
-    "aws:mq:Broker": ("message-queue", ["Needs rabbitmq_exporter"]),
-    "aws:msk:Cluster": ("message-queue", ["Needs kafka_exporter"]),
-    "aws:elasticsearch:Domain": ("search-engine", ["Needs elasticsearch_exporter"]),
-    "aws:sqs:Queue": ("message-queue", ["Monitor via CloudWatch"]),
-    "gcp:sql:DatabaseInstance": ("database", ["Needs postgres_exporter/mysqld_exporter"]),
-    "gcp:redis:Instance": ("cache", ["Needs redis_exporter"]),
-    "azure:postgresql:Server": ("database", ["Needs postgres_exporter"]),
-    "azure:redis:Cache": ("cache", ["Needs redis_exporter"]),
-    "kubernetes:apps/v1:Deployment": ("custom-app", ["Standard K8s workload"]),
-    "kubernetes:apps/v1:StatefulSet": ("custom-app", ["Stateful workload"]),
-    "kubernetes:apps/v1:DaemonSet": ("custom-app", ["DaemonSet"]),
+_PULUMI_ARCHETYPES: Mapping[str, tuple[str, tuple[str, ...]]] = MappingProxyType(
+    PULUMI_ARCHETYPES
+)
+
+# Keys normalised once to the form resource types are compared in.
+_PULUMI_PATTERNS: _ArchetypePatterns = tuple(
+    (key.lower().replace("/", ":"), arch, notes)
+    for key, (arch, notes) in _PULUMI_ARCHETYPES.items()
+)
+
+_PULUMI_AUTOMATON = _build_automaton(_PULUMI_PATTERNS)
+
+# Pattern indices bucketed by provider prefix ("aws:", "kubernetes:", ...).  A
+# key can only occur in a type that contains its prefix, so the linear
+# fallback skips every other bucket — and types from unknown providers
+# (random, custom components) skip the scan entirely.
+_PULUMI_PATTERNS_BY_PREFIX: Mapping[str, tuple[int, ...]] = MappingProxyType({
+    prefix: tuple(i for i, (key, _, _) in enumerate(_PULUMI_PATTERNS) if key.startswith(prefix))
+    for prefix in dict.fromkeys(key.split(":", 1)[0] + ":" for key, _, _ in _PULUMI_PATTERNS)
+})
+
+
+@functools.lru_cache(maxsize=1024)
+def _match_pulumi_archetype(res_type: str) -> tuple[str, tuple[str, ...]]:
+    """Return ``(archetype, notes)`` for a Pulumi resource type.
+
+    Python uses dots where the table keys use colons, and ``k8s`` is the usual
+    alias for the ``kubernetes`` provider, so both spellings are probed.
+    """
+    normalised = res_type.lower().replace(".", ":").replace("/", ":")
+    expanded = normalised.replace("k8s:", "kubernetes:")
+    if _PULUMI_AUTOMATON is not None:
+        return _match_patterns(_PULUMI_AUTOMATON, _PULUMI_PATTERNS, normalised, expanded)
+    indices = sorted(
+        i
+        for prefix, bucket in _PULUMI_PATTERNS_BY_PREFIX.items()
+        if prefix in expanded or prefix in normalised
+        for i in bucket
+    )
+    if not indices:
+        return "", ()
+    candidates = tuple(_PULUMI_PATTERNS[i] for i in indices)
+    return _scan_patterns(candidates, normalised, expanded)
+
+
+# Canonical notes tuples, keyed by value.  Resources rebuilt from the parse
+# cache map their decoded notes back onto these so every resource shares the
+# table's string objects instead of holding its own JSON-decoded copies.
+_NOTES_INTERN: dict[tuple[str, ...], tuple[str, ...]] = {
+    notes: notes
+    for table in (_INFRA_ARCHETYPES, _HELM_CHART_ARCHETYPES, _PULUMI_ARCHETYPES)
+    for _, notes in table.values()
 }
 
 
+def _intern_notes(notes: Sequence[str]) -> tuple[str, ...]:
+    """Return the shared tuple equal to *notes*, registering it if new."""
+    key = tuple(notes)
+    return _NOTES_INTERN.setdefault(key, key)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  PARSE CACHE
+# ══════════════════════════════════════════════════════════════════════════════
+
+_CACHE_VERSION = 3
+
+
+class _ParseCache:
+    """On-disk cache of per-file parse results, keyed by ``(mtime_ns, size)``.
+
+    Only single-file parsers (Terraform, Pulumi programs) are cached — Helm and
+    Kustomize results depend on several files and on rendered output.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._entries: dict[str, list[Any]] = {}
+        self._seen: dict[str, list[Any]] = {}
+        self._dirty = False
+        # resources() runs on several file-pool threads at once
+        self._lock = threading.Lock()
+        try:
+            data = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as exc:
+            logger.debug("Ignoring unreadable IaC cache %s: %s", path, exc)
+            return
+        if isinstance(data, dict) and data.get("version") == _CACHE_VERSION:
+            self._entries = data.get("files", {})
+
+    def resources(
+        self,
+        key: str,
+        path: Path,
+        parse: Callable[[], list[IaCResource]],
+    ) -> list[IaCResource]:
+        """Return cached resources for *path*, calling *parse* on a miss."""
+        st = path.stat()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            with self._lock:
+                self._seen[key] = entry
+            return [
+                IaCResource.model_validate(
+                    {**r, "monitoring_notes": _intern_notes(r.get("monitoring_notes", ()))}
+                )
+                for r in entry[2]
+            ]
+
+        resources = parse()
+        entry = [st.st_mtime_ns, st.st_size, [r.model_dump(mode="json") for r in resources]]
+        with self._lock:
+            self._seen[key] = entry
+            self._dirty = True
+        return resources
+
+    def save(self) -> None:
+        """Write entries seen during this scan, dropping files that disappeared."""
+        if not self._dirty and self._seen.keys() == self._entries.keys():
+            return
+        payload = orjson.dumps({"version": _CACHE_VERSION, "files": self._seen})
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+            tmp.write_bytes(payload)
+            tmp.replace(self._path)
+        except OSError as exc:
+            logger.warning("Failed to write IaC cache %s: %s", self._path, exc)
+
+
+def _parse_with_cache(
+    cache: _ParseCache | None,
+    key: str,
+    path: Path,
+    parse: Callable[[], list[IaCResource]],
+) -> list[IaCResource]:
+    if cache is None:
+        return parse()
+    return cache.resources(key, path, parse)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  TERRAFORM PARSER
 # ══════════════════════════════════════════════════════════════════════════════
 
 
+# Top-level properties worth keeping from a Terraform resource block.
+_TF_PROP_KEYS: tuple[str, ...] = (
+    "engine", "engine_version", "instance_class", "node_type",
+    "image", "chart", "repository", "namespace", "replicas",
+    "allocated_storage", "cluster_identifier", "name",
+)
+
+# One pass over a block picks up every wanted `key = "value"` / `key = value`.
+_TF_ALL_PROPS_RE = re.compile(
+    rf'^\s*(?P<key>{"|".join(_TF_PROP_KEYS)})\s*=\s*(?:"(?P<quoted>[^"]*)"|(?P<bare>\S+))',
+    re.MULTILINE,
+)
+_TF_RESOURCE_RE = re.compile(r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{')
+
+
 def _parse_terraform_file(path: Path, repo_root: Path) -> list[IaCResource]:
     """Parse a single .tf file using python-hcl2 (if available) or regex fallback."""
-    rel = str(path.relative_to(repo_root))
+    rel = _rel(path, repo_root)
     resources: list[IaCResource] = []
 
     try:
@@ -163,14 +414,11 @@ def _parse_terraform_file(path: Path, repo_root: Path) -> list[IaCResource]:
                         if isinstance(body, list):
                             body = body[0] if body else {}
                         archetype, notes = _INFRA_ARCHETYPES.get(
-                            res_type, ("custom-app", [])
+                            res_type, ("custom-app", ())
                         )
                         # Extract key properties
                         props: dict[str, Any] = {}
-                        for key in ("engine", "engine_version", "instance_class",
-                                    "node_type", "image", "chart", "repository",
-                                    "namespace", "replicas", "allocated_storage",
-                                    "cluster_identifier", "name"):
+                        for key in _TF_PROP_KEYS:
                             if key in body:
                                 val = body[key]
                                 # HCL2 wraps values in lists
@@ -186,7 +434,7 @@ def _parse_terraform_file(path: Path, repo_root: Path) -> list[IaCResource]:
                             provider=res_type.split("_")[0] if "_" in res_type else "unknown",
                             properties=props,
                             archetype=archetype,
-                            monitoring_notes=list(notes),
+                            monitoring_notes=notes,
                         ))
 
     except ImportError:
@@ -201,7 +449,7 @@ def _parse_terraform_file(path: Path, repo_root: Path) -> list[IaCResource]:
 
 def _parse_terraform_regex(path: Path, repo_root: Path) -> list[IaCResource]:
     """Regex fallback for Terraform parsing when python-hcl2 is not installed."""
-    rel = str(path.relative_to(repo_root))
+    rel = _rel(path, repo_root)
     resources: list[IaCResource] = []
 
     try:
@@ -210,11 +458,10 @@ def _parse_terraform_regex(path: Path, repo_root: Path) -> list[IaCResource]:
         return resources
 
     # Match: resource "type" "name" {
-    pattern = re.compile(r'resource\s+"([^"]+)"\s+"([^"]+)"\s*\{')
-    for match in pattern.finditer(text):
+    for match in _TF_RESOURCE_RE.finditer(text):
         res_type = match.group(1)
         res_name = match.group(2)
-        archetype, notes = _INFRA_ARCHETYPES.get(res_type, ("custom-app", []))
+        archetype, notes = _INFRA_ARCHETYPES.get(res_type, ("custom-app", ()))
 
         # Try to extract simple string properties from the block
         block_start = match.end()
@@ -228,61 +475,72 @@ def _parse_terraform_regex(path: Path, repo_root: Path) -> list[IaCResource]:
             provider=res_type.split("_")[0] if "_" in res_type else "unknown",
             properties=props,
             archetype=archetype,
-            monitoring_notes=list(notes),
+            monitoring_notes=notes,
         ))
 
     return resources
 
 
-def _extract_tf_block_props(text: str, start: int) -> dict[str, Any]:
-    """Extract top-level key = value pairs from a Terraform block (best effort)."""
-    props: dict[str, Any] = {}
-    depth = 1
-    i = start
-    wanted_keys = {
-        "engine", "engine_version", "instance_class", "node_type",
-        "image", "chart", "repository", "namespace", "replicas",
-        "allocated_storage", "name", "cluster_identifier",
-    }
+def _tf_block_end(text: str, start: int) -> int:
+    """Return the index just past the ``}`` closing the block opened before *start*.
 
-    while i < len(text) and depth > 0:
-        ch = text[i]
-        if ch == "{":
+    Jumps between braces with ``str.find`` rather than stepping through every
+    character; an unterminated block runs to the end of *text*.
+    """
+    depth = 1
+    pos = start
+    next_open = text.find("{", start)
+    while True:
+        close = text.find("}", pos)
+        if close < 0:
+            return len(text)
+        while 0 <= next_open < close:
             depth += 1
-        elif ch == "}":
-            depth -= 1
-        i += 1
-        if depth > 1:
-            continue
+            next_open = text.find("{", next_open + 1)
+        depth -= 1
+        pos = close + 1
+        if depth == 0:
+            return pos
+
 
-    block_text = text[start:i]
-    for key in wanted_keys:
-        # Match: key = "value" or key = value
-        m = re.search(rf'^\s*{key}\s*=\s*"([^"]*)"', block_text, re.MULTILINE)
-        if m:
-            props[key] = m.group(1)
+def _extract_tf_block_props(text: str, start: int) -> dict[str, Any]:
+    """Extract top-level key = value pairs from a Terraform block (best effort)."""
+    props: dict[str, Any] = {}
+    end = _tf_block_end(text, start)
+
+    # A quoted assignment anywhere in the block beats an earlier bare one.
+    quoted: dict[str, str] = {}
+    bare: dict[str, str] = {}
+    for m in _TF_ALL_PROPS_RE.finditer(text[start:end]):
+        if m["quoted"] is not None:
+            quoted.setdefault(m["key"], m["quoted"])
         else:
-            m = re.search(rf'^\s*{key}\s*=\s*(\S+)', block_text, re.MULTILINE)
-            if m:
-                val = m.group(1).strip('"')
-                if val not in ("{", "["):
-                    props[key] = val
+            bare.setdefault(m["key"], m["bare"])
+
+    for key in _TF_PROP_KEYS:
+        if key in quoted:
+            props[key] = quoted[key]
+        elif key in bare:
+            val = bare[key].strip('"')
+            if val not in ("{", "["):
+                props[key] = val
 
     return props
 
 
-def _discover_terraform(repo_root: Path) -> list[IaCResource]:
-    """Find and parse all .tf files in the repo."""
-    resources: list[IaCResource] = []
-    for tf_file in repo_root.rglob("*.tf"):
-        # Skip common non-user directories
-        rel = str(tf_file.relative_to(repo_root))
-        if any(part.startswith(".") for part in tf_file.parts):
-            continue
-        if "vendor" in tf_file.parts or "node_modules" in tf_file.parts:
-            continue
-        resources.extend(_parse_terraform_file(tf_file, repo_root))
-    return resources
+def _discover_terraform(
+    repo_root: Path, cache: _ParseCache | None = None, files: Sequence[Path] | None = None,
+) -> list[IaCResource]:
+    """Find and parse all .tf files in the repo (or just *files*, if given)."""
+    tf_files = list(_iter_files(repo_root, suffixes=(".tf",))) if files is None else files
+
+    def parse(tf_file: Path) -> list[IaCResource]:
+        return _parse_with_cache(
+            cache, f"terraform:{_rel(tf_file, repo_root)}", tf_file,
+            lambda: _parse_terraform_file(tf_file, repo_root),
+        )
+
+    return [r for parsed in _parallel_map(parse, tf_files) for r in parsed]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -290,91 +548,110 @@ def _discover_terraform(repo_root: Path) -> list[IaCResource]:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def _discover_helm_charts(repo_root: Path) -> tuple[list[IaCResource], list[dict[str, Any]], list[K8sResource]]:
+def _discover_helm_charts(
+    repo_root: Path, files: Sequence[Path] | None = None,
+) -> tuple[list[IaCResource], list[dict[str, Any]], list[K8sResource]]:
     """Discover Helm charts and extract observability-relevant information.
 
+    *files* are pre-found ``Chart.yaml`` paths; the repo is walked if omitted.
     Returns (iac_resources, helm_releases, k8s_resources_from_templates).
     """
     iac_resources: list[IaCResource] = []
     helm_releases: list[dict[str, Any]] = []
     k8s_resources: list[K8sResource] = []
 
-    for chart_yaml in repo_root.rglob("Chart.yaml"):
-        rel_dir = str(chart_yaml.parent.relative_to(repo_root))
-        if any(part.startswith(".") for part in chart_yaml.parts):
-            continue
-        try:
-            chart_data = yaml.safe_load(chart_yaml.read_text(encoding="utf-8"))
-        except Exception as exc:
-            logger.warning("Failed to parse %s: %s", chart_yaml, exc)
+    chart_files = list(_iter_files(repo_root, names=("Chart.yaml",))) if files is None else files
+    parsed = _parallel_map(lambda c: _parse_helm_chart(c, repo_root), chart_files)
+    to_render: list[tuple[Path, str, list[str]]] = []
+    for chart_yaml, result in zip(chart_files, parsed):
+        if result is None:
             continue
+        chart_name, chart_resources, chart_releases = result
+        iac_resources.extend(chart_resources)
+        helm_releases.extend(chart_releases)
+        to_render.append(
+            (chart_yaml.parent, chart_name, [rel["chart"] for rel in chart_releases]),
+        )
 
-        if not isinstance(chart_data, dict):
-            continue
+    # Try rendering templates with `helm template`
+    for rendered in _parallel_map(
+        lambda job: _render_helm_chart(*job), to_render, _render_pool(),
+    ):
+        k8s_resources.extend(rendered)
 
-        chart_name = chart_data.get("name", "unknown")
-        chart_version = chart_data.get("version", "")
+    return iac_resources, helm_releases, k8s_resources
 
-        # Check chart archetype
-        archetype, notes = "", []
-        for pattern, (arch, n) in _HELM_CHART_ARCHETYPES.items():
-            if pattern in chart_name.lower():
-                archetype, notes = arch, n
-                break
 
-        iac_resources.append(IaCResource(
-            source=IaCSource.HELM,
-            source_file=str(chart_yaml.relative_to(repo_root)),
-            resource_type="helm_chart",
-            name=chart_name,
-            provider="helm",
-            properties={
-                "version": chart_version,
-                "description": chart_data.get("description", ""),
-                "app_version": chart_data.get("appVersion", ""),
-                "type": chart_data.get("type", "application"),
-            },
-            archetype=archetype,
-            monitoring_notes=list(notes),
-        ))
+def _parse_helm_chart(
+    chart_yaml: Path, repo_root: Path,
+) -> tuple[str, list[IaCResource], list[dict[str, Any]]] | None:
+    """Parse one Chart.yaml (plus its values.yaml) into resources and releases.
 
-        # Parse dependencies
-        for dep in chart_data.get("dependencies", []):
-            dep_name = dep.get("name", "")
-            dep_arch, dep_notes = "", []
-            for pattern, (arch, n) in _HELM_CHART_ARCHETYPES.items():
-                if pattern in dep_name.lower():
-                    dep_arch, dep_notes = arch, n
-                    break
-            if dep_name:
-                helm_releases.append({
-                    "chart": dep_name,
-                    "version": dep.get("version", ""),
-                    "repository": dep.get("repository", ""),
-                    "parent_chart": chart_name,
-                })
-                if dep_arch:
-                    iac_resources.append(IaCResource(
-                        source=IaCSource.HELM,
-                        source_file=str(chart_yaml.relative_to(repo_root)),
-                        resource_type="helm_dependency",
-                        name=dep_name,
-                        provider="helm",
-                        properties=dep,
-                        archetype=dep_arch,
-                        monitoring_notes=list(dep_notes),
-                    ))
-
-        # Parse values.yaml for image references
-        values_yaml = chart_yaml.parent / "values.yaml"
-        if values_yaml.exists():
-            _extract_helm_values(values_yaml, repo_root, chart_name, iac_resources)
-
-        # Try rendering templates with `helm template`
-        rendered = _render_helm_chart(chart_yaml.parent, chart_name)
-        k8s_resources.extend(rendered)
+    Returns ``None`` when the chart file is unreadable or not a mapping.
+    """
+    iac_resources: list[IaCResource] = []
+    helm_releases: list[dict[str, Any]] = []
 
-    return iac_resources, helm_releases, k8s_resources
+    try:
+        chart_data = _yload_json_first(chart_yaml.read_bytes())
+    except Exception as exc:
+        logger.warning("Failed to parse %s: %s", chart_yaml, exc)
+        return None
+
+    if not isinstance(chart_data, dict):
+        return None
+
+    chart_name = chart_data.get("name", "unknown")
+    chart_version = chart_data.get("version", "")
+
+    # Check chart archetype
+    archetype, notes = _match_helm_archetype(chart_name)
+
+    iac_resources.append(IaCResource(
+        source=IaCSource.HELM,
+        source_file=_rel(chart_yaml, repo_root),
+        resource_type="helm_chart",
+        name=chart_name,
+        provider="helm",
+        properties={
+            "version": chart_version,
+            "description": chart_data.get("description", ""),
+            "app_version": chart_data.get("appVersion", ""),
+            "type": chart_data.get("type", "application"),
+        },
+        archetype=archetype,
+        monitoring_notes=notes,
+    ))
+
+    # Parse dependencies
+    for dep in chart_data.get("dependencies", []):
+        dep_name = dep.get("name", "")
+        dep_arch, dep_notes = _match_helm_archetype(dep_name)
+        if dep_name:
+            helm_releases.append({
+                "chart": dep_name,
+                "version": dep.get("version", ""),
+                "repository": dep.get("repository", ""),
+                "parent_chart": chart_name,
+            })
+            if dep_arch:
+                iac_resources.append(IaCResource(
+                    source=IaCSource.HELM,
+                    source_file=_rel(chart_yaml, repo_root),
+                    resource_type="helm_dependency",
+                    name=dep_name,
+                    provider="helm",
+                    properties=dep,
+                    archetype=dep_arch,
+                    monitoring_notes=dep_notes,
+                ))
+
+    # Parse values.yaml for image references
+    values_yaml = chart_yaml.parent / "values.yaml"
+    if values_yaml.exists():
+        _extract_helm_values(values_yaml, repo_root, chart_name, iac_resources)
+
+    return chart_name, iac_resources, helm_releases
 
 
 def _extract_helm_values(
@@ -385,14 +662,14 @@ def _extract_helm_values(
 ) -> None:
     """Extract image references and config from values.yaml."""
     try:
-        data = yaml.safe_load(values_path.read_text(encoding="utf-8"))
+        data = _yload_file(values_path)
     except Exception:
         return
 
     if not isinstance(data, dict):
         return
 
-    rel = str(values_path.relative_to(repo_root))
+    rel = _rel(values_path, repo_root)
     images = _find_images_in_dict(data)
     for img in images:
         resources.append(IaCResource(
@@ -405,66 +682,133 @@ def _extract_helm_values(
         ))
 
 
-def _find_images_in_dict(d: dict, prefix: str = "") -> list[str]:
-    """Recursively find image references in a nested dict (Helm values style)."""
+def _find_images_in_dict(root: dict) -> list[str]:
+    """Find image references in a nested dict (Helm values style).
+
+    Walks the tree with an explicit stack, so arbitrarily deep values files
+    cannot hit the recursion limit.  Results are in depth-first key order.
+    """
     images: list[str] = []
-    if not isinstance(d, dict):
-        return images
-
-    # Common patterns: image.repository + image.tag, or image: "..."
-    if "repository" in d and "tag" in d:
-        repo = d["repository"]
-        tag = d["tag"]
-        if isinstance(repo, str) and repo:
-            images.append(f"{repo}:{tag}" if tag else repo)
-    elif "image" in d:
-        img = d["image"]
-        if isinstance(img, str) and img and "/" in img:
-            images.append(img)
-        elif isinstance(img, dict):
-            images.extend(_find_images_in_dict(img))
-
-    for key, val in d.items():
-        if key in ("repository", "tag", "image"):
+    stack: list[Any] = [root]
+
+    while stack:
+        d = stack.pop()
+        if not isinstance(d, dict):
             continue
-        if isinstance(val, dict):
-            images.extend(_find_images_in_dict(val, prefix=f"{prefix}{key}."))
-        elif isinstance(val, list):
-            for item in val:
-                if isinstance(item, dict):
-                    images.extend(_find_images_in_dict(item, prefix=f"{prefix}{key}[]."))
+
+        children: list[dict] = []
+        # Common patterns: image.repository + image.tag, or image: "..."
+        if "repository" in d and "tag" in d:
+            repo = d["repository"]
+            tag = d["tag"]
+            if isinstance(repo, str) and repo:
+                images.append(f"{repo}:{tag}" if tag else repo)
+        elif "image" in d:
+            img = d["image"]
+            if isinstance(img, str) and img and "/" in img:
+                images.append(img)
+            elif isinstance(img, dict):
+                children.append(img)
+
+        for key, val in d.items():
+            if key in ("repository", "tag", "image"):
+                continue
+            if isinstance(val, dict):
+                children.append(val)
+            elif isinstance(val, list):
+                children.extend(item for item in val if isinstance(item, dict))
+
+        stack.extend(reversed(children))
 
     return images
 
 
-def _render_helm_chart(chart_dir: Path, chart_name: str) -> list[K8sResource]:
+def _rendered_resources(docs: Iterable[Any], source: str) -> list[K8sResource]:
+    """Convert rendered manifest documents into K8sResources."""
+    return [
+        _parse_resource(doc, source)
+        for doc in docs
+        if isinstance(doc, dict) and "apiVersion" in doc and "kind" in doc and "metadata" in doc
+    ]
+
+
+def _stream_render(
+    cmd: list[str], source: str, timeout: float = 30,
+) -> tuple[int, str, list[K8sResource]]:
+    """Run a manifest renderer and parse its stdout as it streams in.
+
+    The output is never buffered into one string, so large umbrella charts
+    don't hold both the text and the parsed documents at once.  Returns
+    ``(returncode, stderr_head, resources)``; resources are only meaningful
+    when the return code is 0.  Raises :class:`subprocess.TimeoutExpired`
+    when the renderer runs longer than *timeout* seconds.
+    """
+    timed_out = threading.Event()
+    # stderr goes to a file so a chatty renderer can't block on a full pipe
+    # while we are still reading stdout.
+    with tempfile.TemporaryFile() as stderr, subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=stderr,
+    ) as proc:
+        def kill() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            resources = _rendered_resources(load_yaml_all(proc.stdout), source)
+            returncode = proc.wait()
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            timer.cancel()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        stderr.seek(0)
+        stderr_head = stderr.read(200).decode("utf-8", errors="replace")
+    return returncode, stderr_head, resources
+
+
+def _helm_dependencies_vendored(chart_dir: Path, dependencies: Sequence[str]) -> bool:
+    """Whether every dependency is present under ``charts/`` as a dir or ``.tgz``."""
+    if not dependencies:
+        return True
+    try:
+        vendored = {entry.name for entry in os.scandir(chart_dir / "charts")}
+    except OSError:
+        return False
+    return all(
+        name in vendored
+        or any(v.startswith(f"{name}-") and v.endswith(".tgz") for v in vendored)
+        for name in dependencies
+    )
+
+
+def _render_helm_chart(
+    chart_dir: Path, chart_name: str, dependencies: Sequence[str] = (),
+) -> list[K8sResource]:
     """Try `helm template` to render full K8s manifests from a chart."""
     if not shutil.which("helm"):
         logger.debug("helm binary not found — skipping template rendering for %s", chart_name)
         return []
+    if not _helm_dependencies_vendored(chart_dir, dependencies):
+        # helm template would fail with "missing in charts/ directory"
+        logger.debug(
+            "Dependencies of %s not in charts/ (run `helm dependency build`) — skipping render",
+            chart_name,
+        )
+        return []
 
     try:
-        result = subprocess.run(
-            ["helm", "template", chart_name, str(chart_dir)],
-            capture_output=True,
-            text=True,
-            timeout=30,
+        returncode, stderr, resources = _stream_render(
+            ["helm", "template", chart_name, str(chart_dir), "--skip-tests"],
+            f"helm:{chart_name}",
         )
-        if result.returncode != 0:
-            logger.debug("helm template failed for %s: %s", chart_name, result.stderr[:200])
+        if returncode != 0:
+            logger.debug("helm template failed for %s: %s", chart_name, stderr)
             return []
-
-        # Parse the rendered YAML — import here to avoid circular imports
-        from k8s_observability_agent.scanner import parse_manifest_file as _parse
-
-        resources: list[K8sResource] = []
-        for doc in yaml.safe_load_all(result.stdout):
-            if doc is None:
-                continue
-            if isinstance(doc, dict) and "apiVersion" in doc and "kind" in doc and "metadata" in doc:
-                from k8s_observability_agent.scanner import _parse_resource
-                res = _parse_resource(doc, f"helm:{chart_name}")
-                resources.append(res)
         return resources
 
     except Exception as exc:
@@ -477,77 +821,37 @@ def _render_helm_chart(chart_dir: Path, chart_name: str) -> list[K8sResource]:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def _discover_kustomize(repo_root: Path) -> tuple[list[IaCResource], list[K8sResource]]:
-    """Discover kustomization.yaml files and parse or render them."""
+def _discover_kustomize(
+    repo_root: Path, files: Sequence[Path] | None = None,
+) -> tuple[list[IaCResource], list[K8sResource]]:
+    """Discover kustomization.yaml files (or use *files*) and parse or render them."""
     iac_resources: list[IaCResource] = []
     k8s_resources: list[K8sResource] = []
 
-    for kust_file in repo_root.rglob("kustomization.yaml"):
-        if any(part.startswith(".") for part in kust_file.parts):
+    kust_files: list[Path] = []
+    kust_yml_files: list[Path] = []
+    if files is None:
+        files = list(_iter_files(repo_root, names=("kustomization.yaml", "kustomization.yml")))
+    for kust_file in files:
+        (kust_files if kust_file.suffix == ".yaml" else kust_yml_files).append(kust_file)
+
+    parsed = _parallel_map(lambda k: _parse_kustomization(k, repo_root), kust_files)
+    to_render: list[Path] = []
+    for kust_file, kust_resources in zip(kust_files, parsed):
+        if kust_resources is None:
             continue
-        rel = str(kust_file.relative_to(repo_root))
+        iac_resources.extend(kust_resources)
+        to_render.append(kust_file.parent)
 
-        try:
-            data = yaml.safe_load(kust_file.read_text(encoding="utf-8"))
-        except Exception as exc:
-            logger.warning("Failed to parse %s: %s", rel, exc)
-            continue
-
-        if not isinstance(data, dict):
-            continue
-
-        # Record the kustomization itself
-        iac_resources.append(IaCResource(
-            source=IaCSource.KUSTOMIZE,
-            source_file=rel,
-            resource_type="kustomization",
-            name=str(kust_file.parent.relative_to(repo_root)),
-            provider="kustomize",
-            properties={
-                "resources": data.get("resources", []),
-                "bases": data.get("bases", []),
-                "patches": [
-                    p if isinstance(p, str) else p.get("path", str(p))
-                    for p in data.get("patches", [])
-                    if p
-                ],
-                "namespace": data.get("namespace", ""),
-                "generators": list(data.get("generators", [])),
-                "transformers": list(data.get("transformers", [])),
-            },
-        ))
-
-        # Collect Helm chart generators
-        for gen in data.get("helmCharts", []):
-            if isinstance(gen, dict):
-                chart_name = gen.get("name", "")
-                archetype, notes = "", []
-                for pattern, (arch, n) in _HELM_CHART_ARCHETYPES.items():
-                    if pattern in chart_name.lower():
-                        archetype, notes = arch, n
-                        break
-                iac_resources.append(IaCResource(
-                    source=IaCSource.KUSTOMIZE,
-                    source_file=rel,
-                    resource_type="kustomize_helm_chart",
-                    name=chart_name,
-                    provider="kustomize",
-                    properties=gen,
-                    archetype=archetype,
-                    monitoring_notes=list(notes),
-                ))
-
-        # Try `kubectl kustomize`
-        rendered = _render_kustomize(kust_file.parent)
+    # Try `kubectl kustomize`
+    for rendered in _parallel_map(_render_kustomize, to_render, _render_pool()):
         k8s_resources.extend(rendered)
 
     # Also check for kustomization.yml (alternate extension)
-    for kust_file in repo_root.rglob("kustomization.yml"):
-        if any(part.startswith(".") for part in kust_file.parts):
-            continue
-        rel = str(kust_file.relative_to(repo_root))
+    for kust_file in kust_yml_files:
+        rel = _rel(kust_file, repo_root)
         try:
-            data = yaml.safe_load(kust_file.read_text(encoding="utf-8"))
+            data = _yload_file(kust_file)
         except Exception:
             continue
         if isinstance(data, dict):
@@ -555,7 +859,7 @@ def _discover_kustomize(repo_root: Path) -> tuple[list[IaCResource], list[K8sRes
                 source=IaCSource.KUSTOMIZE,
                 source_file=rel,
                 resource_type="kustomization",
-                name=str(kust_file.parent.relative_to(repo_root)),
+                name=_rel(kust_file.parent, repo_root),
                 provider="kustomize",
                 properties={
                     "resources": data.get("resources", []),
@@ -567,6 +871,62 @@ def _discover_kustomize(repo_root: Path) -> tuple[list[IaCResource], list[K8sRes
     return iac_resources, k8s_resources
 
 
+def _parse_kustomization(kust_file: Path, repo_root: Path) -> list[IaCResource] | None:
+    """Parse one kustomization.yaml and its helmCharts generators.
+
+    Returns ``None`` when the file is unreadable or not a mapping.
+    """
+    rel = _rel(kust_file, repo_root)
+
+    try:
+        data = _yload_file(kust_file)
+    except Exception as exc:
+        logger.warning("Failed to parse %s: %s", rel, exc)
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    # Record the kustomization itself
+    iac_resources = [IaCResource(
+        source=IaCSource.KUSTOMIZE,
+        source_file=rel,
+        resource_type="kustomization",
+        name=_rel(kust_file.parent, repo_root),
+        provider="kustomize",
+        properties={
+            "resources": data.get("resources", []),
+            "bases": data.get("bases", []),
+            "patches": [
+                p if isinstance(p, str) else p.get("path", str(p))
+                for p in data.get("patches", [])
+                if p
+            ],
+            "namespace": data.get("namespace", ""),
+            "generators": list(data.get("generators", [])),
+            "transformers": list(data.get("transformers", [])),
+        },
+    )]
+
+    # Collect Helm chart generators
+    for gen in data.get("helmCharts", []):
+        if isinstance(gen, dict):
+            chart_name = gen.get("name", "")
+            archetype, notes = _match_helm_archetype(chart_name)
+            iac_resources.append(IaCResource(
+                source=IaCSource.KUSTOMIZE,
+                source_file=rel,
+                resource_type="kustomize_helm_chart",
+                name=chart_name,
+                provider="kustomize",
+                properties=gen,
+                archetype=archetype,
+                monitoring_notes=notes,
+            ))
+
+    return iac_resources
+
+
 def _render_kustomize(kust_dir: Path) -> list[K8sResource]:
     """Try `kubectl kustomize` to render overlays into final manifests."""
     kubectl = shutil.which("kubectl")
@@ -575,24 +935,13 @@ def _render_kustomize(kust_dir: Path) -> list[K8sResource]:
         return []
 
     try:
-        result = subprocess.run(
+        returncode, stderr, resources = _stream_render(
             [kubectl, "kustomize", str(kust_dir)],
-            capture_output=True,
-            text=True,
-            timeout=30,
+            f"kustomize:{kust_dir.name}",
         )
-        if result.returncode != 0:
-            logger.debug("kubectl kustomize failed for %s: %s", kust_dir, result.stderr[:200])
+        if returncode != 0:
+            logger.debug("kubectl kustomize failed for %s: %s", kust_dir, stderr)
             return []
-
-        resources: list[K8sResource] = []
-        for doc in yaml.safe_load_all(result.stdout):
-            if doc is None:
-                continue
-            if isinstance(doc, dict) and "apiVersion" in doc and "kind" in doc and "metadata" in doc:
-                from k8s_observability_agent.scanner import _parse_resource
-                res = _parse_resource(doc, f"kustomize:{kust_dir.name}")
-                resources.append(res)
         return resources
 
     except Exception as exc:
@@ -604,21 +953,57 @@ def _render_kustomize(kust_dir: Path) -> list[K8sResource]:
 #  PULUMI PARSER
 # ══════════════════════════════════════════════════════════════════════════════
 
+# One pattern for every runtime's constructor-call style, so a program file is
+# scanned in a single pass.  Each alternative names its own groups:
+#   js:  new aws.rds.Instance("name", { ... })
+#   go:  rds.NewInstance(ctx, "name", ...)
+#   py:  aws.rds.Instance("name", ...)   (fallback for files ast cannot parse)
+# It is a bytes pattern: programs are scanned undecoded and only the captured
+# names are decoded.
+_PULUMI_CONSTRUCTOR_RE = re.compile(
+    rb'new\s+(?P<js>\w+(?:\.\w+)+)\s*\(\s*["\'](?P<js_name>[^"\']+)["\']'
+    rb'|(?P<go>\w+)\.New(?P<go_type>\w+)\s*\(\s*\w+\s*,\s*["\'](?P<go_name>[^"\']+)["\']'
+    rb'|(?P<py>\w+(?:\.\w+)+)\s*\(\s*["\'](?P<py_name>[^"\']+)["\']',
+)
 
-def _discover_pulumi(repo_root: Path) -> list[IaCResource]:
-    """Discover Pulumi projects and extract resource definitions via static analysis."""
+# Runtime → the constructor style accepted from _PULUMI_CONSTRUCTOR_RE.  Other
+# styles are still matched (they share the scan) but dropped, since e.g. a
+# ``console.log("x")`` call in a TypeScript program is not a resource.
+_PULUMI_RUNTIME_STYLES: Mapping[str, str] = MappingProxyType({
+    "python": "py",
+    "python3": "py",
+    "nodejs": "js",
+    "typescript": "js",
+    "go": "go",
+})
+
+# A byte string every match of each style must contain; files without it skip
+# the regex scan entirely (a substring test is far cheaper than finditer).
+_PULUMI_STYLE_NEEDLES: Mapping[str, bytes] = MappingProxyType({
+    "js": b"new",
+    "go": b".New",
+    "py": b"(",
+})
+
+
+def _discover_pulumi(
+    repo_root: Path, cache: _ParseCache | None = None, files: Sequence[Path] | None = None,
+) -> list[IaCResource]:
+    """Discover Pulumi projects and extract resource definitions via static analysis.
+
+    *files* are pre-found ``Pulumi.yaml`` paths; the repo is walked if omitted.
+    """
     resources: list[IaCResource] = []
 
-    for pulumi_yaml in repo_root.rglob("Pulumi.yaml"):
-        if any(part.startswith(".") for part in pulumi_yaml.parts):
-            continue
-
+    if files is None:
+        files = list(_iter_files(repo_root, names=("Pulumi.yaml",)))
+    for pulumi_yaml in files:
         project_dir = pulumi_yaml.parent
-        rel_base = str(project_dir.relative_to(repo_root))
+        rel_base = _rel(project_dir, repo_root)
 
         # Parse project metadata
         try:
-            proj = yaml.safe_load(pulumi_yaml.read_text(encoding="utf-8"))
+            proj = _yload_json_first(pulumi_yaml.read_bytes())
         except Exception:
             continue
 
@@ -641,72 +1026,69 @@ def _discover_pulumi(repo_root: Path) -> list[IaCResource]:
 
         # Parse program files based on runtime
         if runtime in ("python", "python3"):
-            program_files = list(project_dir.rglob("*.py"))
+            suffixes: tuple[str, ...] = (".py",)
         elif runtime in ("nodejs", "typescript"):
-            program_files = list(project_dir.rglob("*.ts")) + list(project_dir.rglob("*.js"))
+            suffixes = (".ts", ".js")
         elif runtime == "go":
-            program_files = list(project_dir.rglob("*.go"))
+            suffixes = (".go",)
         elif runtime == "yaml":
-            program_files = list(project_dir.rglob("*.yaml")) + list(project_dir.rglob("*.yml"))
+            suffixes = (".yaml", ".yml")
         else:
-            program_files = []
+            suffixes = ()
+        program_files = list(_iter_files(project_dir, suffixes=suffixes)) if suffixes else []
 
-        for prog_file in program_files:
-            if any(skip in str(prog_file) for skip in ("node_modules", "venv", ".venv", "__pycache__")):
-                continue
-            resources.extend(_parse_pulumi_program(prog_file, repo_root, runtime))
+        def parse(prog_file: Path, runtime: str = runtime) -> list[IaCResource]:
+            return _parse_with_cache(
+                cache, f"pulumi:{runtime}:{_rel(prog_file, repo_root)}", prog_file,
+                lambda: _parse_pulumi_program(prog_file, repo_root, runtime),
+            )
+
+        for parsed in _parallel_map(parse, program_files):
+            resources.extend(parsed)
 
     return resources
 
 
 def _parse_pulumi_program(path: Path, repo_root: Path, runtime: str) -> list[IaCResource]:
     """Static analysis of Pulumi program files to find resource constructors."""
-    rel = str(path.relative_to(repo_root))
+    rel = _rel(path, repo_root)
     resources: list[IaCResource] = []
 
     try:
-        text = path.read_text(encoding="utf-8", errors="replace")
+        data = path.read_bytes()
     except Exception:
         return resources
 
-    if runtime in ("python", "python3"):
-        # Match: aws.rds.Instance("name", ...) or k8s.apps.v1.Deployment("name", ...)
-        pattern = re.compile(
-            r'(\w+(?:\.\w+)+)\s*\(\s*["\']([^"\']+)["\']',
-        )
-    elif runtime in ("nodejs", "typescript"):
-        # Match: new aws.rds.Instance("name", { ... })
-        pattern = re.compile(
-            r'new\s+(\w+(?:\.\w+)+)\s*\(\s*["\']([^"\']+)["\']',
-        )
-    elif runtime == "go":
-        # Match: rds.NewInstance(ctx, "name", ...)
-        pattern = re.compile(
-            r'(\w+)\.New(\w+)\s*\(\s*\w+\s*,\s*["\']([^"\']+)["\']',
-        )
-    else:
+    style = _PULUMI_RUNTIME_STYLES.get(runtime)
+    # Every constructor style is a call; helper modules with no call at all
+    # (constants, type stubs) skip both the ast parse and the regex.
+    if style is None or b"(" not in data:
         return resources
 
-    for match in pattern.finditer(text):
-        if runtime == "go":
-            pkg = match.group(1)
-            type_name = match.group(2)
-            res_name = match.group(3)
-            res_type = f"{pkg}:{type_name}"
-        else:
-            res_type = match.group(1)
-            res_name = match.group(2)
-
-        # Map to archetype — normalise delimiters (Python uses dots, keys use colons)
-        archetype, notes = "", []
-        normalised = res_type.lower().replace(".", ":").replace("/", ":")
-        # Also handle common aliases (k8s → kubernetes)
-        normalised_expanded = normalised.replace("k8s:", "kubernetes:")
-        for pulumi_type, (arch, n) in _PULUMI_ARCHETYPES.items():
-            key = pulumi_type.lower().replace("/", ":")
-            if key in normalised or key in normalised_expanded:
-                archetype, notes = arch, n
-                break
+    constructors: list[tuple[str, str]] | None = None
+    if style == "py":
+        # The regex is only the fallback for files ast cannot parse.
+        constructors = _find_python_constructors(data.decode("utf-8", "replace"))
+
+    if constructors is None and _PULUMI_STYLE_NEEDLES[style] not in data:
+        return resources
+    if constructors is None:
+        constructors = []
+        for match in _PULUMI_CONSTRUCTOR_RE.finditer(data):
+            js, js_name, go, go_type, go_name, py, py_name = match.groups()
+            if style == "js" and js is not None:
+                res_type, res_name = js.decode(), js_name
+            elif style == "go" and go is not None:
+                res_type, res_name = f"{go.decode()}:{go_type.decode()}", go_name
+            elif style == "py" and py is not None:
+                res_type, res_name = py.decode(), py_name
+            else:
+                continue
+            constructors.append((res_type, res_name.decode("utf-8", "replace")))
+
+    for res_type, res_name in constructors:
+
+        archetype, notes = _match_pulumi_archetype(res_type)
 
         # Infer provider from the type prefix
         provider = res_type.split(".")[0] if "." in res_type else "unknown"
@@ -719,12 +1101,50 @@ def _parse_pulumi_program(path: Path, repo_root: Path, runtime: str) -> list[IaC
             provider=provider,
             properties={},
             archetype=archetype,
-            monitoring_notes=list(notes),
+            monitoring_notes=notes,
         ))
 
     return resources
 
 
+def _dotted_name(node: ast.expr) -> str | None:
+    """Return ``a.b.C`` for an attribute chain rooted at a plain name."""
+    parts: list[str] = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name) or not parts:
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _find_python_constructors(text: str) -> list[tuple[str, str]] | None:
+    """Find ``pkg.mod.Type("name", ...)`` calls in a Pulumi Python program.
+
+    Returns ``(resource_type, name)`` in source order, or ``None`` if the
+    file does not parse so the caller can fall back to regex.
+    """
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+
+    found: list[tuple[int, int, str, str]] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not node.args:
+            continue
+        res_type = _dotted_name(node.func)
+        if res_type is None:
+            continue
+        first = node.args[0]
+        if isinstance(first, ast.Constant) and isinstance(first.value, str) and first.value:
+            found.append((node.lineno, node.col_offset, res_type, first.value))
+
+    found.sort(key=lambda item: item[:2])
+    return [(res_type, name) for _, _, res_type, name in found]
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  TERRAFORM HELM_RELEASE EXTRACTION
 # ══════════════════════════════════════════════════════════════════════════════
@@ -735,22 +1155,24 @@ def _extract_helm_releases_from_terraform(
 ) -> list[dict[str, Any]]:
     """Extract helm_release info from parsed Terraform resources."""
     releases: list[dict[str, Any]] = []
-    for r in tf_resources:
-        if r.resource_type == "helm_release":
-            chart = r.properties.get("chart", r.name)
-            releases.append({
-                "chart": chart,
-                "repository": r.properties.get("repository", ""),
-                "namespace": r.properties.get("namespace", ""),
-                "name": r.name,
-                "source": "terraform",
-            })
-            # Update archetype based on chart name
-            for pattern, (arch, notes) in _HELM_CHART_ARCHETYPES.items():
-                if pattern in chart.lower():
-                    r.archetype = arch
-                    r.monitoring_notes = list(notes)
-                    break
+    helm_rs = [r for r in tf_resources if r.resource_type == "helm_release"]
+    for r in helm_rs:
+        chart = r.properties.get("chart", r.name)
+        releases.append({
+            "chart": chart,
+            "repository": r.properties.get("repository", ""),
+            "namespace": r.properties.get("namespace", ""),
+            "name": r.name,
+            "source": "terraform",
+        })
+        # Update archetype based on chart name
+        arch, notes = _match_helm_archetype(chart)
+        if arch:
+            r.archetype = arch
+            # Plain attribute assignment skips validation, so copy the
+            # shared tuple into a list — but only when it actually changes.
+            if tuple(r.monitoring_notes) != notes:
+                r.monitoring_notes = list(notes)
     return releases
 
 
@@ -759,7 +1181,7 @@ def _extract_helm_releases_from_terraform(
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def scan_iac(repo_root: Path) -> IaCDiscovery:
+def scan_iac(repo_root: Path, cache_path: Path | None = None) -> IaCDiscovery:
     """Scan a repository for all IaC formats and return aggregated results.
 
     This is the main entry point for IaC analysis.  It discovers and parses:
@@ -770,6 +1192,9 @@ def scan_iac(repo_root: Path) -> IaCDiscovery:
 
     Returns an IaCDiscovery with all found resources, helm releases,
     and any K8s resources that could be rendered from IaC.
+
+    When *cache_path* is given, per-file Terraform and Pulumi parse results
+    are reused from (and written back to) that JSON file for unchanged files.
     """
     repo_root = Path(repo_root).resolve()
     if not repo_root.is_dir():
@@ -778,28 +1203,43 @@ def scan_iac(repo_root: Path) -> IaCDiscovery:
     all_resources: list[IaCResource] = []
     all_helm_releases: list[dict[str, Any]] = []
     all_k8s_resources: list[K8sResource] = []
-    all_files: list[str] = []
+    all_files: set[str] = set()
     errors: list[str] = []
+    cache = _ParseCache(Path(cache_path)) if cache_path else None
+
+    # The four discoveries are independent — run them side by side and
+    # collect results in a fixed order so output stays deterministic.  The
+    # pool is not joined up front: each block below waits only on its own
+    # future, so post-processing overlaps the scanners still running.
+    # One walk of the tree feeds all four scanners.
+    files = _classify_repo(repo_root)
+    pool = ThreadPoolExecutor(max_workers=4)
+    tf_future = pool.submit(_discover_terraform, repo_root, cache, files["terraform"])
+    helm_future = pool.submit(_discover_helm_charts, repo_root, files["helm"])
+    kust_future = pool.submit(_discover_kustomize, repo_root, files["kustomize"])
+    pulumi_future = pool.submit(_discover_pulumi, repo_root, cache, files["pulumi"])
+    pool.shutdown(wait=False)
 
     # ── Terraform ─────────────────────────────────────────────────────
     try:
-        tf_resources = _discover_terraform(repo_root)
+        tf_resources = tf_future.result()
         all_resources.extend(tf_resources)
         all_helm_releases.extend(_extract_helm_releases_from_terraform(tf_resources))
-        all_files.extend(sorted({r.source_file for r in tf_resources}))
+        tf_files = {r.source_file for r in tf_resources}
+        all_files.update(tf_files)
         logger.info("Terraform: found %d resources in %d files",
-                     len(tf_resources), len({r.source_file for r in tf_resources}))
+                     len(tf_resources), len(tf_files))
     except Exception as exc:
         errors.append(f"Terraform scan error: {exc}")
         logger.warning("Terraform scan failed: %s", exc)
 
     # ── Helm ──────────────────────────────────────────────────────────
     try:
-        helm_resources, helm_releases, helm_k8s = _discover_helm_charts(repo_root)
+        helm_resources, helm_releases, helm_k8s = helm_future.result()
         all_resources.extend(helm_resources)
         all_helm_releases.extend(helm_releases)
         all_k8s_resources.extend(helm_k8s)
-        all_files.extend(sorted({r.source_file for r in helm_resources}))
+        all_files.update(r.source_file for r in helm_resources)
         logger.info("Helm: found %d resources, %d releases, %d rendered K8s resources",
                      len(helm_resources), len(helm_releases), len(helm_k8s))
     except Exception as exc:
@@ -808,10 +1248,10 @@ def scan_iac(repo_root: Path) -> IaCDiscovery:
 
     # ── Kustomize ─────────────────────────────────────────────────────
     try:
-        kust_resources, kust_k8s = _discover_kustomize(repo_root)
+        kust_resources, kust_k8s = kust_future.result()
         all_resources.extend(kust_resources)
         all_k8s_resources.extend(kust_k8s)
-        all_files.extend(sorted({r.source_file for r in kust_resources}))
+        all_files.update(r.source_file for r in kust_resources)
         logger.info("Kustomize: found %d resources, %d rendered K8s resources",
                      len(kust_resources), len(kust_k8s))
     except Exception as exc:
@@ -820,19 +1260,22 @@ def scan_iac(repo_root: Path) -> IaCDiscovery:
 
     # ── Pulumi ────────────────────────────────────────────────────────
     try:
-        pulumi_resources = _discover_pulumi(repo_root)
+        pulumi_resources = pulumi_future.result()
         all_resources.extend(pulumi_resources)
-        all_files.extend(sorted({r.source_file for r in pulumi_resources}))
+        all_files.update(r.source_file for r in pulumi_resources)
         logger.info("Pulumi: found %d resources", len(pulumi_resources))
     except Exception as exc:
         errors.append(f"Pulumi scan error: {exc}")
         logger.warning("Pulumi scan failed: %s", exc)
 
+    if cache is not None:
+        cache.save()
+
     discovery = IaCDiscovery(
         resources=all_resources,
         helm_releases=all_helm_releases,
         k8s_resources_from_iac=all_k8s_resources,
-        files_scanned=sorted(set(all_files)),
+        files_scanned=sorted(all_files),
         errors=errors,
     )
 
@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Callable, Iterable
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, TypeVar
 
 from pydantic import BaseModel, Field
 
+_T = TypeVar("_T")
+
+
+def _count_by(items: Iterable[_T], key: Callable[[_T], str]) -> dict[str, int]:
+    """Tally *items* by ``key(item)``; shared by the ``summary()`` methods."""
+    return dict(Counter(map(key, items)))
+
 
 # ──────────────────────────── Kubernetes Resources ────────────────────────────
 
+_WORKLOAD_KINDS: frozenset[str] = frozenset(
+    {"Deployment", "StatefulSet", "DaemonSet", "Job", "CronJob"}
+)
+_MONITOR_KINDS: frozenset[str] = frozenset({"ServiceMonitor", "PodMonitor"})
+
 
 class K8sResourceKind(str, Enum):
     """Supported Kubernetes resource kinds."""
@@ -91,7 +107,7 @@ class K8sResource(BaseModel):
 
     @property
     def is_workload(self) -> bool:
-        return self.kind in {"Deployment", "StatefulSet", "DaemonSet", "Job", "CronJob"}
+        return self.kind in _WORKLOAD_KINDS
 
     @property
     def qualified_name(self) -> str:
@@ -176,15 +192,18 @@ class IaCDiscovery(BaseModel):
         return any(r.source == IaCSource.PULUMI for r in self.resources)
 
     def summary(self) -> dict[str, int]:
-        counts: dict[str, int] = {}
-        for r in self.resources:
-            counts[r.source.value] = counts.get(r.source.value, 0) + 1
-        return counts
+        return _count_by(self.resources, attrgetter("source.value"))
 
 
 # ────────────────────────── AWS Discovery ─────────────────────────────────────
 
 
+@lru_cache(maxsize=256)
+def _aws_service_name(resource_type: str) -> str:
+    """aws_rds_instance → rds, aws_lambda_function → lambda."""
+    return resource_type.removeprefix("aws_").split("_", 1)[0]
+
+
 class AwsDiscovery(BaseModel):
     """Aggregated AWS resource discovery results."""
 
@@ -195,20 +214,12 @@ class AwsDiscovery(BaseModel):
 
     def summary(self) -> dict[str, int]:
         """Count resources by type (e.g. aws_rds_instance=2, aws_sqs_queue=5)."""
-        counts: dict[str, int] = {}
-        for r in self.resources:
-            counts[r.resource_type] = counts.get(r.resource_type, 0) + 1
-        return counts
+        return _count_by(self.resources, attrgetter("resource_type"))
 
     @property
     def service_names(self) -> list[str]:
         """Unique AWS service names found."""
-        services: set[str] = set()
-        for r in self.resources:
-            # aws_rds_instance → rds, aws_lambda_function → lambda
-            parts = r.resource_type.removeprefix("aws_").split("_")
-            services.add(parts[0] if parts else r.resource_type)
-        return sorted(services)
+        return sorted({_aws_service_name(r.resource_type) for r in self.resources})
 
 
 # ────────────────────────── Platform Model ────────────────────────────────────
@@ -251,13 +262,10 @@ class Platform(BaseModel):
     @property
     def has_service_monitors(self) -> bool:
         """True if the repo contains ServiceMonitor or PodMonitor resources."""
-        return any(r.kind in ("ServiceMonitor", "PodMonitor") for r in self.resources)
+        return any(r.kind in _MONITOR_KINDS for r in self.resources)
 
     def summary(self) -> dict[str, int]:
-        counts: dict[str, int] = {}
-        for r in self.resources:
-            counts[r.kind] = counts.get(r.kind, 0) + 1
-        return counts
+        return _count_by(self.resources, attrgetter("kind"))
 
 
 # ────────────────────────── Observability Output ──────────────────────────────
@@ -390,6 +398,14 @@ class ValidationReport(BaseModel):
         description="Recommended Grafana dashboards the operator should import",
     )
 
+    def status_counts(self) -> Counter[str]:
+        """Tally checks by status in a single pass, e.g. ``counts["fail"]``.
+
+        Prefer this over reading ``passed``/``failed``/``warnings`` together,
+        which walks the checks once per property.
+        """
+        return Counter(c.status for c in self.checks)
+
     @property
     def passed(self) -> int:
         return sum(1 for c in self.checks if c.status == "pass")
@@ -8,16 +8,88 @@ rules evaluate correctly.
 from __future__ import annotations
 
 import logging
-from typing import Any
+import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 from urllib.parse import urljoin
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 # Timeout for Prometheus API calls.
 _TIMEOUT = httpx.Timeout(10.0, connect=5.0)
 
+# Keep-alive pool shared by every client talking to the same server.
+_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=120.0)
+
+# (base_url, ca_cert) → (client, reference count).  Clients for the same
+# Prometheus reuse one connection pool (and its TLS sessions); the underlying
+# httpx.Client is closed when the last PrometheusClient using it is closed.
+_SHARED_CLIENTS: dict[tuple[str, str], tuple[httpx.Client, int]] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def _acquire_client(base_url: str, ca_cert: str) -> httpx.Client:
+    """Return the shared client for *base_url*, creating it if needed."""
+    key = (base_url, ca_cert)
+    with _SHARED_LOCK:
+        client, refs = _SHARED_CLIENTS.get(key, (None, 0))
+        if client is None or client.is_closed:
+            verify: bool | str = ca_cert if ca_cert else True
+            # No custom transport: that would drop the proxies httpx reads from the env
+            client = httpx.Client(
+                base_url=base_url, timeout=_TIMEOUT, verify=verify, limits=_LIMITS
+            )
+            refs = 0
+        _SHARED_CLIENTS[key] = (client, refs + 1)
+        return client
+
+
+def _release_client(base_url: str, ca_cert: str) -> None:
+    """Drop one reference to a shared client, closing it on the last one."""
+    key = (base_url, ca_cert)
+    with _SHARED_LOCK:
+        entry = _SHARED_CLIENTS.get(key)
+        if entry is None:
+            return
+        client, refs = entry
+        if refs > 1:
+            _SHARED_CLIENTS[key] = (client, refs - 1)
+            return
+        del _SHARED_CLIENTS[key]
+    client.close()
+
+
+# Default lifetime of cached responses from read-only metadata endpoints, and
+# the longer one used for the full (large, slow-changing) metadata listing.
+_CACHE_TTL = 15.0
+_METADATA_ALL_TTL = 300.0
+_CACHE_MAXSIZE = 256
+
+_CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+# (expires_at, body, etag) — expired entries are kept so their ETag can be
+# sent back as If-None-Match and a 304 answered from the stored body.
+_CacheEntry = tuple[float, dict[str, Any], str | None]
+
+# Bare metric names can be checked together in one ``__name__=~`` query;
+# anything else (selectors, expressions) is checked on its own.
+_METRIC_NAME_RE = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+# Names per batched existence query, keeping the expression well under
+# Prometheus' URL / query length limits.
+_METRIC_BATCH_SIZE = 100
+
+# Default upper bound on requests a client has in flight at once, so a long
+# metric list (or several tools sharing one client) does not flood the server.
+_MAX_CONCURRENT_QUERIES = 10
+
 
 class PrometheusClient:
     """Lightweight Prometheus HTTP API v1 client.
@@ -26,19 +98,44 @@ class PrometheusClient:
     ----------
     base_url : str
         Base URL of the Prometheus server (e.g. ``http://localhost:9090``).
+    cache_ttl : float
+        Seconds to reuse responses from read-only metadata endpoints
+        (targets, rules, metric metadata).  ``0`` disables.
+    max_concurrency : int
+        Most requests this client sends at once; further callers wait.
     """
 
-    def __init__(self, base_url: str, *, ca_cert: str = "") -> None:
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        ca_cert: str = "",
+        cache_ttl: float = _CACHE_TTL,
+        max_concurrency: int = _MAX_CONCURRENT_QUERIES,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
-        verify: bool | str = ca_cert if ca_cert else True
-        self._client = httpx.Client(
-            base_url=self.base_url,
-            timeout=_TIMEOUT,
-            verify=verify,
-        )
+        self._ca_cert = ca_cert
+        self._closed = False
+        self._client = _acquire_client(self.base_url, ca_cert)
+        self._cache_ttl = cache_ttl
+        self._cache: dict[_CacheKey, _CacheEntry] = {}
+        self._cache_lock = threading.Lock()
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+        self._request_seconds = 0.0
+
+    def clear_cache(self) -> None:
+        """Forget cached responses, e.g. after the cluster has been changed."""
+        with self._cache_lock:
+            self._cache.clear()
 
     def close(self) -> None:
-        self._client.close()
+        """Release this client's hold on the shared connection pool."""
+        if not self._closed:
+            self._closed = True
+            _release_client(self.base_url, self._ca_cert)
 
     def __enter__(self) -> "PrometheusClient":
         return self
@@ -46,18 +143,100 @@ class PrometheusClient:
     def __exit__(self, *args: Any) -> None:
         self.close()
 
+    def request_stats(self) -> dict[str, Any]:
+        """Return request counters for this client.
+
+        ``requests`` counts round trips sent and ``errors`` those that failed
+        at the transport level (timeouts, refused connections);
+        ``request_seconds`` is their total wall time, and ``in_flight`` /
+        ``peak_in_flight`` show how close the client came to
+        ``max_concurrency``.
+        """
+        with self._stats_lock:
+            return {
+                **self._stats,
+                "request_seconds": round(self._request_seconds, 3),
+                "max_concurrency": self.max_concurrency,
+            }
+
     # ── Raw helpers ───────────────────────────────────────────────────────
 
+    def _send(
+        self,
+        path: str,
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Issue one GET, holding a concurrency slot and recording its timing."""
+        if not self._slots.acquire(blocking=False):
+            logger.debug(
+                "Prometheus client at %d concurrent requests; waiting for a slot",
+                self.max_concurrency,
+            )
+            self._slots.acquire()
+        with self._stats_lock:
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(
+                self._stats["peak_in_flight"], self._stats["in_flight"]
+            )
+        start = time.perf_counter()
+        try:
+            return self._client.get(path, params=params, headers=headers)
+        except httpx.HTTPError:
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self._stats["in_flight"] -= 1
+                self._stats["requests"] += 1
+                self._request_seconds += elapsed
+            self._slots.release()
+
     def _get(self, path: str, params: dict[str, str] | None = None) -> dict[str, Any]:
         """Execute a GET request against the Prometheus API.
 
         Returns the parsed JSON response body.
         Raises ``httpx.HTTPStatusError`` on non-2xx responses.
         """
-        resp = self._client.get(path, params=params)
+        resp = self._send(path, params)
         resp.raise_for_status()
         return resp.json()
 
+    def _get_cached(
+        self, path: str, params: dict[str, str] | None = None, ttl: float | None = None,
+    ) -> dict[str, Any]:
+        """Like :meth:`_get`, but reuse a response younger than *ttl* seconds.
+
+        *ttl* defaults to the client's ``cache_ttl``; errors are never cached.
+        Once an entry expires it is revalidated with ``If-None-Match`` when
+        the server (or a proxy in front of it) sent an ``ETag``, so an
+        unchanged body is neither transferred nor decoded again.
+        """
+        if self._cache_ttl <= 0:
+            return self._get(path, params)
+        ttl = self._cache_ttl if ttl is None else ttl
+        key = (path, tuple(sorted((params or {}).items())))
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        etag = hit[2] if hit is not None else None
+        headers = {"If-None-Match": etag} if etag else None
+        resp = self._send(path, params, headers)
+        if headers is not None and resp.status_code == 304:
+            data = hit[1]
+        else:
+            resp.raise_for_status()
+            data, etag = resp.json(), resp.headers.get("etag")
+        with self._cache_lock:
+            if key not in self._cache and len(self._cache) >= _CACHE_MAXSIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (now + ttl, data, etag)
+        return data
+
     # ── Targets ───────────────────────────────────────────────────────────
 
     def get_targets(self) -> dict[str, Any]:
@@ -65,7 +244,7 @@ class PrometheusClient:
 
         Returns the full ``/api/v1/targets`` response.
         """
-        return self._get("/api/v1/targets")
+        return self._get_cached("/api/v1/targets")
 
     def get_active_targets_summary(self) -> list[dict[str, Any]]:
         """Return a simplified view of active scrape targets.
@@ -122,7 +301,8 @@ class PrometheusClient:
         params = {}
         if metric_name:
             params["metric"] = metric_name
-        return self._get("/api/v1/targets/metadata", params=params)
+            return self._get_cached("/api/v1/targets/metadata", params)
+        return self._get_cached("/api/v1/targets/metadata", params, ttl=_METADATA_ALL_TTL)
 
     # ── Rules ─────────────────────────────────────────────────────────────
 
@@ -134,7 +314,7 @@ class PrometheusClient:
         params = {}
         if rule_type:
             params["type"] = rule_type
-        return self._get("/api/v1/rules", params=params)
+        return self._get_cached("/api/v1/rules", params)
 
     def get_alerts(self) -> dict[str, Any]:
         """Return currently firing / pending alerts."""
@@ -145,16 +325,53 @@ class PrometheusClient:
     def check_metric_batch(self, metric_names: list[str]) -> dict[str, bool]:
         """Check existence of multiple metrics at once.
 
+        Bare metric names are checked ``_METRIC_BATCH_SIZE`` at a time with a
+        single ``count by (__name__)`` query; if a batch query fails, its names
+        fall back to one :meth:`metric_exists` call each.
+
         Returns a dict mapping metric_name → exists (True/False).
         """
-        results: dict[str, bool] = {}
-        for name in metric_names:
+        names = [n for n in metric_names if _METRIC_NAME_RE.fullmatch(n)]
+        fallback = [n for n in metric_names if not _METRIC_NAME_RE.fullmatch(n)]
+        chunks = [
+            names[start:start + _METRIC_BATCH_SIZE]
+            for start in range(0, len(names), _METRIC_BATCH_SIZE)
+        ]
+
+        def batch_exists(chunk: list[str]) -> set[str] | None:
+            try:
+                series = self.query_value(
+                    f'count by (__name__) ({{__name__=~"{"|".join(chunk)}"}})'
+                )
+            except Exception:
+                return None
+            return {r.get("metric", {}).get("__name__", "") for r in series}
+
+        present: set[str] = set()
+        for chunk, found in zip(chunks, self._map_queries(batch_exists, chunks)):
+            if found is None:
+                fallback.extend(chunk)
+            else:
+                present |= found
+
+        def exists(name: str) -> bool:
             try:
-                results[name] = self.metric_exists(name)
+                return self.metric_exists(name)
             except Exception:
-                results[name] = False
+                return False
+
+        results = {name: name in present for name in metric_names}
+        results.update(zip(fallback, self._map_queries(exists, fallback)))
         return results
 
+    def _map_queries(self, fn: Callable[[_T], _R], items: list[_T]) -> list[_R]:
+        """Run independent queries concurrently over the shared connection pool."""
+        if len(items) < 2:
+            return [fn(item) for item in items]
+        workers = min(len(items), self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, items))
+
     def validate_promql(self, expr: str) -> dict[str, Any]:
         """Try to evaluate a PromQL expression and report success/failure.
 
@@ -179,21 +396,22 @@ class PrometheusClient:
         """
         targets = self.get_active_targets_summary()
         jobs: dict[str, dict[str, int]] = {}
+        total_up = total_down = 0
         for t in targets:
-            job = t["job"]
-            if job not in jobs:
-                jobs[job] = {"up": 0, "down": 0, "unknown": 0, "total": 0}
-            jobs[job]["total"] += 1
-            if t["health"] == "up":
-                jobs[job]["up"] += 1
-            elif t["health"] == "down":
-                jobs[job]["down"] += 1
+            counts = jobs.get(t["job"])
+            if counts is None:
+                counts = jobs[t["job"]] = {"up": 0, "down": 0, "unknown": 0, "total": 0}
+            counts["total"] += 1
+            health = t["health"]
+            if health == "up":
+                counts["up"] += 1
+                total_up += 1
+            elif health == "down":
+                counts["down"] += 1
+                total_down += 1
             else:
-                jobs[job]["unknown"] += 1
-
-        total_up = sum(j["up"] for j in jobs.values())
-        total_down = sum(j["down"] for j in jobs.values())
-        total = sum(j["total"] for j in jobs.values())
+                counts["unknown"] += 1
+        total = len(targets)
 
         return {
             "total_targets": total,
@@ -203,7 +421,7 @@ class PrometheusClient:
         }
 
     def is_reachable(self) -> bool:
-        """Check if Prometheus is reachable."""
+        """Check if Prometheus is reachable.  Never answered from the cache."""
         try:
             self._get("/api/v1/status/buildinfo")
             return True
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from importlib.resources import files as importlib_files
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import orjson
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 from k8s_observability_agent.models import ObservabilityPlan, ValidationReport
 
@@ -19,24 +21,39 @@ logger = logging.getLogger(__name__)
 # both editable installs and built wheels / sdists.
 _TEMPLATES_REF = importlib_files("k8s_observability_agent") / "templates"
 
+# Characters dropped from dashboard titles when building file names.
+_SLUG_RE = re.compile(r"[^\w\s-]")
 
+# Output files are small; a handful of threads is enough to overlap the writes.
+_MAX_WRITE_WORKERS = 8
+
+
+@lru_cache(maxsize=1)
 def _get_jinja_env() -> Environment:
     # importlib.resources may return a Traversable that isn't on the real
     # filesystem (e.g. inside a zip).  Use as_posix() on the resolved path.
     templates_dir = str(_TEMPLATES_REF)
+    # Templates ship with the package and don't change while we run, so
+    # skip the per-lookup mtime check.
     return Environment(
         loader=FileSystemLoader(templates_dir),
         autoescape=select_autoescape(default=False),
         trim_blocks=True,
         lstrip_blocks=True,
         keep_trailing_newline=True,
+        auto_reload=False,
     )
 
 
+@lru_cache(maxsize=16)
+def _get_template(name: str) -> Template:
+    """Return the compiled template *name*, parsed once per process."""
+    return _get_jinja_env().get_template(name)
+
+
 def render_prometheus_rules(plan: ObservabilityPlan) -> str:
     """Render Prometheus alerting rules YAML from the plan."""
-    env = _get_jinja_env()
-    template = env.get_template("prometheus_rules.yml.j2")
+    template = _get_template("prometheus_rules.yml.j2")
     return template.render(plan=plan)
 
 
@@ -45,18 +62,16 @@ def render_grafana_dashboards(plan: ObservabilityPlan) -> list[tuple[str, str]]:
 
     Returns a list of (filename, json_content) tuples.
     """
-    env = _get_jinja_env()
-    template = env.get_template("grafana_dashboard.json.j2")
+    template = _get_template("grafana_dashboard.json.j2")
     results: list[tuple[str, str]] = []
     for dashboard in plan.dashboards:
         raw = template.render(dashboard=dashboard)
         # Validate / pretty-print the JSON
         try:
-            parsed = json.loads(raw)
-            content = json.dumps(parsed, indent=2)
-        except json.JSONDecodeError:
+            content = orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode()
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
             content = raw
-        slug = re.sub(r"[^\w\s-]", "", dashboard.title.lower()).strip().replace(" ", "-")[:40]
+        slug = _SLUG_RE.sub("", dashboard.title.lower()).strip().replace(" ", "-")[:40]
         filename = f"grafana-{slug}.json"
         results.append((filename, content))
     return results
@@ -64,8 +79,7 @@ def render_grafana_dashboards(plan: ObservabilityPlan) -> list[tuple[str, str]]:
 
 def render_plan_summary(plan: ObservabilityPlan) -> str:
     """Render a Markdown summary of the plan."""
-    env = _get_jinja_env()
-    template = env.get_template("plan_summary.md.j2")
+    template = _get_template("plan_summary.md.j2")
     return template.render(plan=plan)
 
 
@@ -74,8 +88,7 @@ def render_validation_report_html(
     plan: ObservabilityPlan | None = None,
 ) -> str:
     """Render the validation report as a self-contained HTML page."""
-    env = _get_jinja_env()
-    template = env.get_template("validation_report.html.j2")
+    template = _get_template("validation_report.html.j2")
     return template.render(
         report=report,
         plan=plan,
@@ -83,29 +96,35 @@ def render_validation_report_html(
     )
 
 
+def _write_file(item: tuple[Path, str]) -> None:
+    path, content = item
+    path.write_text(content, encoding="utf-8")
+
+
 def write_outputs(plan: ObservabilityPlan, output_dir: Path) -> list[str]:
     """Write all rendered outputs to *output_dir* and return the list of written file paths."""
     output_dir.mkdir(parents=True, exist_ok=True)
-    written: list[str] = []
 
-    # Prometheus rules
+    # Render everything first, then hand the blocking writes to a thread pool.
+    outputs: list[tuple[Path, str]] = []
     if plan.alerts:
-        prom_path = output_dir / "prometheus-rules.yml"
-        prom_path.write_text(render_prometheus_rules(plan), encoding="utf-8")
-        written.append(str(prom_path))
-        logger.info("Wrote %s", prom_path)
-
-    # Grafana dashboards
-    for filename, content in render_grafana_dashboards(plan):
-        dash_path = output_dir / filename
-        dash_path.write_text(content, encoding="utf-8")
-        written.append(str(dash_path))
-        logger.info("Wrote %s", dash_path)
-
-    # Summary
-    summary_path = output_dir / "observability-plan.md"
-    summary_path.write_text(render_plan_summary(plan), encoding="utf-8")
-    written.append(str(summary_path))
-    logger.info("Wrote %s", summary_path)
+        outputs.append((output_dir / "prometheus-rules.yml", render_prometheus_rules(plan)))
+    outputs.extend(
+        (output_dir / filename, content) for filename, content in render_grafana_dashboards(plan)
+    )
+    outputs.append((output_dir / "observability-plan.md", render_plan_summary(plan)))
 
+    # Dashboards whose titles slug to the same name keep last-one-wins.
+    pending = dict(outputs)
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(pending), _MAX_WRITE_WORKERS)) as pool:
+            list(pool.map(_write_file, pending.items()))
+    else:
+        for item in pending.items():
+            _write_file(item)
+
+    written: list[str] = []
+    for path, _ in outputs:
+        written.append(str(path))
+        logger.info("Wrote %s", path)
     return written
@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import logging
+import os
+import re
 import tempfile
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Generator
+from typing import TYPE_CHECKING, Any, Generator
 
-import pathspec
-import yaml
-from git import Repo as GitRepo
+import orjson
 
 from k8s_observability_agent.classifier import (
     BUILTIN_METRICS_PROFILES,
@@ -19,19 +24,28 @@ from k8s_observability_agent.classifier import (
     get_profile,
 )
 from k8s_observability_agent.config import Settings
-from k8s_observability_agent.iac import scan_iac
 from k8s_observability_agent.models import ContainerSpec, IaCDiscovery, K8sResource
+from k8s_observability_agent.yaml_loader import load_yaml_all
+
+if TYPE_CHECKING:
+    import pathspec
 
 logger = logging.getLogger(__name__)
 
 # Kinds we know how to enrich with extra fields.
-WORKLOAD_KINDS = {"Deployment", "StatefulSet", "DaemonSet", "Job", "CronJob"}
+WORKLOAD_KINDS = frozenset({"Deployment", "StatefulSet", "DaemonSet", "Job", "CronJob"})
 K8S_TOP_LEVEL_KEYS = {"apiVersion", "kind", "metadata"}
 
 # Maximum file size we'll attempt to parse (1 MB). Prevents memory blowup on
 # large vendored files, Helm chart archives, terraform state, etc.
 MAX_FILE_SIZE_BYTES = 1_048_576  # 1 MB
 
+# Manifest parsing (YAML + image classification) is CPU-bound, so larger repos
+# fan it out to worker processes; below this many files pool start-up costs
+# more than it saves.
+_PARALLEL_PARSE_MIN_FILES = 16
+_MAX_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
 
 @contextmanager
 def clone_repo(url: str, branch: str = "main") -> Generator[Path, None, None]:
@@ -40,6 +54,9 @@ def clone_repo(url: str, branch: str = "main") -> Generator[Path, None, None]:
     Yields the clone path, then cleans up the temp directory on exit.
     Uses ``--depth=1 --single-branch`` for speed and disk safety.
     """
+    # GitPython is slow to import and only needed for remote repos.
+    from git import Repo as GitRepo
+
     with tempfile.TemporaryDirectory(prefix="k8s-obs-") as tmp:
         tmp_path = Path(tmp)
         logger.info("Cloning %s (branch=%s) → %s", url, branch, tmp_path)
@@ -53,9 +70,57 @@ def clone_repo(url: str, branch: str = "main") -> Generator[Path, None, None]:
 
 
 def _build_pathspec(patterns: list[str]) -> pathspec.PathSpec:
+    import pathspec
+
     return pathspec.PathSpec.from_lines("gitwildmatch", patterns)
 
 
+# pathspec tags directory matches with this named group; it must become
+# anonymous before several pattern regexes can share one alternation.
+_PS_DIR_GROUP_RE = re.compile(r"\(\?P<ps_d>")
+
+
+def _build_matcher(patterns: list[str]) -> Callable[[str], bool]:
+    """Compile gitwildmatch *patterns* into one predicate on relative paths.
+
+    Without negations a path matches if any pattern does, so every pattern
+    folds into a single regex alternation; with ``!`` patterns the order
+    matters and pathspec's own last-match-wins evaluation is used.
+    """
+    spec = _build_pathspec(patterns)
+    active = [p for p in spec.patterns if p.include is not None]
+    if not all(p.include for p in active):
+        return spec.match_file
+    if not active:
+        return lambda _path: False
+    union = re.compile("|".join(
+        f"(?:{_PS_DIR_GROUP_RE.sub('(?:', p.regex.pattern)})" for p in active
+    ))
+    return lambda path: union.match(path) is not None
+
+
+# ``**/<name>/**`` excludes every path below any directory called <name>, so
+# the walk can skip such directories outright instead of matching each file.
+_PRUNABLE_DIR_RE = re.compile(r"\*\*/([^/*?\[\]\\!#]+)/\*\*")
+
+
+def _prunable_dirs(patterns: list[str]) -> frozenset[str]:
+    """Return directory names that *patterns* exclude wholesale.
+
+    Empty when any pattern is a ``!`` negation, since that could re-include
+    a file below an otherwise excluded directory.
+    """
+    names: set[str] = set()
+    for raw in patterns:
+        pattern = raw.strip()
+        if pattern.startswith("!"):
+            return frozenset()
+        match = _PRUNABLE_DIR_RE.fullmatch(pattern)
+        if match:
+            names.add(match.group(1))
+    return frozenset(names)
+
+
 def discover_manifest_files(
     repo_root: Path,
     include: list[str] | None = None,
@@ -65,26 +130,65 @@ def discover_manifest_files(
     include = include or ["**/*.yaml", "**/*.yml", "**/*.json"]
     exclude = exclude or []
 
-    inc_spec = _build_pathspec(include)
-    exc_spec = _build_pathspec(exclude) if exclude else None
+    included = _build_matcher(include)
+    excluded = _build_matcher(exclude) if exclude else None
+    pruned = _prunable_dirs(exclude)
 
     candidates: list[Path] = []
-    for p in repo_root.rglob("*"):
-        if not p.is_file():
-            continue
-        # Skip files over the size limit — they're almost certainly not K8s manifests.
+    stack = [(str(repo_root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
         try:
-            if p.stat().st_size > MAX_FILE_SIZE_BYTES:
-                logger.debug("Skipping oversized file (%d bytes): %s", p.stat().st_size, p)
-                continue
+            entries = list(os.scandir(dir_path))
         except OSError:
             continue
-        rel = str(p.relative_to(repo_root))
-        if inc_spec.match_file(rel) and (exc_spec is None or not exc_spec.match_file(rel)):
-            candidates.append(p)
+        for entry in entries:
+            rel = f"{rel_dir}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in pruned:
+                    stack.append((entry.path, f"{rel}/"))
+                continue
+            if not included(rel) or (excluded is not None and excluded(rel)):
+                continue
+            # Skip files over the size limit — they're almost certainly not K8s manifests.
+            try:
+                if not entry.is_file():
+                    continue
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            if size > MAX_FILE_SIZE_BYTES:
+                logger.debug("Skipping oversized file (%d bytes): %s", size, entry.path)
+                continue
+            candidates.append(Path(entry.path))
     return sorted(candidates)
 
 
+# Every exporter pattern folded into one alternation: most images are plain
+# application images, and one search rules them out instead of one per exporter.
+_EXPORTER_PREFILTER = re.compile(
+    "|".join(f"(?:{p.pattern})" for p in EXPORTER_IMAGE_PATTERNS.values()),
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=4096)
+def _image_exporters(image: str) -> frozenset[str]:
+    """Return the exporters whose image pattern matches *image*.
+
+    The same sidecar images recur across workloads, so results are cached.
+    """
+    if not _EXPORTER_PREFILTER.search(image):
+        return frozenset()
+    return frozenset(
+        name for name, pattern in EXPORTER_IMAGE_PATTERNS.items() if pattern.search(image)
+    )
+
+
+# Keys _looks_like_k8s requires, as they appear in the raw file.
+_MANIFEST_KEYS = (b"apiVersion", b"kind", b"metadata")
+
+
 def _looks_like_k8s(doc: dict) -> bool:
     """Heuristic: does this YAML/JSON document look like a K8s manifest?"""
     if not isinstance(doc, dict):
@@ -169,11 +273,10 @@ def _detect_telemetry(
 
     # 1. Exporter sidecar detection — match container images against known
     #    exporter patterns.
-    for exporter_name, pattern in EXPORTER_IMAGE_PATTERNS.items():
-        for img in all_images:
-            if pattern.search(img):
-                caps.append(f"exporter:{exporter_name}")
-                break  # one match per exporter is enough
+    found = frozenset().union(*map(_image_exporters, all_images))
+    if found:
+        # Keep the table order — one capability per exporter.
+        caps.extend(f"exporter:{name}" for name in EXPORTER_IMAGE_PATTERNS if name in found)
 
     # 2. Built-in metrics — profiles like Envoy, Prometheus, Grafana expose
     #    /metrics from the main container.  If ANY container was classified
@@ -228,22 +331,22 @@ def _parse_resource(doc: dict, source_file: str) -> K8sResource:
     if res.kind in WORKLOAD_KINDS:
         res.replicas = spec.get("replicas")
         # Pod template may be nested under spec.template.spec or spec.jobTemplate.template.spec
-        pod_spec = spec.get("template", {}).get("spec", {})
+        template = spec.get("template") or {}
+        template_meta = template.get("metadata") or {}
+        pod_spec = template.get("spec") or {}
         if not pod_spec and res.kind == "CronJob":
-            pod_spec = (
-                spec.get("jobTemplate", {}).get("spec", {}).get("template", {}).get("spec", {})
-            )
-        pod_labels = spec.get("template", {}).get("metadata", {}).get("labels", {})
-        res.containers = [
-            _parse_container(c, labels=pod_labels) for c in pod_spec.get("containers", [])
-        ]
+            job_spec = (spec.get("jobTemplate") or {}).get("spec") or {}
+            pod_spec = (job_spec.get("template") or {}).get("spec") or {}
+        pod_labels = template_meta.get("labels", {})
+        containers = pod_spec.get("containers", [])
+        res.containers = [_parse_container(c, labels=pod_labels) for c in containers]
         match_labels = spec.get("selector", {}).get("matchLabels", {})
         res.selector = match_labels
 
         # ── Capability inference ──────────────────────────────────────
         # Detect what telemetry this workload can actually produce.
-        pod_annotations = spec.get("template", {}).get("metadata", {}).get("annotations", {})
-        raw_containers = pod_spec.get("containers", []) + pod_spec.get("initContainers", [])
+        pod_annotations = template_meta.get("annotations", {})
+        raw_containers = containers + pod_spec.get("initContainers", [])
         res.telemetry = _detect_telemetry(res.containers, raw_containers, pod_annotations)
 
     # Enrich services
@@ -264,9 +367,23 @@ def parse_manifest_file(path: Path, repo_root: Path | None = None) -> list[K8sRe
     rel = str(path.relative_to(repo_root)) if repo_root else str(path)
     resources: list[K8sResource] = []
     try:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        # Handle multi-document YAML
-        docs = list(yaml.safe_load_all(text))
+        data = path.read_bytes()
+        # Every manifest carries these keys; values files, CI configs and the
+        # like usually don't, and a substring scan is far cheaper than a parse.
+        if not all(key in data for key in _MANIFEST_KEYS):
+            return resources
+        docs: Iterable[Any]
+        if path.suffix == ".json":
+            try:
+                docs = (orjson.loads(data),)
+            except orjson.JSONDecodeError:
+                # Not strict JSON — YAML is a superset, so let it try.
+                docs = load_yaml_all(data)
+        else:
+            # Handle multi-document YAML; LibYAML decodes the raw bytes itself.
+            # Documents are consumed as they are parsed, so ones that aren't
+            # manifests are dropped before the next is built.
+            docs = load_yaml_all(data)
         for doc in docs:
             if doc is None:
                 continue
@@ -282,6 +399,18 @@ def parse_manifest_file(path: Path, repo_root: Path | None = None) -> list[K8sRe
     return resources
 
 
+def _parse_manifests(paths: list[Path], repo_root: Path) -> list[list[K8sResource]]:
+    """Run :func:`parse_manifest_file` over *paths*, preserving order."""
+    if len(paths) < _PARALLEL_PARSE_MIN_FILES or _MAX_PARSE_WORKERS < 2:
+        return [parse_manifest_file(p, repo_root) for p in paths]
+    try:
+        with ProcessPoolExecutor(max_workers=_MAX_PARSE_WORKERS) as pool:
+            return list(pool.map(parse_manifest_file, paths, repeat(repo_root), chunksize=16))
+    except (OSError, BrokenProcessPool) as exc:
+        logger.warning("Parallel manifest parsing unavailable (%s); parsing serially", exc)
+        return [parse_manifest_file(p, repo_root) for p in paths]
+
+
 def scan_repository(settings: Settings) -> tuple[list[K8sResource], list[str], list[str], IaCDiscovery | None]:
     """Scan a repository and return (resources, manifest_files, errors, iac_discovery).
 
@@ -303,6 +432,8 @@ def _scan_directory(
     settings: Settings,
 ) -> tuple[list[K8sResource], list[str], list[str], IaCDiscovery | None]:
     """Internal: scan a directory after it's been resolved/cloned."""
+    from k8s_observability_agent.iac import scan_iac
+
     if not repo_root.is_dir():
         raise FileNotFoundError(f"Repository path does not exist: {repo_root}")
 
@@ -316,20 +447,19 @@ def _scan_directory(
     errors: list[str] = []
     file_paths: list[str] = []
 
-    for mf in manifest_files:
-        rel = str(mf.relative_to(repo_root))
-        try:
-            parsed = parse_manifest_file(mf, repo_root)
-            if parsed:
-                file_paths.append(rel)
-                all_resources.extend(parsed)
-        except Exception as exc:
-            errors.append(f"{rel}: {exc}")
+    # parse_manifest_file logs and skips unparseable files itself.
+    for mf, parsed in zip(manifest_files, _parse_manifests(manifest_files, repo_root)):
+        if parsed:
+            file_paths.append(str(mf.relative_to(repo_root)))
+            all_resources.extend(parsed)
 
     # ── IaC scanning ──────────────────────────────────────────────────
     iac_discovery: IaCDiscovery | None = None
     try:
-        iac_discovery = scan_iac(repo_root)
+        iac_discovery = scan_iac(
+            repo_root,
+            cache_path=Path(settings.iac_cache_path) if settings.iac_cache_path else None,
+        )
         # Merge rendered K8s resources from IaC into the main resource list
         if iac_discovery.k8s_resources_from_iac:
             all_resources.extend(iac_discovery.k8s_resources_from_iac)
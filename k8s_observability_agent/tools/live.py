@@ -6,10 +6,15 @@ query Prometheus, import Grafana dashboards, and diagnose/fix issues.
 
 from __future__ import annotations
 
-import json
 import logging
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Any
 
+import orjson
+
 from k8s_observability_agent.cluster import ClusterClient
 from k8s_observability_agent.grafana import GrafanaClient
 from k8s_observability_agent.prometheus import PrometheusClient
@@ -334,6 +339,95 @@ LIVE_TOOL_DEFINITIONS: list[dict[str, Any]] = [
 ]
 
 
+# JSON-Schema ``type`` → accepted Python types for tool input values.
+_JSON_TYPES: Mapping[str, tuple[type, ...]] = MappingProxyType({
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+})
+
+_InputValidator = Callable[[dict[str, Any]], "str | None"]
+
+
+def _compile_input_validator(schema: dict[str, Any]) -> _InputValidator:
+    """Build a checker for a tool's required keys and top-level property types.
+
+    The schema is walked once here; the returned function only runs the
+    resulting key and ``isinstance`` checks.  It returns an error message, or
+    None when the input is acceptable.  Nested item schemas are left to the
+    handlers (and, for the final report, to the report parser).
+    """
+    required = tuple(schema.get("required", ()))
+    typed = tuple(
+        (name, prop["type"], _JSON_TYPES[prop["type"]])
+        for name, prop in schema.get("properties", {}).items()
+        if prop.get("type") in _JSON_TYPES
+    )
+
+    def validate(inp: dict[str, Any]) -> str | None:
+        for name in required:
+            if name not in inp:
+                return f"missing required input '{name}'"
+        for name, type_name, types in typed:
+            if name not in inp:
+                continue
+            value = inp[name]
+            # bool is an int subclass, but JSON keeps the two apart.
+            if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                return f"input '{name}' must be of type {type_name}"
+        return None
+
+    return validate
+
+
+# tool name → compiled input validator, built once at import.  The final
+# report is echoed back and parsed leniently by the agent core (missing
+# sections default to empty), so it is not checked here.
+_INPUT_VALIDATORS: Mapping[str, _InputValidator] = MappingProxyType({
+    t["name"]: _compile_input_validator(t["input_schema"])
+    for t in LIVE_TOOL_DEFINITIONS
+    if t["name"] != "generate_validation_report"
+})
+
+
+# Read-only Prometheus tools whose results are reused for a few seconds: the
+# agent tends to repeat them while working through its checks, and the
+# answers don't change that quickly.  run_promql_query is left out, since an
+# arbitrary expression (rate(), time()) can differ on every evaluation.
+_CACHED_TOOLS = frozenset({
+    "check_scrape_targets",
+    "validate_metric_exists",
+    "get_prometheus_alerts",
+    "get_prometheus_rules",
+})
+_TOOL_CACHE_TTL = 5.0
+_TOOL_CACHE_MAXSIZE = 128
+
+
+# ──────────────────────────── Output formatting ────────────────────────────
+
+
+def _status_fragment(status: dict[str, Any]) -> str:
+    """Render the phase / readiness part of a resource listing row."""
+    phase = status.get("phase", "")
+    ready = status.get("readyReplicas", "")
+    replicas = status.get("replicas", "")
+    fragment = f"  phase={phase}" if phase else ""
+    if ready not in (None, "") and replicas not in (None, ""):
+        fragment += f"  ready={ready}/{replicas}"
+    return fragment
+
+
+def _format_resource_row(item: dict[str, Any]) -> str:
+    """Render one ``kubectl get -o json`` item as ``namespace/name [status]``."""
+    meta = item.get("metadata") or {}
+    status = _status_fragment(item["status"] or {}) if "status" in item else ""
+    return f"  {meta.get('namespace', '')}/{meta.get('name', '')}{status}"
+
+
 # ──────────────────────────── Tool Implementations ─────────────────────────
 
 
@@ -361,19 +455,53 @@ class LiveToolExecutor:
         self.prometheus = prometheus
         self.grafana = grafana
         self._ca_cert = ca_cert
+        # (tool name, canonical input JSON) → (expires_at, result)
+        self._tool_cache: dict[tuple[str, bytes], tuple[float, str]] = {}
+        # tool name → bound handler, resolved once instead of per call.
+        self._dispatch: dict[str, Callable[[dict[str, Any]], str]] = {
+            name[len("_tool_"):]: getattr(self, name)
+            for name in dir(type(self))
+            if name.startswith("_tool_")
+        }
 
     # ── Dispatcher ────────────────────────────────────────────────────
 
     def execute(self, tool_name: str, tool_input: dict[str, Any]) -> str:
         """Dispatch a tool call and return the string result."""
-        handler = getattr(self, f"_tool_{tool_name}", None)
+        handler = self._dispatch.get(tool_name)
         if handler is None:
             return f"Unknown live tool: {tool_name}"
+        validate = _INPUT_VALIDATORS.get(tool_name)
+        error = validate(tool_input) if validate is not None else None
+        if error is not None:
+            return f"Tool '{tool_name}' error: {error}"
+        key: tuple[str, bytes] | None = None
+        if tool_name in _CACHED_TOOLS:
+            key = (tool_name, orjson.dumps(tool_input, option=orjson.OPT_SORT_KEYS))
+            hit = self._tool_cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
         try:
-            return handler(tool_input)
+            result = handler(tool_input)
         except Exception as exc:
+            # Failures are reported but never cached.
             logger.exception("Tool %s failed", tool_name)
             return f"Tool '{tool_name}' error: {exc}"
+        if key is not None:
+            if len(self._tool_cache) >= _TOOL_CACHE_MAXSIZE:
+                self._tool_cache.pop(next(iter(self._tool_cache)))
+            self._tool_cache[key] = (time.monotonic() + _TOOL_CACHE_TTL, result)
+        return result
+
+    def clear_caches(self) -> None:
+        """Drop cached tool results and Prometheus responses.
+
+        Called after the cluster is changed, so the next check sees the new
+        targets and series instead of a pre-change answer.
+        """
+        self._tool_cache.clear()
+        if self.prometheus is not None:
+            self.prometheus.clear_cache()
 
     # ── Cluster connectivity ──────────────────────────────────────────
 
@@ -389,9 +517,30 @@ class LiveToolExecutor:
         )
 
     def _tool_find_monitoring_stack(self, inp: dict[str, Any]) -> str:
+        # The two lookups are independent kubectl + HTTP round trips.  Each is
+        # collected on its own, so one failing still reports the other.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            prom_future = pool.submit(self._probe_prometheus)
+            graf_future = pool.submit(self._probe_grafana)
         lines: list[str] = []
+        try:
+            prom_lines, self.prometheus = prom_future.result()
+            lines.extend(prom_lines)
+        except Exception as exc:
+            logger.exception("Prometheus lookup failed")
+            lines.append(f"Prometheus lookup FAILED: {exc}")
+        try:
+            graf_lines, self.grafana = graf_future.result()
+            lines.extend(graf_lines)
+        except Exception as exc:
+            logger.exception("Grafana lookup failed")
+            lines.append(f"\nGrafana lookup FAILED: {exc}")
+        return "\n".join(lines)
 
-        # Prometheus
+    def _probe_prometheus(self) -> tuple[list[str], PrometheusClient | None]:
+        """Locate Prometheus and check it; returns report lines and the client to use."""
+        lines: list[str] = []
+        prom = self.prometheus
         prom_info = self.cluster.find_prometheus()
         if prom_info.get("found"):
             lines.append(
@@ -400,9 +549,17 @@ class LiveToolExecutor:
             )
             lines.append(f"  In-cluster URL: {prom_info['url']}")
             # If we don't have a Prometheus client yet, create one
-            if self.prometheus is None:
-                self.prometheus = PrometheusClient(prom_info["url"], ca_cert=self._ca_cert)
-            if self.prometheus.is_reachable():
+            created = prom is None
+            if prom is None:
+                prom = PrometheusClient(prom_info["url"], ca_cert=self._ca_cert)
+            try:
+                reachable = prom.is_reachable()
+            except Exception:
+                # Not handed back to the executor, so nothing else would close it
+                if created:
+                    prom.close()
+                raise
+            if reachable:
                 lines.append("  Status: REACHABLE")
             else:
                 lines.append(
@@ -412,8 +569,12 @@ class LiveToolExecutor:
                 )
         else:
             lines.append(f"Prometheus NOT FOUND: {prom_info.get('reason', 'unknown')}")
+        return lines, prom
 
-        # Grafana
+    def _probe_grafana(self) -> tuple[list[str], GrafanaClient | None]:
+        """Locate Grafana and check it; returns report lines and the client to use."""
+        lines: list[str] = []
+        graf = self.grafana
         graf_info = self.cluster.find_grafana()
         if graf_info.get("found"):
             lines.append(
@@ -421,9 +582,16 @@ class LiveToolExecutor:
                 f"(port {graf_info['port']})"
             )
             lines.append(f"  In-cluster URL: {graf_info['url']}")
-            if self.grafana is None:
-                self.grafana = GrafanaClient(graf_info["url"], ca_cert=self._ca_cert)
-            if self.grafana.is_reachable():
+            created = graf is None
+            if graf is None:
+                graf = GrafanaClient(graf_info["url"], ca_cert=self._ca_cert)
+            try:
+                reachable = graf.is_reachable()
+            except Exception:
+                if created:
+                    graf.close()
+                raise
+            if reachable:
                 lines.append("  Status: REACHABLE")
             else:
                 lines.append(
@@ -433,8 +601,7 @@ class LiveToolExecutor:
                 )
         else:
             lines.append(f"\nGrafana NOT FOUND: {graf_info.get('reason', 'unknown')}")
-
-        return "\n".join(lines)
+        return lines, graf
 
     # ── Cluster inspection ────────────────────────────────────────────
 
@@ -446,31 +613,17 @@ class LiveToolExecutor:
         if not result.ok:
             return f"Failed to get {kind}: {result.stderr}"
         try:
-            data = json.loads(result.stdout)
+            data = orjson.loads(result.stdout)
             items = data.get("items", [])
             if not items:
                 ns_text = f" in namespace '{namespace}'" if namespace else " across all namespaces"
                 return f"No {kind} found{ns_text}."
             lines = [f"Found {len(items)} {kind}:"]
-            for item in items[:50]:  # Cap at 50 to avoid huge output
-                meta = item.get("metadata", {})
-                ns = meta.get("namespace", "")
-                name = meta.get("name", "")
-                status = ""
-                if "status" in item:
-                    s = item["status"]
-                    phase = s.get("phase", "")
-                    ready = s.get("readyReplicas", "")
-                    replicas = s.get("replicas", "")
-                    if phase:
-                        status = f"  phase={phase}"
-                    if ready is not None and replicas is not None and ready != "" and replicas != "":
-                        status += f"  ready={ready}/{replicas}"
-                lines.append(f"  {ns}/{name}{status}")
+            lines.extend(map(_format_resource_row, items[:50]))  # Cap at 50 to avoid huge output
             if len(items) > 50:
                 lines.append(f"  ... and {len(items) - 50} more")
             return "\n".join(lines)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return result.stdout[:3000]
 
     def _tool_describe_cluster_resource(self, inp: dict[str, Any]) -> str:
@@ -494,7 +647,7 @@ class LiveToolExecutor:
         if not result.ok:
             return f"Failed to get events: {result.stderr}"
         try:
-            data = json.loads(result.stdout)
+            data = orjson.loads(result.stdout)
             items = data.get("items", [])
             if not items:
                 return f"No events in namespace '{namespace}'."
@@ -508,7 +661,7 @@ class LiveToolExecutor:
                 count = ev.get("count", 1)
                 lines.append(f"  [{ev_type}] {obj_kind}/{obj_name}: {reason} — {msg} (x{count})")
             return "\n".join(lines)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return result.stdout[:3000]
 
     # ── Prometheus validation ─────────────────────────────────────────
@@ -531,18 +684,21 @@ class LiveToolExecutor:
             "",
             "Per-job breakdown:",
         ]
-        for job, stats in summary.get("jobs", {}).items():
+        jobs = summary.get("jobs", {})
+        # Fetch target details once and group the down ones by job.
+        down_by_job: dict[str, list[dict[str, Any]]] = {}
+        if any(stats["down"] > 0 for stats in jobs.values()):
+            try:
+                for t in prom.get_active_targets_summary():
+                    if t["health"] == "down":
+                        down_by_job.setdefault(t["job"], []).append(t)
+            except Exception:
+                pass
+        for job, stats in jobs.items():
             status = "OK" if stats["down"] == 0 else "DEGRADED"
             lines.append(f"  {job}: {stats['up']}/{stats['total']} up [{status}]")
-            if stats["down"] > 0:
-                # Fetch details for down targets
-                try:
-                    targets = prom.get_active_targets_summary()
-                    for t in targets:
-                        if t["job"] == job and t["health"] == "down":
-                            lines.append(f"    DOWN: {t['instance']} — {t['lastError'][:150]}")
-                except Exception:
-                    pass
+            for t in down_by_job.get(job, ()):
+                lines.append(f"    DOWN: {t['instance']} — {t['lastError'][:150]}")
         return "\n".join(lines)
 
     def _tool_validate_metric_exists(self, inp: dict[str, Any]) -> str:
@@ -709,10 +865,12 @@ class LiveToolExecutor:
             result = self.cluster.apply_manifest(manifest_yaml, namespace)
         except PermissionError as exc:
             return str(exc)
+        if result.ok:
+            self.clear_caches()
         return result.summary
 
     # ── Final report ──────────────────────────────────────────────────
 
     def _tool_generate_validation_report(self, inp: dict[str, Any]) -> str:
         """The agent core intercepts this to parse the structured result."""
-        return json.dumps(inp, indent=2)
+        return orjson.dumps(inp, option=orjson.OPT_INDENT_2).decode()
@@ -0,0 +1,25 @@
+"""Fast safe YAML loading shared by the manifest scanner and the IaC parsers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import IO, Any
+
+import yaml
+
+# LibYAML's C loader is an order of magnitude faster; fall back when PyYAML
+# was built without it.
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
+
+def load_yaml(stream: str | bytes | IO[bytes]) -> Any:
+    """Parse a single YAML document with the fastest available safe loader."""
+    return yaml.load(stream, Loader=_Loader)
+
+
+def load_yaml_all(stream: str | bytes | IO[bytes]) -> Iterator[Any]:
+    """Parse a YAML stream with the fastest available safe loader."""
+    return yaml.load_all(stream, Loader=_Loader)
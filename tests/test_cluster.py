@@ -226,7 +226,11 @@ class TestClusterDiscovery:
         svc_data = {
             "items": [
                 {
-                    "metadata": {"name": "prometheus-server", "namespace": "monitoring"},
+                    "metadata": {
+                        "name": "prometheus-server",
+                        "namespace": "monitoring",
+                        "labels": {"app": "prometheus"},
+                    },
                     "spec": {
                         "ports": [{"name": "http-web", "port": 9090}]
                     },
@@ -258,7 +262,11 @@ class TestClusterDiscovery:
         svc_data = {
             "items": [
                 {
-                    "metadata": {"name": "grafana", "namespace": "monitoring"},
+                    "metadata": {
+                        "name": "grafana",
+                        "namespace": "monitoring",
+                        "labels": {"app.kubernetes.io/name": "grafana"},
+                    },
                     "spec": {
                         "ports": [{"name": "http", "port": 3000}]
                     },
@@ -273,3 +281,64 @@ class TestClusterDiscovery:
         assert info["found"] is True
         assert info["namespace"] == "monitoring"
         assert info["port"] == 3000
+
+    @patch("subprocess.run")
+    def test_one_listing_serves_both_lookups(self, mock_run):
+        svc_data = {
+            "items": [
+                {
+                    "metadata": {"name": "web", "namespace": "default", "labels": {"app": "web"}},
+                    "spec": {"ports": [{"port": 80}]},
+                },
+                {
+                    "metadata": {
+                        "name": "kps-prometheus",
+                        "namespace": "monitoring",
+                        "labels": {"app.kubernetes.io/name": "prometheus"},
+                    },
+                    "spec": {"ports": [{"name": "http-web", "port": 9090}]},
+                },
+                {
+                    "metadata": {
+                        "name": "kps-grafana",
+                        "namespace": "monitoring",
+                        "labels": {"app.kubernetes.io/name": "grafana"},
+                    },
+                    "spec": {"ports": [{"port": 80}]},
+                },
+            ]
+        }
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout=json.dumps(svc_data), stderr=""
+        )
+        c = ClusterClient()
+        prom = c.find_prometheus()
+        graf = c.find_grafana()
+        assert prom["service"] == "kps-prometheus"
+        assert prom["label"] == "app.kubernetes.io/name=prometheus"
+        assert graf["service"] == "kps-grafana"
+        assert graf["port"] == 80
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        assert "--all-namespaces" in cmd
+        assert "-l" not in cmd
+
+    @patch("subprocess.run")
+    def test_falls_back_to_selector_queries(self, mock_run):
+        svc_data = {
+            "items": [
+                {
+                    "metadata": {"name": "prometheus", "namespace": "obs"},
+                    "spec": {"ports": [{"port": 9090}]},
+                }
+            ]
+        }
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout='{"items": [', stderr=""),
+            MagicMock(returncode=0, stdout=json.dumps(svc_data), stderr=""),
+        ]
+        c = ClusterClient()
+        info = c.find_prometheus()
+        assert info["found"] is True
+        assert info["namespace"] == "obs"
+        assert "app=prometheus" in mock_run.call_args[0][0]
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch
 import httpx
 import pytest
 
+from k8s_observability_agent import grafana
 from k8s_observability_agent.grafana import GrafanaClient
 
 
@@ -151,15 +152,15 @@ class TestGrafanaDashboards:
         payload = call_kwargs["json"]
         assert payload["inputs"][0]["value"] == "prom-uid-123"
 
-    @patch("httpx.get")
-    def test_import_dashboard_by_id_success(self, mock_httpx_get, mock_grafana):
+    @patch.object(grafana, "_grafana_com_client")
+    def test_import_dashboard_by_id_success(self, mock_com_client, mock_grafana):
         client, mock_http = mock_grafana
 
         # Mock grafana.com download
         dl_resp = MagicMock()
         dl_resp.json.return_value = {"title": "PostgreSQL Dashboard", "panels": []}
         dl_resp.raise_for_status = MagicMock()
-        mock_httpx_get.return_value = dl_resp
+        mock_com_client.return_value.get.return_value = dl_resp
 
         # Mock Grafana import
         import_resp = MagicMock()
@@ -183,15 +184,29 @@ class TestGrafanaDashboards:
         assert result["dashboard_id"] == 9628
         assert result["title"] == "PostgreSQL Dashboard"
 
-    @patch("httpx.get")
-    def test_import_dashboard_by_id_download_failure(self, mock_httpx_get, mock_grafana):
+    @patch.object(grafana, "_grafana_com_client")
+    def test_import_dashboard_by_id_download_failure(self, mock_com_client, mock_grafana):
         client, mock_http = mock_grafana
-        mock_httpx_get.side_effect = Exception("Network error")
+        mock_com_client.return_value.get.side_effect = Exception("Network error")
 
         result = client.import_dashboard_by_id(99999)
         assert result["success"] is False
         assert "Failed to download" in result["error"]
 
+    def test_grafana_com_client_shared(self):
+        assert grafana._grafana_com_client() is grafana._grafana_com_client()
+
+    def test_clients_honour_proxy_env(self, monkeypatch):
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+        grafana._grafana_com_client.cache_clear()
+        try:
+            assert grafana._grafana_com_client()._mounts
+        finally:
+            grafana._grafana_com_client().close()
+            grafana._grafana_com_client.cache_clear()
+        with GrafanaClient("https://grafana.example:3000") as g:
+            assert g._client._mounts
+
 
 class TestGrafanaFolders:
     def test_list_folders(self, mock_grafana):
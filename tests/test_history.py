@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import json
+import sqlite3
+import threading
+from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 import pytest
 
-from k8s_observability_agent.history import ValidationHistory
+from k8s_observability_agent import history as history_module
+from k8s_observability_agent.history import _SCHEMA_VERSION, ValidationHistory
 from k8s_observability_agent.models import (
     DashboardImportResult,
     RemediationStep,
@@ -55,6 +61,37 @@ def _sample_report(**overrides) -> ValidationReport:
     return ValidationReport(**defaults)
 
 
+def _make_v1_database(db: Path) -> None:
+    """Write a schema-v1 database holding one legacy run."""
+    conn = sqlite3.connect(db)
+    conn.executescript(
+        """
+        CREATE TABLE schema_version (version INTEGER NOT NULL);
+        INSERT INTO schema_version (version) VALUES (1);
+        CREATE TABLE validation_runs (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            cluster_context TEXT    NOT NULL,
+            run_at          TEXT    NOT NULL,
+            cluster_summary TEXT    NOT NULL DEFAULT '',
+            checks_json     TEXT    NOT NULL DEFAULT '[]',
+            dashboards_json TEXT    NOT NULL DEFAULT '[]',
+            recommendations_json TEXT NOT NULL DEFAULT '[]',
+            remediation_json     TEXT NOT NULL DEFAULT '[]',
+            dashboards_to_import_json TEXT NOT NULL DEFAULT '[]',
+            plan_hash       TEXT    NOT NULL DEFAULT ''
+        );
+        """
+    )
+    checks = [{"name": "scrape-targets", "status": "fail", "message": "down"}]
+    conn.execute(
+        "INSERT INTO validation_runs (cluster_context, run_at, cluster_summary, checks_json)"
+        " VALUES (?, ?, ?, ?)",
+        ("ctx", "2025-01-01T00:00:00+00:00", "legacy", json.dumps(checks)),
+    )
+    conn.commit()
+    conn.close()
+
+
 class TestValidationHistory:
     """Tests for ValidationHistory."""
 
@@ -67,6 +104,7 @@ class TestValidationHistory:
         assert last is not None
         assert last["cluster_summary"] == report.cluster_summary
         assert last["cluster_context"] == "kind-kind"
+        assert datetime.fromisoformat(last["run_at"]).tzinfo is not None
 
     def test_last_report_returns_model(self, history: ValidationHistory) -> None:
         report = _sample_report()
@@ -86,6 +124,37 @@ class TestValidationHistory:
         assert restored.dashboards_to_import[0].dashboard_id == 315
         assert restored.recommendations == report.recommendations
 
+    def test_last_report_fills_defaults_for_older_rows(
+        self, history: ValidationHistory
+    ) -> None:
+        run_id = history.save_run("ctx", _sample_report())
+        history._conn.execute(
+            "UPDATE validation_runs SET remediation_json = ?, dashboards_json = ? WHERE id = ?",
+            (
+                json.dumps([{"title": "Deploy exporter"}]),
+                json.dumps([{"dashboard_id": "1860"}]),
+                run_id,
+            ),
+        )
+        restored = history.last_report("ctx")
+        assert restored is not None
+        assert restored.remediation_steps[0].priority == "medium"
+        assert restored.dashboards_imported[0].dashboard_id == 1860
+        assert restored.to_report().remediation_steps[0].dashboard_id == 0
+
+    def test_last_report_decodes_lazily(self, history: ValidationHistory) -> None:
+        report = _sample_report()
+        history.save_run("ctx", report)
+
+        restored = history.last_report("ctx")
+        assert restored is not None
+        assert restored.cluster_summary == report.cluster_summary
+        assert "checks" not in vars(restored)
+
+        assert (restored.passed, restored.failed, restored.warnings) == (1, 1, 1)
+        assert "checks" in vars(restored)
+        assert restored.to_report() == report
+
     def test_no_history_returns_none(self, history: ValidationHistory) -> None:
         assert history.last_run("nonexistent") is None
         assert history.last_report("nonexistent") is None
@@ -94,12 +163,25 @@ class TestValidationHistory:
         assert history.run_count("ctx") == 0
         history.save_run("ctx", _sample_report())
         assert history.run_count("ctx") == 1
-        history.save_run("ctx", _sample_report())
+        history.save_run("ctx", _sample_report(cluster_summary="changed"))
         assert history.run_count("ctx") == 2
         # Different context doesn't count
         history.save_run("other", _sample_report())
         assert history.run_count("ctx") == 2
 
+    def test_identical_back_to_back_saves_are_deduplicated(
+        self, history: ValidationHistory
+    ) -> None:
+        first = history.save_run("ctx", _sample_report())
+        before = history.last_run("ctx")["run_at_us"]
+        assert history.save_run("ctx", _sample_report()) == first
+        assert history.run_count("ctx") == 1
+        assert history.last_run("ctx")["run_at_us"] >= before
+
+        # A different plan hash or report content is a new run
+        assert history.save_run("ctx", _sample_report(), plan_hash="abc") != first
+        assert history.run_count("ctx") == 2
+
     def test_all_runs_ordering(self, history: ValidationHistory) -> None:
         for i in range(5):
             history.save_run("ctx", _sample_report(cluster_summary=f"run-{i}"))
@@ -110,6 +192,14 @@ class TestValidationHistory:
         assert runs[0]["cluster_summary"] == "run-4"
         assert runs[2]["cluster_summary"] == "run-2"
 
+    def test_iter_runs_is_lazy(self, history: ValidationHistory) -> None:
+        for i in range(3):
+            history.save_run("ctx", _sample_report(cluster_summary=f"run-{i}"))
+
+        runs = history.iter_runs("ctx")
+        assert next(runs)["cluster_summary"] == "run-2"
+        assert [r["cluster_summary"] for r in runs] == ["run-1", "run-0"]
+
     def test_prune_keeps_recent(self, history: ValidationHistory) -> None:
         for i in range(10):
             history.save_run("ctx", _sample_report(cluster_summary=f"run-{i}"))
@@ -122,6 +212,85 @@ class TestValidationHistory:
         summaries = [r["cluster_summary"] for r in runs]
         assert summaries == ["run-9", "run-8", "run-7"]
 
+    def test_save_many(self, history: ValidationHistory) -> None:
+        ids = history.save_many(
+            [
+                ("ctx", _sample_report(cluster_summary="a"), ""),
+                ("ctx", _sample_report(cluster_summary="b"), "abc"),
+                ("other", _sample_report(), ""),
+            ]
+        )
+        assert len(ids) == 3 and ids == sorted(ids)
+        assert history.run_count("ctx") == 2
+        assert history.last_run("ctx")["plan_hash"] == "abc"
+
+    def test_batch_rolls_back_on_error(self, history: ValidationHistory) -> None:
+        history.save_run("ctx", _sample_report())
+        with pytest.raises(RuntimeError), history.batch():
+            history.save_run("ctx", _sample_report())
+            history.save_run("ctx", _sample_report())
+            raise RuntimeError("boom")
+        assert history.run_count("ctx") == 1
+
+    def test_concurrent_saves_from_threads(self, history: ValidationHistory) -> None:
+        def worker(i: int) -> None:
+            for j in range(5):
+                history.save_run("ctx", _sample_report(cluster_summary=f"t{i}-{j}"))
+                history.previous_run_summary("ctx")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert history.run_count("ctx") == 20
+
+    def test_readers_never_see_another_threads_open_batch(
+        self, history: ValidationHistory
+    ) -> None:
+        history.save_run("ctx", _sample_report(cluster_summary="committed"))
+        in_batch = threading.Event()
+        release = threading.Event()
+
+        def writer() -> None:
+            with pytest.raises(RuntimeError), history.batch():
+                history.save_run("ctx", _sample_report(cluster_summary="rolled back"))
+                in_batch.set()
+                release.wait(5)
+                raise RuntimeError("abort")
+
+        seen: dict[str, Any] = {}
+
+        def reader() -> None:
+            seen["last"] = history.last_run("ctx")
+            seen["summary"] = history.previous_run_summary("ctx")
+
+        w = threading.Thread(target=writer)
+        w.start()
+        assert in_batch.wait(5)
+        r = threading.Thread(target=reader)
+        r.start()
+        r.join(0.2)
+        assert r.is_alive()  # waits for the batch instead of reading through it
+        release.set()
+        w.join(5)
+        r.join(5)
+
+        assert seen["last"]["cluster_summary"] == "committed"
+        assert "Cluster summary: committed" in seen["summary"]
+        assert history.previous_run_summary("ctx") == seen["summary"]
+
+    def test_save_and_prune(self, history: ValidationHistory) -> None:
+        for i in range(5):
+            run_id = history.save_and_prune(
+                "ctx", _sample_report(cluster_summary=f"run-{i}"), keep=2
+            )
+
+        assert history.run_count("ctx") == 2
+        assert history.last_run("ctx")["id"] == run_id
+        assert [r["cluster_summary"] for r in history.all_runs("ctx")] == ["run-4", "run-3"]
+
     def test_previous_run_summary_empty(self, history: ValidationHistory) -> None:
         assert history.previous_run_summary("no-ctx") == ""
 
@@ -138,6 +307,28 @@ class TestValidationHistory:
         assert "Re-check the previously failing items" in summary
         assert "ID 315" in summary
 
+    def test_previous_run_summary_all_passing(self, history: ValidationHistory) -> None:
+        checks = [
+            ValidationCheck(name="a", status="pass"),
+            ValidationCheck(name="b", status="pass"),
+        ]
+        history.save_run("ctx", _sample_report(checks=checks))
+        summary = history.previous_run_summary("ctx")
+
+        assert "2 passed, 0 failed, 0 warnings" in summary
+        assert "Issues found last time" not in summary
+
+    def test_previous_run_summary_refreshes_after_save(
+        self, history: ValidationHistory
+    ) -> None:
+        history.save_run("ctx", _sample_report(cluster_summary="first"))
+        first = history.previous_run_summary("ctx")
+        assert history.previous_run_summary("ctx") is first
+
+        history.save_run("ctx", _sample_report(cluster_summary="second"))
+        second = history.previous_run_summary("ctx")
+        assert "Cluster summary: second" in second
+
     def test_separate_cluster_contexts(self, history: ValidationHistory) -> None:
         history.save_run("cluster-a", _sample_report(cluster_summary="A"))
         history.save_run("cluster-b", _sample_report(cluster_summary="B"))
@@ -164,3 +355,105 @@ class TestValidationHistory:
         report = history.last_report("ctx")
         assert report is not None
         assert report.cluster_summary == "new"
+
+    def test_upgrades_v1_database(self, tmp_path: Path) -> None:
+        db = tmp_path / "legacy.db"
+        _make_v1_database(db)
+
+        h = ValidationHistory(db)
+        report = h.last_report("ctx")
+        assert report is not None
+        assert report.cluster_summary == "legacy"
+        assert report.checks[0].status == "fail"
+        assert h.last_run("ctx")["run_at_us"] == 1_735_689_600_000_000
+        assert h.last_run("ctx")["run_at"] == "2025-01-01T00:00:00+00:00"
+        assert "(2025-01-01T00:00:00+00:00)" in h.previous_run_summary("ctx")
+        assert h._conn.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION
+        assert h._legacy_schema_version() == 0
+        h.save_run("ctx", _sample_report(cluster_summary="new"))
+        assert h.run_count("ctx") == 2
+        h.close()
+
+    def test_failed_migration_step_is_retried_on_next_open(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        db = tmp_path / "legacy.db"
+        _make_v1_database(db)
+        with monkeypatch.context() as m:
+            # The step's first statement succeeds before the second one fails
+            failing = history_module._MIGRATIONS[5] + "\nSELECT * FROM no_such_table;"
+            m.setitem(history_module._MIGRATIONS, 5, failing)
+            with pytest.raises(sqlite3.OperationalError):
+                ValidationHistory(db)
+
+        conn = sqlite3.connect(db)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 4
+        conn.close()
+
+        h = ValidationHistory(db)
+        assert h._conn.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION
+        assert h.last_run("ctx")["run_at_us"] == 1_735_689_600_000_000
+        h.close()
+
+    def test_latest_run_query_uses_composite_index(self, history: ValidationHistory) -> None:
+        plan = history._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM validation_runs "
+            "WHERE cluster_context = ? ORDER BY run_at_us DESC LIMIT 1",
+            ("ctx",),
+        ).fetchall()
+        detail = " ".join(r[-1] for r in plan)
+        assert "idx_runs_ctx_time" in detail
+        assert "TEMP B-TREE" not in detail
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# Payload storage
+# ═══════════════════════════════════════════════════════════════════════════
+
+
+@pytest.fixture(params=[True, False], ids=["jsonb", "json-text"])
+def payload_storage(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Force the payload columns to JSONB or plain JSON text storage."""
+    jsonb: bool = request.param
+    if jsonb and sqlite3.sqlite_version_info < (3, 45, 0):
+        pytest.skip("JSONB needs SQLite 3.45+")
+    param, run_columns, summary_columns, reencode = history_module._payload_sql(jsonb)
+    monkeypatch.setattr(history_module, "_HAS_JSONB", jsonb)
+    monkeypatch.setattr(history_module, "_JSON_PARAM", param)
+    monkeypatch.setattr(history_module, "_RUN_COLUMNS", run_columns)
+    monkeypatch.setattr(history_module, "_SUMMARY_COLUMNS", summary_columns)
+    monkeypatch.setitem(history_module._MIGRATIONS, 2, reencode)
+    return jsonb
+
+
+class TestPayloadStorage:
+    def test_round_trip(self, tmp_path: Path, payload_storage: bool) -> None:
+        h = ValidationHistory(tmp_path / "history.db")
+        h.save_run("ctx", _sample_report())
+        stored = h._conn.execute("SELECT typeof(checks_json) FROM validation_runs").fetchone()[0]
+        assert stored == ("blob" if payload_storage else "text")
+
+        report = h.last_report("ctx")
+        assert report is not None
+        assert [c.status for c in report.checks] == ["pass", "fail", "warn"]
+        assert report.recommendations[0] == "Deploy node_exporter DaemonSet"
+        assert report.dashboards_to_import[0].dashboard_id == 315
+
+        summary = h.previous_run_summary("ctx")
+        assert "1 passed, 1 failed, 1 warnings" in summary
+        assert "[FAIL] node-exporter-metrics" in summary
+        assert "Suggested manifest was provided" in summary
+        assert "ID 315: K8s Cluster" in summary
+        h.close()
+
+    def test_upgrade_reencodes_legacy_rows(self, tmp_path: Path, payload_storage: bool) -> None:
+        db = tmp_path / "legacy.db"
+        _make_v1_database(db)
+        h = ValidationHistory(db)
+        stored = h._conn.execute("SELECT typeof(checks_json) FROM validation_runs").fetchone()[0]
+        assert stored == ("blob" if payload_storage else "text")
+        report = h.last_report("ctx")
+        assert report is not None
+        assert report.checks[0].name == "scrape-targets"
+        assert "0 passed, 1 failed, 0 warnings" in h.previous_run_summary("ctx")
+        h.close()
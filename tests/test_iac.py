@@ -2,22 +2,44 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
 import textwrap
+import threading
 from pathlib import Path
 
+import orjson
 import pytest
 
+from k8s_observability_agent import iac
 from k8s_observability_agent.iac import (
+    _classify_repo,
     _discover_helm_charts,
     _discover_kustomize,
     _discover_pulumi,
     _discover_terraform,
+    _extract_helm_releases_from_terraform,
     _extract_tf_block_props,
     _find_images_in_dict,
+    _is_skipped_dir,
+    _iter_files,
+    _match_helm_archetype,
+    _match_pulumi_archetype,
+    _parallel_map,
+    _parse_pulumi_program,
     _parse_terraform_regex,
+    _rel,
+    _render_helm_chart,
+    _rendered_resources,
+    _stream_render,
+    _tf_block_end,
+    _yload_file,
+    _yload_json_first,
     scan_iac,
 )
-from k8s_observability_agent.models import IaCDiscovery, IaCResource, IaCSource
+from k8s_observability_agent.models import IaCDiscovery, IaCResource, IaCSource, K8sResource
+from k8s_observability_agent.yaml_loader import load_yaml, load_yaml_all
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -252,6 +274,13 @@ class TestTerraform:
         # Should mention postgres_exporter or CloudWatch
         assert any("exporter" in n.lower() or "cloudwatch" in n.lower() for n in db.monitoring_notes)
 
+    def test_monitoring_notes_are_independent_lists(self, tf_repo: Path) -> None:
+        resources = [r for r in _discover_terraform(tf_repo) if r.monitoring_notes]
+        assert all(isinstance(r.monitoring_notes, list) for r in resources)
+        resources[0].monitoring_notes.append("local edit")
+        again = [r for r in _discover_terraform(tf_repo) if r.monitoring_notes]
+        assert "local edit" not in again[0].monitoring_notes
+
     def test_skips_dotdirs(self, tmp_path: Path) -> None:
         hidden = tmp_path / ".terraform" / "modules"
         hidden.mkdir(parents=True)
@@ -282,10 +311,44 @@ class TestTerraform:
         assert props.get("engine_version") == "15.4"
         assert props.get("instance_class") == "db.t3.micro"
 
+    def test_extract_tf_block_props_stops_at_block_end(self) -> None:
+        text = 'engine = "mysql"\n  tags = { Name = "x" }\n}\nnode_type = "cache.t3"\n'
+        props = _extract_tf_block_props(text, 0)
+        assert props == {"engine": "mysql"}
+
+    def test_extract_tf_block_props_single_line_block(self) -> None:
+        text = 'resource "aws_sqs_queue" "q" { name = "jobs" }\n'
+        props = _extract_tf_block_props(text, text.index("{") + 1)
+        assert props == {"name": "jobs"}
+
+    def test_extract_tf_block_props_quoted_beats_bare(self) -> None:
+        block = 'name = var.name\nnamespace = {\n}\nsub {\n  name = "inner"\n}\n}\n'
+        props = _extract_tf_block_props(block, 0)
+        assert props == {"name": "inner"}
+
+    def test_tf_block_end(self) -> None:
+        text = 'a = { b = { c = 1 } }\n}\nnext {}'
+        assert text[:_tf_block_end(text, 0)].endswith("}\n}")
+        assert _tf_block_end("x = {", 0) == len("x = {")
+        assert _tf_block_end("}", 0) == 1
+
     def test_empty_repo(self, tmp_path: Path) -> None:
         resources = _discover_terraform(tmp_path)
         assert resources == []
 
+    def test_helm_release_archetype(self) -> None:
+        release = IaCResource(
+            source=IaCSource.TERRAFORM, source_file="main.tf",
+            resource_type="helm_release", name="cache",
+            properties={"chart": "redis", "namespace": "data"},
+        )
+        releases = _extract_helm_releases_from_terraform([release])
+        assert releases[0]["chart"] == "redis"
+        assert release.archetype == "cache"
+        # A private list copy, not the shared table tuple
+        assert isinstance(release.monitoring_notes, list)
+        assert tuple(release.monitoring_notes) == _match_helm_archetype("redis")[1]
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  Helm Tests
@@ -337,6 +400,187 @@ class TestHelm:
         assert releases == []
         assert k8s == []
 
+    def test_renders_each_chart_in_discovery_order(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        for name in ("alpha", "beta", "gamma"):
+            chart_dir = tmp_path / name
+            chart_dir.mkdir()
+            (chart_dir / "Chart.yaml").write_text(f"name: {name}\nversion: 0.1.0\n")
+
+        def fake_render(
+            chart_dir: Path, chart_name: str, dependencies: list[str],
+        ) -> list[K8sResource]:
+            return [K8sResource(kind="ConfigMap", name=chart_name)]
+
+        monkeypatch.setattr(iac, "_render_helm_chart", fake_render)
+        resources, _, k8s = _discover_helm_charts(tmp_path)
+        charts = [r.name for r in resources if r.resource_type == "helm_chart"]
+        assert [r.name for r in k8s] == charts
+        assert sorted(charts) == ["alpha", "beta", "gamma"]
+
+
+class TestRenderHelmChart:
+    @pytest.fixture()
+    def fake_helm(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Put a stub `helm` on PATH that logs its argv and prints one manifest."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        log = tmp_path / "helm-calls.log"
+        helm = bin_dir / "helm"
+        helm.write_text(textwrap.dedent(f"""\
+            #!/bin/sh
+            echo "$@" >> {log}
+            printf 'apiVersion: v1\\nkind: ConfigMap\\nmetadata:\\n  name: rendered\\n'
+            """))
+        helm.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        return log
+
+    def test_skips_chart_with_unvendored_dependencies(
+        self, tmp_path: Path, fake_helm: Path,
+    ) -> None:
+        chart = tmp_path / "chart"
+        chart.mkdir()
+        assert _render_helm_chart(chart, "app", ["postgresql"]) == []
+        assert not fake_helm.exists()
+
+    def test_renders_when_dependencies_vendored(self, tmp_path: Path, fake_helm: Path) -> None:
+        chart = tmp_path / "chart"
+        (chart / "charts" / "redis").mkdir(parents=True)
+        (chart / "charts" / "postgresql-12.1.0.tgz").write_bytes(b"")
+        resources = _render_helm_chart(chart, "app", ["postgresql", "redis"])
+        assert [(r.kind, r.name, r.source_file) for r in resources] == [
+            ("ConfigMap", "rendered", "helm:app"),
+        ]
+        assert fake_helm.read_text().split() == ["template", "app", str(chart), "--skip-tests"]
+
+    def test_no_dependencies_renders(self, tmp_path: Path, fake_helm: Path) -> None:
+        assert len(_render_helm_chart(tmp_path, "app")) == 1
+
+
+class TestStreamRender:
+    def test_nonzero_exit_reports_stderr(self) -> None:
+        code = "import sys; sys.stderr.write('boom'); sys.exit(3)"
+        returncode, stderr, _ = _stream_render([sys.executable, "-c", code], "x")
+        assert returncode == 3
+        assert stderr == "boom"
+
+    def test_large_stderr_does_not_block(self) -> None:
+        code = (
+            "import sys; sys.stderr.write('e' * 200_000); "
+            "print('apiVersion: v1\\nkind: Secret\\nmetadata: {name: s}')"
+        )
+        returncode, _, resources = _stream_render([sys.executable, "-c", code], "x")
+        assert returncode == 0
+        assert [r.name for r in resources] == ["s"]
+
+    def test_timeout_kills_renderer(self) -> None:
+        code = "import time; time.sleep(30)"
+        with pytest.raises(subprocess.TimeoutExpired):
+            _stream_render([sys.executable, "-c", code], "x", timeout=0.5)
+
+
+class TestRenderedResources:
+    def test_keeps_only_manifest_documents(self) -> None:
+        docs = load_yaml_all(textwrap.dedent("""\
+            apiVersion: v1
+            kind: ConfigMap
+            metadata: {name: settings, namespace: apps}
+            ---
+            ---
+            kind: NotAManifest
+            ---
+            - just
+            - a list
+            """))
+        resources = _rendered_resources(docs, "helm:app")
+        assert [(r.kind, r.name, r.namespace) for r in resources] == [
+            ("ConfigMap", "settings", "apps"),
+        ]
+        assert resources[0].source_file == "helm:app"
+
+
+class TestArchetypeTables:
+    @pytest.mark.parametrize(
+        "table", ["_INFRA_ARCHETYPES", "_HELM_CHART_ARCHETYPES", "_PULUMI_ARCHETYPES"],
+    )
+    def test_tables_are_read_only(self, table: str) -> None:
+        with pytest.raises(TypeError):
+            getattr(iac, table)["new_type"] = ("custom-app", ())
+
+
+class TestYamlLoaders:
+    def test_load_yaml_single_document(self) -> None:
+        assert load_yaml("name: redis\nversion: 1.0\n") == {"name": "redis", "version": 1.0}
+
+    def test_load_yaml_all_stream(self) -> None:
+        docs = list(load_yaml_all("kind: A\n---\n---\nkind: B\n"))
+        assert docs == [{"kind": "A"}, None, {"kind": "B"}]
+
+    def test_json_first_parses_json(self) -> None:
+        assert _yload_json_first('{"name": "app", "version": "1.0"}') == {
+            "name": "app", "version": "1.0",
+        }
+
+    def test_json_first_accepts_bytes(self) -> None:
+        assert _yload_json_first(b'  {"name": "app"}') == {"name": "app"}
+        assert _yload_json_first("name: caf\u00e9\n".encode()) == {"name": "caf\u00e9"}
+
+    def test_yload_file_reads_utf8_bytes(self, tmp_path: Path) -> None:
+        path = tmp_path / "values.yaml"
+        path.write_bytes("\ufeffimage: caf\u00e9/app:1\n".encode())
+        assert _yload_file(path) == {"image": "caf\u00e9/app:1"}
+
+    def test_json_first_falls_back_to_yaml(self) -> None:
+        assert _yload_json_first("name: app\n") == {"name": "app"}
+        # YAML flow mappings look like JSON but are not
+        assert _yload_json_first("{name: app}") == {"name": "app"}
+
+
+class TestMatchHelmArchetype:
+    def test_substring_match_is_case_insensitive(self) -> None:
+        arch, notes = _match_helm_archetype("Bitnami-PostgreSQL")
+        assert arch == "database"
+        assert notes == ("Deploy postgres_exporter sidecar", "Import dashboard 9628")
+
+    def test_first_pattern_wins(self) -> None:
+        # "nginx" precedes "ingress-nginx" in the table
+        assert _match_helm_archetype("ingress-nginx")[0] == "web-server"
+
+    def test_no_match(self) -> None:
+        assert _match_helm_archetype("my-app") == ("", ())
+
+    def test_automaton_agrees_with_linear_scan(self) -> None:
+        pytest.importorskip("ahocorasick")
+        names = [p for p, _, _ in iac._HELM_CHART_PATTERNS] + [
+            "ingress-nginx", "bitnami-redis-cluster", "kafka-ui", "my-app",
+        ]
+        for name in names:
+            expected = iac._scan_patterns(iac._HELM_CHART_PATTERNS, name)
+            assert _match_helm_archetype(name) == expected
+
+
+class TestMatchPulumiArchetype:
+    def test_dotted_python_type(self) -> None:
+        assert _match_pulumi_archetype("aws.rds.Instance")[0] == "database"
+
+    def test_k8s_alias(self) -> None:
+        arch, _ = _match_pulumi_archetype("k8s.apps.v1.StatefulSet")
+        assert arch == _match_pulumi_archetype("kubernetes:apps/v1:StatefulSet")[0]
+        assert arch
+
+    def test_no_match(self) -> None:
+        assert _match_pulumi_archetype("random.RandomPassword") == ("", ())
+
+    def test_prefixed_module_name(self) -> None:
+        # ``import pulumi_aws`` yields pulumi_aws.rds.Instance
+        assert _match_pulumi_archetype("pulumi_aws.rds.Instance")[0] == "database"
+
+    def test_prefix_buckets_cover_table(self) -> None:
+        indices = sorted(i for b in iac._PULUMI_PATTERNS_BY_PREFIX.values() for i in b)
+        assert indices == list(range(len(iac._PULUMI_PATTERNS)))
+
 
 class TestFindImagesInDict:
     def test_repository_tag_pattern(self) -> None:
@@ -368,6 +612,20 @@ class TestFindImagesInDict:
         images = _find_images_in_dict(data)
         assert "nginx" in images
 
+    def test_depth_first_order(self) -> None:
+        data = {
+            "a": {"image": "reg/a:1", "sidecar": {"image": "reg/a-side:1"}},
+            "b": [{"image": {"repository": "reg/b", "tag": "2"}}],
+            "c": {"image": "reg/c:3"},
+        }
+        assert _find_images_in_dict(data) == ["reg/a:1", "reg/a-side:1", "reg/b:2", "reg/c:3"]
+
+    def test_very_deep_values(self) -> None:
+        data: dict = {"image": "reg/leaf:1"}
+        for _ in range(5000):
+            data = {"nested": data}
+        assert _find_images_in_dict(data) == ["reg/leaf:1"]
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  Kustomize Tests
@@ -441,6 +699,25 @@ class TestPulumi:
         resources = _discover_pulumi(tmp_path)
         assert resources == []
 
+    def test_python_ignores_commented_out_calls(self, tmp_path: Path) -> None:
+        (tmp_path / "Pulumi.yaml").write_text("name: p\nruntime: python\n")
+        (tmp_path / "__main__.py").write_text(
+            textwrap.dedent("""\
+            import pulumi_aws as aws
+
+            # old: aws.sqs.Queue("legacy")
+            q = aws.sqs.Queue("jobs")
+            """)
+        )
+        infra = [r for r in _discover_pulumi(tmp_path) if r.resource_type != "pulumi_project"]
+        assert [(r.resource_type, r.name) for r in infra] == [("aws.sqs.Queue", "jobs")]
+
+    def test_python_syntax_error_falls_back_to_regex(self, tmp_path: Path) -> None:
+        (tmp_path / "Pulumi.yaml").write_text("name: p\nruntime: python\n")
+        (tmp_path / "__main__.py").write_text('db = aws.rds.Instance("db"\nprint "py2"\n')
+        infra = [r for r in _discover_pulumi(tmp_path) if r.resource_type != "pulumi_project"]
+        assert [r.name for r in infra] == ["db"]
+
     def test_nodejs_runtime(self, tmp_path: Path) -> None:
         proj_dir = tmp_path / "infra"
         proj_dir.mkdir()
@@ -476,6 +753,31 @@ class TestPulumi:
         infra = [r for r in resources if r.resource_type != "pulumi_project"]
         assert len(infra) == 1
         assert infra[0].name == "go-db"
+        assert infra[0].resource_type == "rds:Instance"
+
+    def test_program_without_calls(self, tmp_path: Path) -> None:
+        prog = tmp_path / "consts.py"
+        prog.write_text('REGION = "eu-west-1"\n')
+        assert _parse_pulumi_program(prog, tmp_path, "python") == []
+
+    def test_go_program_without_constructors(self, tmp_path: Path) -> None:
+        prog = tmp_path / "util.go"
+        prog.write_text('package main\nfunc name() string { return fmt.Sprintf("x") }\n')
+        assert _parse_pulumi_program(prog, tmp_path, "go") == []
+
+    def test_typescript_ignores_plain_calls(self, tmp_path: Path) -> None:
+        proj_dir = tmp_path / "infra"
+        proj_dir.mkdir()
+        (proj_dir / "Pulumi.yaml").write_text("name: ts-proj\nruntime: nodejs\n")
+        (proj_dir / "index.ts").write_text(
+            textwrap.dedent("""            import * as aws from "@pulumi/aws";
+            console.log("starting");
+            const db = new aws.rds.Instance("ts-db", { engine: "postgres" });
+            """)
+        )
+        resources = _discover_pulumi(tmp_path)
+        infra = [r for r in resources if r.resource_type != "pulumi_project"]
+        assert [(r.resource_type, r.name) for r in infra] == [("aws.rds.Instance", "ts-db")]
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -536,6 +838,141 @@ class TestScanIaC:
             scan_iac(Path("/nonexistent/path"))
 
 
+class TestIterFiles:
+    def test_prunes_hidden_and_vendored_dirs(self, tmp_path: Path) -> None:
+        for rel in (
+            "main.tf", "mod/net.tf", ".terraform/x.tf", "vendor/v.tf",
+            "web/node_modules/pkg/n.tf", "venv/lib/s.tf", ".hidden.tf", "notes.txt",
+        ):
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+        found = _iter_files(tmp_path, suffixes=(".tf",))
+        assert [p.relative_to(tmp_path).as_posix() for p in found] == ["main.tf", "mod/net.tf"]
+
+    def test_matches_exact_names(self, tmp_path: Path) -> None:
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "Chart.yaml").write_text("")
+        (tmp_path / "app" / "values.yaml").write_text("")
+        found = list(_iter_files(tmp_path, names=("Chart.yaml",)))
+        assert found == [tmp_path / "app" / "Chart.yaml"]
+
+    def test_classify_repo(self, tmp_path: Path) -> None:
+        for rel in (
+            "main.tf", "mod/vpc.tf", "charts/app/Chart.yaml", "overlays/kustomization.yml",
+            "base/kustomization.yaml", "infra/Pulumi.yaml", "infra/__main__.py",
+            "node_modules/x/Chart.yaml",
+        ):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("")
+        buckets = _classify_repo(tmp_path)
+        rel = {k: [_rel(p, tmp_path) for p in v] for k, v in buckets.items()}
+        assert rel == {
+            "terraform": ["main.tf", "mod/vpc.tf"],
+            "helm": ["charts/app/Chart.yaml"],
+            "kustomize": ["base/kustomization.yaml", "overlays/kustomization.yml"],
+            "pulumi": ["infra/Pulumi.yaml"],
+        }
+        assert buckets["terraform"] == list(_iter_files(tmp_path, suffixes=(".tf",)))
+
+    def test_is_skipped_dir(self) -> None:
+        assert _is_skipped_dir(".git")
+        assert _is_skipped_dir(".venv")
+        assert _is_skipped_dir("node_modules")
+        assert _is_skipped_dir("vendor")
+        assert not _is_skipped_dir("charts")
+        assert not _is_skipped_dir("vendored-charts")
+
+    def test_rel(self, tmp_path: Path) -> None:
+        assert _rel(tmp_path / "infra" / "main.tf", tmp_path) == "infra/main.tf"
+        assert _rel(tmp_path, tmp_path) == "."
+        assert _rel(Path(".") / "main.tf", Path(".")) == "main.tf"
+        assert _rel(Path("/srv/infra/main.tf"), Path("/")) == "srv/infra/main.tf"
+        assert _rel(tmp_path / "main.tf", Path(f"{tmp_path}/")) == "main.tf"
+
+    def test_repo_root_under_hidden_dir(self, tmp_path: Path) -> None:
+        root = tmp_path / ".checkouts" / "repo"
+        root.mkdir(parents=True)
+        (root / "main.tf").write_text('resource "aws_sqs_queue" "q" {}\n')
+        assert [r.name for r in _discover_terraform(root)] == ["q"]
+
+
+class TestParallelMap:
+    def test_preserves_order(self) -> None:
+        assert _parallel_map(lambda n: n * n, list(range(50))) == [n * n for n in range(50)]
+
+    def test_runs_on_the_shared_file_pool(self) -> None:
+        names = _parallel_map(lambda _: threading.current_thread().name, list(range(8)))
+        assert all(name.startswith("iac-file") for name in names)
+        assert iac._file_pool() is iac._file_pool()
+
+    def test_propagates_errors(self) -> None:
+        def fail(n: int) -> int:
+            raise ValueError(n)
+
+        with pytest.raises(ValueError):
+            _parallel_map(fail, [1, 2, 3])
+
+    def test_many_terraform_files(self, tmp_path: Path) -> None:
+        for i in range(20):
+            (tmp_path / f"m{i:02d}.tf").write_text(f'resource "aws_sqs_queue" "q{i:02d}" {{}}\n')
+        names = [r.name for r in _discover_terraform(tmp_path)]
+        assert sorted(names) == [f"q{i:02d}" for i in range(20)]
+        assert len(names) == 20
+
+
+class TestParseCache:
+    def test_unchanged_files_reuse_cache(
+        self, tf_repo: Path, tmp_path_factory: pytest.TempPathFactory,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        cache = tmp_path_factory.mktemp("cache") / "iac.json"
+        first = scan_iac(tf_repo, cache_path=cache)
+        assert cache.exists()
+
+        def boom(*_args: object) -> None:
+            raise AssertionError("cached file was re-parsed")
+
+        monkeypatch.setattr(iac, "_parse_terraform_file", boom)
+        second = scan_iac(tf_repo, cache_path=cache)
+        assert second.resources == first.resources
+
+    def test_cached_notes_share_table_strings(
+        self, tf_repo: Path, tmp_path_factory: pytest.TempPathFactory,
+    ) -> None:
+        cache = tmp_path_factory.mktemp("cache") / "iac.json"
+        scan_iac(tf_repo, cache_path=cache)
+        cached = scan_iac(tf_repo, cache_path=cache)
+        db = next(r for r in cached.resources if r.resource_type == "aws_db_instance")
+        table_notes = iac._INFRA_ARCHETYPES["aws_db_instance"][1]
+        assert db.monitoring_notes == list(table_notes)
+        assert all(a is b for a, b in zip(db.monitoring_notes, table_notes))
+
+    def test_changed_file_is_reparsed(
+        self, tf_repo: Path, tmp_path_factory: pytest.TempPathFactory,
+    ) -> None:
+        cache = tmp_path_factory.mktemp("cache") / "iac.json"
+        scan_iac(tf_repo, cache_path=cache)
+        (tf_repo / "network.tf").write_text('resource "aws_sqs_queue" "jobs" {}\n')
+        discovery = scan_iac(tf_repo, cache_path=cache)
+        assert "jobs" in {r.name for r in discovery.resources}
+
+    def test_deleted_files_dropped_from_cache(
+        self, tf_repo: Path, tmp_path_factory: pytest.TempPathFactory,
+    ) -> None:
+        cache = tmp_path_factory.mktemp("cache") / "iac.json"
+        scan_iac(tf_repo, cache_path=cache)
+        (tf_repo / "network.tf").unlink()
+        scan_iac(tf_repo, cache_path=cache)
+        assert set(orjson.loads(cache.read_bytes())["files"]) == {"terraform:main.tf"}
+
+    def test_corrupt_cache_ignored(self, tf_repo: Path, tmp_path: Path) -> None:
+        cache = tmp_path / "iac.json"
+        cache.write_text("{not json")
+        discovery = scan_iac(tf_repo, cache_path=cache)
+        assert discovery.summary()["terraform"] == 4
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  IaCDiscovery Model Tests
 # ══════════════════════════════════════════════════════════════════════════════
@@ -550,6 +987,14 @@ class TestIaCDiscoveryModel:
         assert not d.has_pulumi
         assert d.summary() == {}
 
+    def test_has_flags_follow_appended_resources(self) -> None:
+        d = IaCDiscovery()
+        assert not d.has_terraform
+        d.resources.append(
+            IaCResource(source=IaCSource.TERRAFORM, resource_type="aws_db_instance", name="db")
+        )
+        assert d.has_terraform
+
     def test_has_flags(self) -> None:
         d = IaCDiscovery(
             resources=[
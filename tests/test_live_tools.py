@@ -10,7 +10,11 @@ import pytest
 from k8s_observability_agent.cluster import ClusterClient, CommandResult
 from k8s_observability_agent.grafana import GrafanaClient
 from k8s_observability_agent.prometheus import PrometheusClient
-from k8s_observability_agent.tools.live import LIVE_TOOL_DEFINITIONS, LiveToolExecutor
+from k8s_observability_agent.tools.live import (
+    LIVE_TOOL_DEFINITIONS,
+    LiveToolExecutor,
+    _format_resource_row,
+)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -116,6 +120,46 @@ class TestFindMonitoringStack:
         result = mock_executor.execute("find_monitoring_stack", {})
         assert "NOT FOUND" in result
 
+    def test_discovered_clients_kept(self):
+        cluster = MagicMock(spec=ClusterClient)
+        cluster.find_prometheus.return_value = {
+            "found": True, "namespace": "monitoring", "service": "prometheus",
+            "port": 9090, "url": "http://prom:9090",
+        }
+        cluster.find_grafana.return_value = {"found": False, "reason": "none"}
+        executor = LiveToolExecutor(cluster=cluster)
+        with patch("k8s_observability_agent.tools.live.PrometheusClient") as prom_cls:
+            prom_cls.return_value.is_reachable.return_value = False
+            result = executor.execute("find_monitoring_stack", {})
+        assert executor.prometheus is prom_cls.return_value
+        assert executor.grafana is None
+        assert result.index("Prometheus FOUND") < result.index("Grafana NOT FOUND")
+        assert "port-forward" in result
+
+    def test_one_failed_lookup_still_reports_the_other(self):
+        cluster = MagicMock(spec=ClusterClient)
+        cluster.find_prometheus.return_value = {
+            "found": True, "namespace": "monitoring", "service": "prometheus",
+            "port": 9090, "url": "http://prom:9090",
+        }
+        cluster.find_grafana.return_value = {
+            "found": True, "namespace": "monitoring", "service": "grafana",
+            "port": 3000, "url": "http://grafana:3000",
+        }
+        executor = LiveToolExecutor(cluster=cluster)
+        with (
+            patch("k8s_observability_agent.tools.live.PrometheusClient") as prom_cls,
+            patch("k8s_observability_agent.tools.live.GrafanaClient") as graf_cls,
+        ):
+            prom_cls.return_value.is_reachable.side_effect = RuntimeError("boom")
+            graf_cls.return_value.is_reachable.return_value = True
+            result = executor.execute("find_monitoring_stack", {})
+        assert "Prometheus lookup FAILED: boom" in result
+        assert "Grafana FOUND" in result
+        prom_cls.return_value.close.assert_called_once()
+        assert executor.prometheus is None
+        assert executor.grafana is graf_cls.return_value
+
 
 class TestGetClusterResources:
     def test_success(self, mock_executor):
@@ -143,6 +187,35 @@ class TestGetClusterResources:
         result = mock_executor.execute("get_cluster_resources", {"kind": "pods"})
         assert "No pods found" in result
 
+    def test_caps_listing(self, mock_executor):
+        items = {"items": [{"metadata": {"name": f"p{i}", "namespace": "ns"}} for i in range(60)]}
+        mock_executor.cluster.get_resources.return_value = CommandResult(
+            command="kubectl get", returncode=0,
+            stdout=json.dumps(items), stderr=""
+        )
+        result = mock_executor.execute("get_cluster_resources", {"kind": "pods"})
+        assert "Found 60 pods" in result
+        assert "ns/p49" in result
+        assert "ns/p50" not in result
+        assert "... and 10 more" in result
+
+    def test_row_format(self):
+        item = {
+            "metadata": {"name": "web", "namespace": "prod"},
+            "status": {"readyReplicas": 2, "replicas": 3},
+        }
+        assert _format_resource_row(item) == "  prod/web  ready=2/3"
+        item["status"] = {"phase": "Running", "replicas": 1}
+        assert _format_resource_row(item) == "  prod/web  phase=Running"
+        assert _format_resource_row({"metadata": {"name": "ns1"}}) == "  /ns1"
+
+    def test_non_json_output_returned_raw(self, mock_executor):
+        mock_executor.cluster.get_resources.return_value = CommandResult(
+            command="kubectl get", returncode=0, stdout="not json " * 1000, stderr=""
+        )
+        result = mock_executor.execute("get_cluster_resources", {"kind": "pods"})
+        assert result == ("not json " * 1000)[:3000]
+
 
 class TestGetPodLogs:
     def test_logs(self, mock_executor):
@@ -170,6 +243,26 @@ class TestCheckScrapeTargets:
         assert "Healthy: 4" in result
         assert "DEGRADED" in result
 
+    def test_down_targets_fetched_once(self, mock_executor):
+        mock_executor.prometheus.scrape_health_summary.return_value = {
+            "total_targets": 3, "healthy": 1, "unhealthy": 2,
+            "jobs": {
+                "a": {"up": 0, "down": 1, "unknown": 0, "total": 1},
+                "b": {"up": 1, "down": 1, "unknown": 0, "total": 2},
+            },
+        }
+        mock_executor.prometheus.get_active_targets_summary.return_value = [
+            {"job": "a", "instance": "a:1", "health": "down", "lastError": "refused"},
+            {"job": "b", "instance": "b:1", "health": "up", "lastError": ""},
+            {"job": "b", "instance": "b:2", "health": "down", "lastError": "timeout"},
+        ]
+        result = mock_executor.execute("check_scrape_targets", {})
+        assert mock_executor.prometheus.get_active_targets_summary.call_count == 1
+        lines = result.splitlines()
+        assert lines.index("    DOWN: a:1 — refused") == lines.index("  a: 0/1 up [DEGRADED]") + 1
+        assert lines.index("    DOWN: b:2 — timeout") == lines.index("  b: 1/2 up [DEGRADED]") + 1
+        assert "b:1" not in result
+
 
 class TestValidateMetricExists:
     def test_batch_check(self, mock_executor):
@@ -231,6 +324,48 @@ class TestImportGrafanaDashboard:
         assert "FAILED" in result
 
 
+class TestToolCache:
+    def test_repeated_query_reused(self, mock_executor):
+        mock_executor.prometheus.get_alerts.return_value = {"data": {"alerts": []}}
+        first = mock_executor.execute("get_prometheus_alerts", {})
+        second = mock_executor.execute("get_prometheus_alerts", {})
+        assert first == second
+        assert mock_executor.prometheus.get_alerts.call_count == 1
+
+    def test_input_is_part_of_key(self, mock_executor):
+        mock_executor.prometheus.check_metric_batch.side_effect = lambda names: {
+            n: True for n in names
+        }
+        mock_executor.execute("validate_metric_exists", {"metric_names": ["a"]})
+        mock_executor.execute("validate_metric_exists", {"metric_names": ["b"]})
+        assert mock_executor.prometheus.check_metric_batch.call_count == 2
+
+    def test_promql_queries_not_cached(self, mock_executor):
+        mock_executor.prometheus.validate_promql.return_value = {"valid": True}
+        mock_executor.prometheus.query_value.return_value = []
+        mock_executor.execute("run_promql_query", {"query": "time()"})
+        mock_executor.execute("run_promql_query", {"query": "time()"})
+        assert mock_executor.prometheus.query_value.call_count == 2
+
+    def test_errors_not_cached(self, mock_executor):
+        mock_executor.prometheus.get_rules.side_effect = [
+            RuntimeError("boom"), {"data": {"groups": []}},
+        ]
+        assert "error" in mock_executor.execute("get_prometheus_rules", {})
+        assert "No alerting" in mock_executor.execute("get_prometheus_rules", {})
+
+    def test_apply_invalidates(self, mock_executor):
+        mock_executor.prometheus.get_alerts.return_value = {"data": {"alerts": []}}
+        mock_executor.cluster.apply_manifest.return_value = CommandResult(
+            command="kubectl apply", returncode=0, stdout="created", stderr=""
+        )
+        mock_executor.execute("get_prometheus_alerts", {})
+        mock_executor.execute("apply_kubernetes_manifest", {"manifest_yaml": "kind: Service"})
+        mock_executor.execute("get_prometheus_alerts", {})
+        assert mock_executor.prometheus.get_alerts.call_count == 2
+        mock_executor.prometheus.clear_cache.assert_called_once()
+
+
 class TestApplyManifest:
     def test_write_allowed(self, mock_executor):
         mock_executor.cluster.apply_manifest.return_value = CommandResult(
@@ -271,6 +406,26 @@ class TestUnknownTool:
         assert "Unknown" in result
 
 
+class TestDispatch:
+    def test_every_tool_has_a_handler(self, mock_executor):
+        assert set(mock_executor._dispatch) == {t["name"] for t in LIVE_TOOL_DEFINITIONS}
+
+
+class TestInputValidation:
+    def test_missing_required(self, mock_executor):
+        result = mock_executor.execute("get_cluster_resources", {})
+        assert "missing required input 'kind'" in result
+        mock_executor.cluster.get_resources.assert_not_called()
+
+    def test_wrong_type(self, mock_executor):
+        result = mock_executor.execute("get_pod_logs", {"pod_name": "p", "tail_lines": "50"})
+        assert "'tail_lines' must be of type integer" in result
+
+    def test_bool_is_not_integer(self, mock_executor):
+        result = mock_executor.execute("import_grafana_dashboard", {"dashboard_id": True})
+        assert "must be of type integer" in result
+
+
 class TestRequirePrometheus:
     def test_no_prometheus_raises(self):
         executor = LiveToolExecutor(
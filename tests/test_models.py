@@ -9,6 +9,8 @@ from k8s_observability_agent.models import (
     MetricRecommendation,
     ObservabilityPlan,
     Platform,
+    ValidationCheck,
+    ValidationReport,
 )
 
 
@@ -23,6 +25,14 @@ class TestK8sResource:
         r = K8sResource(kind="Deployment", name="web", namespace="prod")
         assert r.qualified_name == "prod/Deployment/web"
 
+    def test_qualified_name_follows_field_changes(self) -> None:
+        r = K8sResource(kind="Deployment", name="web")
+        assert r.qualified_name == "default/Deployment/web"
+        assert r.model_copy(update={"name": "api"}).qualified_name == "default/Deployment/api"
+        r.namespace = "prod"
+        assert r.qualified_name == "prod/Deployment/web"
+        assert "qualified_name" not in r.model_dump()
+
     def test_default_namespace(self) -> None:
         r = K8sResource(kind="ConfigMap", name="cfg")
         assert r.namespace == "default"
@@ -104,3 +114,19 @@ class TestObservabilityPlan:
         assert len(plan.dashboard_recommendations) == 1
         assert plan.dashboard_recommendations[0].dashboard_id == 9628
         assert plan.dashboard_recommendations[0].archetype == "database"
+
+
+class TestValidationReport:
+    def test_status_counts_match_properties(self) -> None:
+        report = ValidationReport(
+            checks=[
+                ValidationCheck(name="a", status="pass"),
+                ValidationCheck(name="b", status="pass"),
+                ValidationCheck(name="c", status="fail"),
+                ValidationCheck(name="d", status="skip"),
+            ]
+        )
+        counts = report.status_counts()
+        assert counts["pass"] == report.passed == 2
+        assert counts["fail"] == report.failed == 1
+        assert counts["warn"] == report.warnings == 0
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
 
+from k8s_observability_agent import prometheus
 from k8s_observability_agent.prometheus import PrometheusClient
 
 
@@ -28,6 +31,159 @@ class TestPrometheusClientInit:
         assert p.base_url == "http://prom:9090"
 
 
+class TestSharedClient:
+    def test_same_server_shares_pool(self):
+        a = PrometheusClient("http://shared-prom:9090")
+        b = PrometheusClient("http://shared-prom:9090/")
+        c = PrometheusClient("http://other-prom:9090")
+        try:
+            assert a._client is b._client
+            assert c._client is not a._client
+        finally:
+            a.close()
+            c.close()
+        # Still referenced by b
+        assert not b._client.is_closed
+        b.close()
+        assert b._client.is_closed
+        assert ("http://shared-prom:9090", "") not in prometheus._SHARED_CLIENTS
+
+    def test_honours_proxy_env(self, monkeypatch):
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+        p = PrometheusClient("https://proxied-prom:9090")
+        try:
+            assert p._client._mounts
+        finally:
+            p.close()
+
+    def test_close_is_idempotent(self):
+        a = PrometheusClient("http://idempotent-prom:9090")
+        b = PrometheusClient("http://idempotent-prom:9090")
+        a.close()
+        a.close()
+        assert not b._client.is_closed
+        b.close()
+        assert b._client.is_closed
+
+
+class TestRequestGuard:
+    def test_concurrency_bounded(self):
+        client = PrometheusClient("http://guarded-prom:9090", max_concurrency=2)
+        lock = threading.Lock()
+        active = peak = 0
+
+        def slow_get(*args, **kwargs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            resp = MagicMock()
+            resp.json.return_value = {"data": {"result": [1]}}
+            return resp
+
+        client._client = MagicMock()
+        client._client.get.side_effect = slow_get
+        client._map_queries(client.metric_exists, [f"m{i}" for i in range(8)])
+        assert peak <= 2
+        stats = client.request_stats()
+        assert stats["requests"] == 8
+        assert stats["peak_in_flight"] <= 2
+        assert stats["in_flight"] == 0
+        client.close()
+
+    def test_transport_errors_counted(self, mock_client):
+        client, mock_http = mock_client
+        mock_http.get.side_effect = httpx.ConnectError("refused")
+        assert client.is_reachable() is False
+        stats = client.request_stats()
+        assert stats["errors"] == 1
+        assert stats["requests"] == 1
+
+
+class TestResponseCache:
+    def test_targets_reused_within_ttl(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"data": {"activeTargets": []}}
+        mock_http.get.return_value = mock_resp
+
+        client.get_targets()
+        client.scrape_health_summary()
+        assert mock_http.get.call_count == 1
+
+    def test_expired_entry_refetched(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"data": {"groups": []}}
+        mock_http.get.return_value = mock_resp
+
+        client.get_rules()
+        with patch.object(prometheus.time, "monotonic", return_value=1e12):
+            client.get_rules()
+        assert mock_http.get.call_count == 2
+
+    def test_expired_entry_revalidated_with_etag(self, mock_client):
+        client, mock_http = mock_client
+        body = {"data": {"groups": [{"name": "g"}]}}
+        req = httpx.Request("GET", "http://localhost:9090/api/v1/rules")
+        mock_http.get.side_effect = [
+            httpx.Response(200, json=body, headers={"ETag": '"v1"'}, request=req),
+            httpx.Response(304, request=req),
+        ]
+
+        client.get_rules()
+        with patch.object(prometheus.time, "monotonic", return_value=1e12):
+            assert client.get_rules() == body
+        assert mock_http.get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_changed_body_replaces_entry(self, mock_client):
+        client, mock_http = mock_client
+        req = httpx.Request("GET", "http://localhost:9090/api/v1/rules")
+        mock_http.get.side_effect = [
+            httpx.Response(200, json={"v": 1}, headers={"ETag": '"v1"'}, request=req),
+            httpx.Response(200, json={"v": 2}, headers={"ETag": '"v2"'}, request=req),
+        ]
+
+        client.get_rules()
+        with patch.object(prometheus.time, "monotonic", return_value=1e12):
+            assert client.get_rules() == {"v": 2}
+        key = ("/api/v1/rules", ())
+        assert client._cache[key][2] == '"v2"'
+
+    def test_clear_cache(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"data": {"groups": []}}
+        mock_http.get.return_value = mock_resp
+
+        client.get_rules()
+        client.clear_cache()
+        client.get_rules()
+        assert mock_http.get.call_count == 2
+
+    def test_queries_not_cached(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"data": {"result": []}}
+        mock_http.get.return_value = mock_resp
+
+        client.query("up")
+        client.query("up")
+        assert mock_http.get.call_count == 2
+
+    def test_disabled(self):
+        client = PrometheusClient("http://uncached-prom:9090", cache_ttl=0)
+        mock_http = MagicMock()
+        client._client = mock_http
+        client.get_targets()
+        client.get_targets()
+        assert mock_http.get.call_count == 2
+        client.close()
+
+
 class TestTargets:
     def test_get_active_targets_summary(self, mock_client):
         client, mock_http = mock_client
@@ -126,15 +282,31 @@ class TestMetricExists:
 class TestCheckMetricBatch:
     def test_batch_check(self, mock_client):
         client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.raise_for_status = MagicMock()
+        mock_resp.json.return_value = {
+            "data": {"result": [{"metric": {"__name__": "up"}, "value": [0, "3"]}]}
+        }
+        mock_http.get.return_value = mock_resp
+
+        results = client.check_metric_batch(["up", "missing_metric"])
+        assert results == {"up": True, "missing_metric": False}
+        # Both names are resolved by a single query
+        assert mock_http.get.call_count == 1
+        query = mock_http.get.call_args.kwargs["params"]["query"]
+        assert query == 'count by (__name__) ({__name__=~"up|missing_metric"})'
 
-        call_count = [0]
+    def test_batch_failure_falls_back_per_metric(self, mock_client):
+        client, mock_http = mock_client
 
         def side_effect(*args, **kwargs):
-            call_count[0] += 1
+            query = kwargs["params"]["query"]
             resp = MagicMock()
-            resp.raise_for_status = MagicMock()
-            # First metric exists, second does not
-            if call_count[0] == 1:
+            if query.startswith("count by"):
+                resp.raise_for_status.side_effect = httpx.HTTPStatusError(
+                    "bad", request=MagicMock(), response=MagicMock()
+                )
+            elif query == "count(up)":
                 resp.json.return_value = {"data": {"result": [{"value": [0, "1"]}]}}
             else:
                 resp.json.return_value = {"data": {"result": []}}
@@ -143,8 +315,32 @@ class TestCheckMetricBatch:
         mock_http.get.side_effect = side_effect
 
         results = client.check_metric_batch(["up", "missing_metric"])
-        assert results["up"] is True
-        assert results["missing_metric"] is False
+        assert results == {"up": True, "missing_metric": False}
+        assert list(results) == ["up", "missing_metric"]
+        assert mock_http.get.call_count == 3
+
+    def test_large_batch_split(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"data": {"result": []}}
+        mock_http.get.return_value = mock_resp
+
+        names = [f"metric_{i}" for i in range(prometheus._METRIC_BATCH_SIZE + 1)]
+        results = client.check_metric_batch(names)
+        assert list(results) == names
+        assert mock_http.get.call_count == 2
+
+    def test_selectors_checked_individually(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.raise_for_status = MagicMock()
+        mock_resp.json.return_value = {"data": {"result": [{"value": [0, "1"]}]}}
+        mock_http.get.return_value = mock_resp
+
+        results = client.check_metric_batch(['up{job="node"}'])
+        assert results == {'up{job="node"}': True}
+        query = mock_http.get.call_args.kwargs["params"]["query"]
+        assert query == 'count(up{job="node"})'
 
 
 class TestValidatePromQL:
@@ -214,6 +410,14 @@ class TestIsReachable:
         mock_http.get.return_value = mock_resp
         assert client.is_reachable() is True
 
+    def test_reachability_is_never_cached(self, mock_client):
+        client, mock_http = mock_client
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"status": "success"}
+        mock_http.get.side_effect = [mock_resp, httpx.ConnectError("refused")]
+        assert client.is_reachable() is True
+        assert client.is_reachable() is False
+
     def test_not_reachable(self, mock_client):
         client, mock_http = mock_client
         mock_http.get.side_effect = Exception("connection refused")
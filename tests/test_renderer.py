@@ -14,6 +14,7 @@ from k8s_observability_agent.models import (
     ValidationReport,
 )
 from k8s_observability_agent.renderer import (
+    _get_template,
     render_grafana_dashboards,
     render_plan_summary,
     render_prometheus_rules,
@@ -85,6 +86,12 @@ class TestRenderPrometheusRules:
         assert "groups" in parsed
         assert len(parsed["groups"]) > 0
 
+    def test_template_compiled_once(self) -> None:
+        render_prometheus_rules(_sample_plan())
+        hits = _get_template.cache_info().hits
+        render_prometheus_rules(_sample_plan())
+        assert _get_template.cache_info().hits == hits + 1
+
 
 class TestRenderGrafanaDashboards:
     def test_produces_dashboard(self) -> None:
@@ -100,6 +107,12 @@ class TestRenderGrafanaDashboards:
         assert parsed["title"] == "Web Overview"
         assert len(parsed["panels"]) == 2
 
+    def test_pretty_print_matches_stdlib_layout(self) -> None:
+        import json
+
+        _, content = render_grafana_dashboards(_sample_plan())[0]
+        assert content == json.dumps(json.loads(content), indent=2)
+
 
 class TestRenderPlanSummary:
     def test_markdown_contains_sections(self) -> None:
@@ -194,6 +207,15 @@ class TestWriteOutputs:
         for path_str in written:
             assert Path(path_str).exists()
 
+    def test_written_order_and_content(self, tmp_path: Path) -> None:
+        plan = _sample_plan()
+        written = write_outputs(plan, tmp_path)
+        names = [Path(p).name for p in written]
+        assert names[0] == "prometheus-rules.yml"
+        assert names[-1] == "observability-plan.md"
+        assert names[1:-1] == [f for f, _ in render_grafana_dashboards(plan)]
+        assert (tmp_path / "observability-plan.md").read_text() == render_plan_summary(plan)
+
 
 class TestValidationReportHtml:
     def _sample_report(self) -> ValidationReport:
@@ -1,8 +1,19 @@
 """Tests for agent.scanner."""
 
 from pathlib import Path
+from typing import Any
 
-from k8s_observability_agent.scanner import discover_manifest_files, parse_manifest_file
+import pytest
+
+from k8s_observability_agent import scanner
+from k8s_observability_agent.scanner import (
+    _build_matcher,
+    _image_exporters,
+    _parse_manifests,
+    _prunable_dirs,
+    discover_manifest_files,
+    parse_manifest_file,
+)
 
 
 class TestDiscoverManifestFiles:
@@ -21,6 +32,53 @@ class TestDiscoverManifestFiles:
         files = discover_manifest_files(tmp_repo, exclude=["**/vendor/**"])
         assert not any(f.name == "dep.yaml" for f in files)
 
+    def test_skips_oversized_files(self, tmp_path: Path) -> None:
+        (tmp_path / "big.yaml").write_bytes(b"#" * (scanner.MAX_FILE_SIZE_BYTES + 1))
+        (tmp_path / "ok.yaml").write_text("a: 1\n")
+        assert [f.name for f in discover_manifest_files(tmp_path)] == ["ok.yaml"]
+
+    def test_prunable_dirs(self) -> None:
+        patterns = ["**/node_modules/**", "**/.git/**", "vendor/**", "**/a*/**", "build/"]
+        names = _prunable_dirs(patterns)
+        assert names == {"node_modules", ".git"}
+        spec = scanner._build_pathspec(patterns)
+        for name in names:
+            for path in (f"{name}/x.yaml", f"a/{name}/b/x.yaml"):
+                assert spec.match_file(path)
+        assert _prunable_dirs(["**/vendor/**", "!**/vendor/keep.yaml"]) == frozenset()
+
+    def test_excluded_dirs_not_walked(
+        self, tmp_repo: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_repo / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_repo / "node_modules" / "pkg" / "x.yaml").write_text("a: 1\n")
+        walked: list[str] = []
+        real_scandir = scanner.os.scandir
+
+        def scandir(path: str) -> Any:
+            walked.append(path)
+            return real_scandir(path)
+
+        monkeypatch.setattr(scanner.os, "scandir", scandir)
+        files = discover_manifest_files(tmp_repo, exclude=["**/node_modules/**"])
+        assert not any("node_modules" in p for p in walked)
+        assert "deployment.yaml" in {f.name for f in files}
+
+    @pytest.mark.parametrize("patterns", [
+        ["**/*.yaml", "**/*.yml", "**/*.json"],
+        ["**/vendor/**", "build/"],
+        ["*.yaml", "!keep.yaml"],
+        ["k8s/**/*.yaml", "# comment", ""],
+    ])
+    def test_matcher_agrees_with_pathspec(self, patterns: list[str]) -> None:
+        paths = [
+            "a.yaml", "x/a.yml", "vendor/a.yaml", "x/vendor/b/c.yml", "build/x.json",
+            "keep.yaml", "d/keep.yaml", "k8s/x/y.yaml", "k8s/y.yaml", "a.txt",
+        ]
+        matcher = _build_matcher(patterns)
+        spec = scanner._build_pathspec(patterns)
+        assert [matcher(p) for p in paths] == [spec.match_file(p) for p in paths]
+
 
 class TestParseManifestFile:
     def test_parse_deployment(self, tmp_repo: Path) -> None:
@@ -48,6 +106,45 @@ class TestParseManifestFile:
         assert r.service_type == "ClusterIP"
         assert r.selector == {"app": "web-app"}
 
+    def test_parse_cronjob_pod_spec(self, tmp_path: Path) -> None:
+        path = tmp_path / "cron.yaml"
+        path.write_text(
+            "apiVersion: batch/v1\n"
+            "kind: CronJob\n"
+            "metadata:\n"
+            "  name: backup\n"
+            "spec:\n"
+            "  schedule: '0 * * * *'\n"
+            "  jobTemplate:\n"
+            "    spec:\n"
+            "      template:\n"
+            "        spec:\n"
+            "          containers:\n"
+            "            - name: backup\n"
+            "              image: busybox:1.36\n"
+        )
+        (r,) = parse_manifest_file(path, tmp_path)
+        assert [c.name for c in r.containers] == ["backup"]
+
+    def test_null_template_tolerated(self, tmp_path: Path) -> None:
+        path = tmp_path / "deploy.yaml"
+        path.write_text(
+            "apiVersion: apps/v1\nkind: Deployment\nmetadata:\n  name: web\n"
+            "spec:\n  template:\n"
+        )
+        (r,) = parse_manifest_file(path, tmp_path)
+        assert r.containers == []
+
+    def test_keeps_documents_before_yaml_error(self, tmp_path: Path) -> None:
+        path = tmp_path / "multi.yaml"
+        path.write_text(
+            "apiVersion: v1\nkind: ConfigMap\nmetadata:\n  name: ok\n"
+            "---\n"
+            "apiVersion: v1\nkind: [unclosed\n"
+        )
+        resources = parse_manifest_file(path, tmp_path)
+        assert [r.name for r in resources] == ["ok"]
+
     def test_skips_non_k8s(self, tmp_repo: Path) -> None:
         path = tmp_repo / "k8s" / "random.yaml"
         resources = parse_manifest_file(path, tmp_repo)
@@ -74,10 +171,65 @@ class TestParseManifestFile:
         assert len(resources) == 2
         assert {r.name for r in resources} == {"ns1", "ns2"}
 
+    def test_non_manifest_not_parsed(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        # Would fail to parse as YAML, but never reaches the loader
+        values = tmp_path / "values.yaml"
+        values.write_text("image: [unclosed\n")
+        assert parse_manifest_file(values, tmp_path) == []
+        assert "Failed to parse" not in caplog.text
+
+    def test_json_list(self, tmp_path: Path) -> None:
+        manifest = tmp_path / "list.json"
+        manifest.write_text(
+            '{"apiVersion": "v1", "kind": "List", "items": ['
+            '{"apiVersion": "v1", "kind": "Namespace", "metadata": {"name": "ns1"}}]}'
+        )
+        resources = parse_manifest_file(manifest, tmp_path)
+        assert [r.name for r in resources] == ["ns1"]
+
+    def test_json_suffix_with_yaml_content(self, tmp_path: Path) -> None:
+        manifest = tmp_path / "ns.json"
+        manifest.write_text("apiVersion: v1\nkind: Namespace\nmetadata:\n  name: ns1\n")
+        resources = parse_manifest_file(manifest, tmp_path)
+        assert [r.name for r in resources] == ["ns1"]
+
+
+class TestParseManifests:
+    def _write(self, root: Path, count: int) -> list[Path]:
+        paths = []
+        for i in range(count):
+            path = root / f"ns{i:02d}.yaml"
+            path.write_text(f"apiVersion: v1\nkind: Namespace\nmetadata:\n  name: ns{i}\n")
+            paths.append(path)
+        return paths
+
+    def test_serial_for_small_repos(self, tmp_path: Path) -> None:
+        paths = self._write(tmp_path, 3)
+        parsed = _parse_manifests(paths, tmp_path)
+        assert [[r.name for r in rs] for rs in parsed] == [["ns0"], ["ns1"], ["ns2"]]
+
+    def test_process_pool_preserves_order(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(scanner, "_MAX_PARSE_WORKERS", 2)
+        paths = self._write(tmp_path, scanner._PARALLEL_PARSE_MIN_FILES + 4)
+        parsed = _parse_manifests(paths, tmp_path)
+        assert [rs[0].name for rs in parsed] == [f"ns{i}" for i in range(len(paths))]
+        assert parsed[0][0].source_file == "ns00.yaml"
+
 
 class TestCapabilityInference:
     """Test the telemetry capability detection in _parse_resource."""
 
+    def test_image_exporters(self) -> None:
+        """Every matching exporter is reported, not just the first alternative."""
+        assert _image_exporters("nginx:1.25") == frozenset()
+        assert _image_exporters("oliver006/redis_exporter:v1") == {"redis_exporter"}
+        assert _image_exporters("bitnami/jmx-exporter:0.20") == {"kafka_exporter"}
+        assert _image_exporters("Prometheus-NATS-Exporter") == {"nats_exporter"}
+
     def test_detects_exporter_sidecar(self, tmp_path: Path) -> None:
         """A postgres_exporter sidecar should be detected."""
         manifest = tmp_path / "pg.yaml"